@@ -2,19 +2,58 @@
 
 This DAG runs periodically to generate power forecasts for all wind farms
 using Open-Meteo weather forecasts and the configured wind farm models.
+Wind farms are forecast in batches, one ``/forecasts/generate-batch`` request
+per mapped task instance, limited by the ``forecast_api`` pool.
 """
 
+import asyncio
+import json
 import os
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
 from datetime import datetime, timedelta
 
-import requests
-from airflow.operators.python import PythonOperator
-
-from airflow import DAG
+import aiohttp
+import jwt
+import orjson
+from airflow.decorators import dag, task
+from airflow.models import Variable
+from airflow.operators.python import get_current_context
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential_jitter,
+)
 
 # API Configuration
 API_BASE_URL = os.getenv("API_BASE_URL", "http://app:8000")
 
+# Service account API key; when set, the password login is skipped entirely
+FORECAST_API_KEY = os.getenv("FORECAST_API_KEY", "")
+
+# Airflow Variable caching the service token between task runs
+TOKEN_VARIABLE = "forecast_service_token"
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
+
+# Wind farms fetched per page when listing
+WIND_FARMS_PAGE_SIZE = 200
+
+# Airflow pool capping concurrent forecast requests against the API
+FORECAST_API_POOL = "forecast_api"
+
+# Wind farms forecast per /forecasts/generate-batch request
+FORECAST_BATCH_SIZE = 25
+# A batch computes many farms server-side, so it gets a longer timeout
+BATCH_TIMEOUT_SECONDS = 600
+
+# Forecast configuration
+FORECAST_HOURS = 48  # 2 days ahead
+WEATHER_MODEL = "best_match"  # Open-Meteo best match
+
+# Size of the keep-alive connection pool shared by all API calls
+CONNECTION_POOL_SIZE = 32
+
 # Default DAG arguments
 default_args = {
     "owner": "koppen",
@@ -26,157 +65,286 @@ default_args = {
 }
 
 
-def get_auth_token() -> str:
-    """Get authentication token from the API.
+class PermanentAuthError(Exception):
+    """Raised when the API rejects the service credentials."""
+
+
+class TransientAPIError(Exception):
+    """Raised when the API answers with a retryable gateway error."""
+
+
+class TokenRejectedError(Exception):
+    """Raised when the API answers 401 to a request made with the session's token."""
+
+
+# Status codes worth retrying: the API or its proxy is briefly unavailable
+TRANSIENT_STATUSES = frozenset({502, 503, 504})
+
+# Retry transient network failures with exponential backoff and jitter
+retry_transient = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    retry=retry_if_exception_type(
+        (aiohttp.ClientConnectionError, asyncio.TimeoutError, TransientAPIError)
+    ),
+    reraise=True,
+)
+
+
+def _raise_for_transient(response: aiohttp.ClientResponse) -> None:
+    """Raise TransientAPIError for gateway errors so the call is retried."""
+    if response.status in TRANSIENT_STATUSES:
+        raise TransientAPIError(f"{response.method} {response.url}: {response.status}")
+
+
+@retry_transient
+async def _login(session: aiohttp.ClientSession) -> str:
+    """Log in with the service credentials.
 
     For production, use a service account or API key.
     For MVP, we'll use a default user.
+
+    Raises:
+        PermanentAuthError: If the credentials are rejected.
     """
-    # Try to login with default credentials
-    try:
-        response = requests.post(
-            f"{API_BASE_URL}/api/v1/auth/login",
-            data={
-                "username": "forecast-service@koppen.local",
-                "password": "forecast-service-password",
-            },
-            timeout=30,
-        )
-        if response.status_code == 200:
-            return response.json().get("access_token", "")
-    except Exception as e:
-        print(f"Failed to get auth token: {e}")
+    async with session.post(
+        f"{API_BASE_URL}/api/v1/auth/login",
+        data={
+            "username": "forecast-service@koppen.local",
+            "password": "forecast-service-password",
+        },
+        timeout=aiohttp.ClientTimeout(total=30),
+    ) as response:
+        _raise_for_transient(response)
+        if response.status == 401:
+            raise PermanentAuthError("Forecast service credentials were rejected")
+        if response.status == 200:
+            return orjson.loads(await response.read()).get("access_token", "")
+        print(f"Failed to get auth token: status {response.status}")
     return ""
 
 
-def get_wind_farms(token: str) -> list[dict]:
-    """Fetch all wind farms from the API."""
+async def get_auth_token(session: aiohttp.ClientSession, refresh: bool = False) -> str:
+    """Get authentication token from the API.
+
+    Reuses the token cached in an Airflow Variable by earlier task runs
+    until shortly before it expires, and logs in again otherwise.
+
+    Args:
+        session: Client session used for the login request.
+        refresh: Drop the cached token and log in again, e.g. after the API
+            rejected it following a secret rotation or user deactivation.
+
+    Raises:
+        PermanentAuthError: If the credentials are rejected.
+    """
+    if refresh:
+        Variable.delete(TOKEN_VARIABLE)
+    cached = None if refresh else Variable.get(TOKEN_VARIABLE, default_var=None)
+    if cached:
+        data = json.loads(cached)
+        if data["exp"] - TOKEN_EXPIRY_MARGIN_SECONDS > time.time():
+            return data["token"]
+
+    token = await _login(session)
+    if token:
+        claims = jwt.decode(token, options={"verify_signature": False})
+        Variable.set(TOKEN_VARIABLE, json.dumps({"token": token, "exp": claims["exp"]}))
+    return token
+
+
+@retry_transient
+async def _request_wind_farms_page(
+    session: aiohttp.ClientSession, cursor: int | None
+) -> list[dict]:
+    """Request one page of wind farms, raising on transient failures."""
+    params = {"limit": WIND_FARMS_PAGE_SIZE}
+    if cursor is not None:
+        params["cursor"] = cursor
+    async with session.get(
+        f"{API_BASE_URL}/api/v1/wind-farms/",
+        params=params,
+        timeout=aiohttp.ClientTimeout(total=30),
+    ) as response:
+        _raise_for_transient(response)
+        if response.status == 401:
+            raise TokenRejectedError("Wind farm listing was not authorized")
+        if response.status == 200:
+            return orjson.loads(await response.read())
+        print(f"Failed to fetch wind farms: status {response.status}")
+    return []
+
+
+async def iter_wind_farms(session: aiohttp.ClientSession) -> AsyncIterator[dict]:
+    """Yield wind farms from the API one page at a time."""
+    cursor = None
+    while True:
+        page = await _request_wind_farms_page(session, cursor)
+        for farm in page:
+            yield farm
+        if len(page) < WIND_FARMS_PAGE_SIZE:
+            return
+        cursor = page[-1]["id"]
+
+
+async def get_wind_farms(session: aiohttp.ClientSession) -> list[dict]:
+    """Fetch all wind farms from the API, keeping only their id and name."""
+    wind_farms = []
     try:
-        headers = {"Authorization": f"Bearer {token}"} if token else {}
-        response = requests.get(
-            f"{API_BASE_URL}/api/v1/wind-farms/",
-            headers=headers,
-            timeout=30,
-        )
-        if response.status_code == 200:
-            return response.json()
+        async for farm in iter_wind_farms(session):
+            wind_farms.append({"id": farm["id"], "name": farm.get("name", "Unknown")})
+    except TokenRejectedError:
+        raise
     except Exception as e:
         print(f"Failed to fetch wind farms: {e}")
-    return []
+        return []
+    return wind_farms
 
 
-def generate_forecast_for_farm(
-    wind_farm_id: int,
-    token: str,
+@retry_transient
+async def _request_forecast_batch(
+    session: aiohttp.ClientSession,
+    wind_farm_ids: list[int],
+    forecast_hours: int,
+    weather_model: str,
+) -> tuple[int, dict | str]:
+    """Request forecast generation for a batch, raising on transient failures.
+
+    Returns:
+        Tuple of (status code, parsed JSON on success or response text).
+    """
+    async with session.post(
+        f"{API_BASE_URL}/api/v1/forecasts/generate-batch",
+        json={
+            "wind_farm_ids": wind_farm_ids,
+            "forecast_hours": forecast_hours,
+            "granularity": "60min",
+            "weather_model": weather_model,
+        },
+        timeout=aiohttp.ClientTimeout(total=BATCH_TIMEOUT_SECONDS),
+    ) as response:
+        _raise_for_transient(response)
+        if response.status == 401:
+            raise TokenRejectedError("Forecast batch request was not authorized")
+        if response.status in (200, 202):
+            return response.status, orjson.loads(await response.read())
+        return response.status, await response.text()
+
+
+async def generate_forecast_batch(
+    session: aiohttp.ClientSession,
+    wind_farm_ids: list[int],
     forecast_hours: int = 48,
     weather_model: str = "best_match",
-) -> dict:
-    """Generate forecast for a single wind farm."""
-    headers = {"Authorization": f"Bearer {token}"} if token else {}
+) -> list[dict]:
+    """Generate forecasts for a batch of wind farms in a single request.
 
+    Returns:
+        One ``{"wind_farm_id", "records_created", "error"}`` dict per farm.
+    """
     try:
-        response = requests.post(
-            f"{API_BASE_URL}/api/v1/forecasts/generate",
-            headers=headers,
-            json={
-                "wind_farm_id": wind_farm_id,
-                "forecast_hours": forecast_hours,
-                "granularity": "60min",
-                "weather_model": weather_model,
-            },
-            timeout=120,  # Forecast generation can take time
+        status, body = await _request_forecast_batch(
+            session, wind_farm_ids, forecast_hours, weather_model
         )
+    except TokenRejectedError:
+        raise
+    except Exception as e:
+        print(f"✗ Batch {wind_farm_ids}: Exception - {e}")
+        return [{"wind_farm_id": i, "error": str(e)} for i in wind_farm_ids]
 
-        if response.status_code in (200, 202):
-            result = response.json()
-            print(
-                f"✓ Wind farm {wind_farm_id}: Created {result.get('records_created', 0)} forecast records"
-            )
-            return result
+    if status not in (200, 202):
+        print(f"✗ Batch {wind_farm_ids}: Failed with status {status}")
+        print(f"  Response: {body}")
+        return [{"wind_farm_id": i, "error": body} for i in wind_farm_ids]
+
+    for result in body["results"]:
+        if result["error"]:
+            print(f"✗ Wind farm {result['wind_farm_id']}: {result['error']}")
         else:
             print(
-                f"✗ Wind farm {wind_farm_id}: Failed with status {response.status_code}"
+                f"✓ Wind farm {result['wind_farm_id']}: Created {result['records_created']} forecast records"
             )
-            print(f"  Response: {response.text}")
-            return {"error": response.text}
+    return body["results"]
+
+
+async def _fetch_wind_farms() -> list[dict]:
+    """Log in and fetch all wind farms from the API."""
+    async with _api_session() as session:
+        return await _with_auth(session, lambda: get_wind_farms(session))
+
+
+async def _forecast_batch(
+    wind_farm_ids: list[int], forecast_hours: int, weather_model: str
+) -> list[dict]:
+    """Log in and generate the forecasts for a batch of wind farms."""
+    async with _api_session() as session:
+        return await _with_auth(
+            session,
+            lambda: generate_forecast_batch(
+                session,
+                wind_farm_ids=wind_farm_ids,
+                forecast_hours=forecast_hours,
+                weather_model=weather_model,
+            ),
+        )
 
-    except Exception as e:
-        print(f"✗ Wind farm {wind_farm_id}: Exception - {e}")
-        return {"error": str(e)}
 
+def _api_session() -> aiohttp.ClientSession:
+    """Create a client session backed by a keep-alive connection pool."""
+    # Forecast generation can take time
+    timeout = aiohttp.ClientTimeout(total=120)
+    connector = aiohttp.TCPConnector(
+        limit=CONNECTION_POOL_SIZE, limit_per_host=CONNECTION_POOL_SIZE
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        json_serialize=lambda obj: orjson.dumps(obj).decode(),
+    )
 
-def run_forecast_pipeline(**context) -> None:
-    """Main forecast pipeline task.
 
-    Fetches all wind farms and generates forecasts for each one.
-    """
-    print("=" * 60)
-    print("Starting Wind Generation Forecast Pipeline")
-    print(f"Execution time: {context.get('execution_date', datetime.now())}")
-    print("=" * 60)
-
-    # Get authentication token
-    token = get_auth_token()
-    if not token:
-        print("Warning: Running without authentication token")
+async def _authenticate(session: aiohttp.ClientSession, refresh: bool = False) -> None:
+    """Attach credentials to every request made through the session.
 
-    # Fetch all wind farms
-    wind_farms = get_wind_farms(token)
+    Uses the service account API key when configured, and a bearer token
+    from the login endpoint otherwise.
 
-    if not wind_farms:
-        print("No wind farms found. Exiting.")
+    Args:
+        session: Client session to authenticate.
+        refresh: Replace the cached bearer token with a fresh login.
+    """
+    if FORECAST_API_KEY:
+        session.headers["Authorization"] = f"ApiKey {FORECAST_API_KEY}"
         return
 
-    print(f"Found {len(wind_farms)} wind farm(s)")
-
-    # Configuration
-    forecast_hours = 48  # 2 days ahead
-    weather_model = "best_match"  # Open-Meteo best match
-
-    # Generate forecasts for each wind farm
-    results = []
-    for farm in wind_farms:
-        farm_id = farm.get("id")
-        farm_name = farm.get("name", "Unknown")
+    token = await get_auth_token(session, refresh=refresh)
+    if token:
+        session.headers["Authorization"] = f"Bearer {token}"
+    else:
+        print("Warning: Running without authentication token")
 
-        print(f"\n--- Processing: {farm_name} (ID: {farm_id}) ---")
 
-        result = generate_forecast_for_farm(
-            wind_farm_id=farm_id,
-            token=token,
-            forecast_hours=forecast_hours,
-            weather_model=weather_model,
-        )
-        results.append(
-            {
-                "farm_id": farm_id,
-                "farm_name": farm_name,
-                "result": result,
-            }
-        )
+async def _with_auth(
+    session: aiohttp.ClientSession, call: Callable[[], Awaitable[list[dict]]]
+) -> list[dict]:
+    """Authenticate the session and make an API call.
 
-    # Summary
-    print("\n" + "=" * 60)
-    print("Pipeline Summary")
-    print("=" * 60)
-
-    successful = sum(1 for r in results if "error" not in r["result"])
-    failed = len(results) - successful
-    total_records = sum(
-        r["result"].get("records_created", 0)
-        for r in results
-        if "error" not in r["result"]
-    )
-
-    print(f"Wind Farms Processed: {len(results)}")
-    print(f"Successful: {successful}")
-    print(f"Failed: {failed}")
-    print(f"Total Forecast Records Created: {total_records}")
-    print("=" * 60)
+    A cached bearer token can be rejected before it expires, e.g. after a
+    secret rotation or user deactivation. On a 401 the token is dropped and
+    the call is made once more after a fresh login.
+    """
+    await _authenticate(session)
+    try:
+        return await call()
+    except TokenRejectedError:
+        if FORECAST_API_KEY:
+            raise
+        print("Cached token was rejected, logging in again")
+        await _authenticate(session, refresh=True)
+        return await call()
 
 
-# Create the DAG
-with DAG(
+@dag(
     dag_id="wind_generation_forecast",
     default_args=default_args,
     description="Generate wind power forecasts for all wind farms",
@@ -184,10 +352,75 @@ with DAG(
     start_date=datetime(2025, 1, 1),
     catchup=False,
     tags=["forecasting", "wind-power", "koppen"],
-) as dag:
-    # Main forecast task
-    forecast_task = PythonOperator(
-        task_id="generate_forecasts",
-        python_callable=run_forecast_pipeline,
-        provide_context=True,
-    )
+)
+def wind_generation_forecast():
+    """Fan out one forecast task per batch of wind farms and summarize."""
+
+    @task
+    def list_batches() -> list[list[int]]:
+        """Fetch all wind farms to forecast, grouped into request batches."""
+        print("=" * 60)
+        print("Starting Wind Generation Forecast Pipeline")
+        print(f"Execution time: {get_current_context()['logical_date']}")
+        print("=" * 60)
+
+        wind_farms = asyncio.run(_fetch_wind_farms())
+        if not wind_farms:
+            print("No wind farms found.")
+        else:
+            print(f"Found {len(wind_farms)} wind farm(s)")
+
+        ids = [farm["id"] for farm in wind_farms]
+        return [
+            ids[i : i + FORECAST_BATCH_SIZE]
+            for i in range(0, len(ids), FORECAST_BATCH_SIZE)
+        ]
+
+    @task(pool=FORECAST_API_POOL)
+    def forecast_batch(wind_farm_ids: list[int]) -> dict:
+        """Generate the forecasts for one batch of wind farms.
+
+        Only the counts are returned so the XCom passed to ``summarize`` stays
+        small; the per-farm results are logged and dropped here.
+        """
+        print(f"--- Processing wind farms: {wind_farm_ids} ---")
+        results = asyncio.run(
+            _forecast_batch(
+                wind_farm_ids,
+                forecast_hours=FORECAST_HOURS,
+                weather_model=WEATHER_MODEL,
+            )
+        )
+        successful = total_records = 0
+        for result in results:
+            if not result.get("error"):
+                successful += 1
+                total_records += result.get("records_created", 0)
+        return {
+            "processed": len(results),
+            "successful": successful,
+            "records_created": total_records,
+        }
+
+    @task
+    def summarize(results: list[dict]) -> None:
+        """Print the pipeline summary across all mapped forecast tasks."""
+        processed = successful = total_records = 0
+        for r in results:
+            processed += r["processed"]
+            successful += r["successful"]
+            total_records += r["records_created"]
+
+        print("=" * 60)
+        print("Pipeline Summary")
+        print("=" * 60)
+        print(f"Wind Farms Processed: {processed}")
+        print(f"Successful: {successful}")
+        print(f"Failed: {processed - successful}")
+        print(f"Total Forecast Records Created: {total_records}")
+        print("=" * 60)
+
+    summarize(forecast_batch.expand(wind_farm_ids=list_batches()))
+
+
+wind_generation_forecast()
@@ -0,0 +1,104 @@
+"""Replace single-column time-series indexes with composite indexes.
+
+Revision ID: d4e5f6g7h8i9
+Revises: c3d4e5f6g7h8
+Create Date: 2026-10-16
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "d4e5f6g7h8i9"
+down_revision = "c3d4e5f6g7h8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Farm + time range lookups on generation records, covering the values
+    # read by forecast evaluation so they can be served by index-only scans
+    op.drop_index(
+        "ix_windfarmgenerationrecord_timestamp", table_name="windfarmgenerationrecord"
+    )
+    op.drop_index(
+        "ix_windfarmgenerationrecord_wind_farm_id",
+        table_name="windfarmgenerationrecord",
+    )
+    op.create_index(
+        "ix_windfarmgenerationrecord_wind_farm_id_timestamp",
+        "windfarmgenerationrecord",
+        ["wind_farm_id", "timestamp"],
+        unique=False,
+        postgresql_include=["generation", "is_synthetic"],
+    )
+
+    # Latest-forecast-per-farm lookups on forecasts
+    op.drop_index(
+        "ix_windgenerationforecast_forecast_time", table_name="windgenerationforecast"
+    )
+    op.drop_index(
+        "ix_windgenerationforecast_wind_farm_id", table_name="windgenerationforecast"
+    )
+    op.drop_index(
+        "ix_windgenerationforecast_created_at", table_name="windgenerationforecast"
+    )
+    op.create_index(
+        "ix_windgenerationforecast_wind_farm_id_forecast_time",
+        "windgenerationforecast",
+        ["wind_farm_id", sa.text("forecast_time DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_windgenerationforecast_wind_farm_id_created_at",
+        "windgenerationforecast",
+        ["wind_farm_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_windgenerationforecast_wind_farm_id_created_at",
+        table_name="windgenerationforecast",
+    )
+    op.drop_index(
+        "ix_windgenerationforecast_wind_farm_id_forecast_time",
+        table_name="windgenerationforecast",
+    )
+    op.create_index(
+        "ix_windgenerationforecast_created_at",
+        "windgenerationforecast",
+        ["created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_windgenerationforecast_wind_farm_id",
+        "windgenerationforecast",
+        ["wind_farm_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_windgenerationforecast_forecast_time",
+        "windgenerationforecast",
+        ["forecast_time"],
+        unique=False,
+    )
+
+    op.drop_index(
+        "ix_windfarmgenerationrecord_wind_farm_id_timestamp",
+        table_name="windfarmgenerationrecord",
+    )
+    op.create_index(
+        "ix_windfarmgenerationrecord_wind_farm_id",
+        "windfarmgenerationrecord",
+        ["wind_farm_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_windfarmgenerationrecord_timestamp",
+        "windfarmgenerationrecord",
+        ["timestamp"],
+        unique=False,
+    )
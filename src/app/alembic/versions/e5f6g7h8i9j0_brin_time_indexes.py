@@ -0,0 +1,53 @@
+"""Add BRIN indexes on time columns of append-only generation tables.
+
+Revision ID: e5f6g7h8i9j0
+Revises: d4e5f6g7h8i9
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5f6g7h8i9j0"
+down_revision = "d4e5f6g7h8i9"
+branch_labels = None
+depends_on = None
+
+# (index name, table, column) for every time-ordered column
+BRIN_INDEXES = [
+    (
+        "ix_windfarmgenerationrecord_timestamp_brin",
+        "windfarmgenerationrecord",
+        "timestamp",
+    ),
+    (
+        "ix_windgenerationforecast_forecast_time_brin",
+        "windgenerationforecast",
+        "forecast_time",
+    ),
+    (
+        "ix_windgenerationforecast_created_at_brin",
+        "windgenerationforecast",
+        "created_at",
+    ),
+]
+
+
+def upgrade() -> None:
+    # Rows arrive in time order, so a block-range summary is enough for
+    # cross-farm time range scans at a fraction of a B-tree's size
+    for name, table, column in BRIN_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            unique=False,
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        )
+
+
+def downgrade() -> None:
+    for name, table, _column in reversed(BRIN_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,141 @@
+"""Partition generation records and forecasts by month.
+
+Revision ID: f6g7h8i9j0k1
+Revises: e5f6g7h8i9j0
+Create Date: 2026-10-16
+
+Both tables are rebuilt as ``PARTITION BY RANGE`` on their time column with
+monthly partitions for 2025-2027 and a DEFAULT partition catching anything
+outside that range. Partitions for later months must be created before data
+for them lands in the DEFAULT partition.
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f6g7h8i9j0k1"
+down_revision = "e5f6g7h8i9j0"
+branch_labels = None
+depends_on = None
+
+FIRST_PARTITION_YEAR = 2025
+LAST_PARTITION_YEAR = 2027
+
+# table -> (partition key, indexes as (name, DDL suffix after "ON <table>"))
+PARTITIONED_TABLES = {
+    "windfarmgenerationrecord": (
+        "timestamp",
+        [
+            (
+                "ix_windfarmgenerationrecord_wind_farm_id_timestamp",
+                "(wind_farm_id, timestamp) INCLUDE (generation, is_synthetic)",
+            ),
+            (
+                "ix_windfarmgenerationrecord_timestamp_brin",
+                "USING brin (timestamp) WITH (pages_per_range = 32)",
+            ),
+        ],
+    ),
+    "windgenerationforecast": (
+        "forecast_time",
+        [
+            (
+                "ix_windgenerationforecast_wind_farm_id_forecast_time",
+                "(wind_farm_id, forecast_time DESC)",
+            ),
+            (
+                "ix_windgenerationforecast_wind_farm_id_created_at",
+                "(wind_farm_id, created_at DESC)",
+            ),
+            (
+                "ix_windgenerationforecast_forecast_time_brin",
+                "USING brin (forecast_time) WITH (pages_per_range = 32)",
+            ),
+            (
+                "ix_windgenerationforecast_created_at_brin",
+                "USING brin (created_at) WITH (pages_per_range = 32)",
+            ),
+        ],
+    ),
+}
+
+
+def _month_ranges() -> list[tuple[str, str, str]]:
+    """Return (suffix, from, to) for every monthly partition."""
+    ranges = []
+    for year in range(FIRST_PARTITION_YEAR, LAST_PARTITION_YEAR + 1):
+        for month in range(1, 13):
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            ranges.append(
+                (
+                    f"{year}_{month:02d}",
+                    f"{year}-{month:02d}-01 00:00+00",
+                    f"{next_year}-{next_month:02d}-01 00:00+00",
+                )
+            )
+    return ranges
+
+
+def _rebuild_table(table: str, partition_key: str | None) -> None:
+    """Recreate a table with the same columns and move its rows across.
+
+    Args:
+        table: Table to rebuild.
+        partition_key: Column to range-partition by, or None for a plain table.
+    """
+    _key, indexes = PARTITIONED_TABLES[table]
+    old = f"{table}_old"
+
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    op.execute(
+        f"ALTER TABLE {old} RENAME CONSTRAINT {table}_wind_farm_id_fkey "
+        f"TO {old}_wind_farm_id_fkey"
+    )
+    for name, _definition in indexes:
+        op.execute(f"DROP INDEX {name}")
+
+    if partition_key:
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING COMMENTS)"
+            f" PARTITION BY RANGE ({partition_key})"
+        )
+        # The primary key of a partitioned table must contain the partition key
+        op.execute(
+            f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey "
+            f"PRIMARY KEY (id, {partition_key})"
+        )
+        for suffix, start, end in _month_ranges():
+            op.execute(
+                f"CREATE TABLE {table}_{suffix} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    else:
+        op.execute(
+            f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS INCLUDING COMMENTS)"
+        )
+        op.execute(f"ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)")
+
+    op.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {table}_wind_farm_id_fkey "
+        f"FOREIGN KEY (wind_farm_id) REFERENCES windfarm (id)"
+    )
+    # Keep the id sequence alive when the old table is dropped
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+
+    for name, definition in indexes:
+        op.execute(f"CREATE INDEX {name} ON {table} {definition}")
+
+
+def upgrade() -> None:
+    for table, (partition_key, _indexes) in PARTITIONED_TABLES.items():
+        _rebuild_table(table, partition_key)
+
+
+def downgrade() -> None:
+    for table in PARTITIONED_TABLES:
+        _rebuild_table(table, None)
@@ -0,0 +1,54 @@
+"""Store generation record fleet statuses as JSONB.
+
+Revision ID: h8i9j0k1l2m3
+Revises: g7h8i9j0k1l2
+Create Date: 2026-10-16
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "h8i9j0k1l2m3"
+down_revision = "g7h8i9j0k1l2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Binary storage avoids reparsing the document on every access; the
+    # change cascades to every partition
+    op.alter_column(
+        "windfarmgenerationrecord",
+        "fleet_statuses",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=False,
+        postgresql_using="fleet_statuses::jsonb",
+    )
+    # Containment lookups such as fleet_statuses @> '{"3": "off"}'
+    op.create_index(
+        "ix_windfarmgenerationrecord_fleet_statuses",
+        "windfarmgenerationrecord",
+        ["fleet_statuses"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"fleet_statuses": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_windfarmgenerationrecord_fleet_statuses",
+        table_name="windfarmgenerationrecord",
+    )
+    op.alter_column(
+        "windfarmgenerationrecord",
+        "fleet_statuses",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=False,
+        postgresql_using="fleet_statuses::json",
+    )
@@ -0,0 +1,38 @@
+"""Default forecast run start times to clock_timestamp().
+
+Revision ID: i9j0k1l2m3n4
+Revises: h8i9j0k1l2m3
+Create Date: 2026-10-16
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "i9j0k1l2m3n4"
+down_revision = "h8i9j0k1l2m3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # now() is fixed for the whole transaction, so every run of a batch would
+    # share one start time
+    op.alter_column(
+        "forecastrun",
+        "started_at",
+        server_default=sa.text("clock_timestamp()"),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "forecastrun",
+        "started_at",
+        server_default=sa.text("now()"),
+        existing_type=sa.DateTime(timezone=True),
+        existing_nullable=False,
+    )
@@ -0,0 +1,54 @@
+"""Make forecasts unique per farm, time and granularity.
+
+Revision ID: j0k1l2m3n4o5
+Revises: i9j0k1l2m3n4
+Create Date: 2026-10-16
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "j0k1l2m3n4o5"
+down_revision = "i9j0k1l2m3n4"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keep only the newest row of any duplicates before enforcing uniqueness
+    op.execute("""
+        DELETE FROM windgenerationforecast a
+        USING windgenerationforecast b
+        WHERE a.wind_farm_id = b.wind_farm_id
+          AND a.forecast_time = b.forecast_time
+          AND a.granularity = b.granularity
+          AND a.id < b.id
+    """)
+
+    # Conflict target for forecast upserts. It also serves farm + time range
+    # lookups, so the plain composite index it supersedes is dropped.
+    op.create_index(
+        "uq_windgenerationforecast_farm_time_granularity",
+        "windgenerationforecast",
+        ["wind_farm_id", "forecast_time", "granularity"],
+        unique=True,
+    )
+    op.drop_index(
+        "ix_windgenerationforecast_wind_farm_id_forecast_time",
+        table_name="windgenerationforecast",
+    )
+
+
+def downgrade() -> None:
+    op.create_index(
+        "ix_windgenerationforecast_wind_farm_id_forecast_time",
+        "windgenerationforecast",
+        ["wind_farm_id", sa.text("forecast_time DESC")],
+        unique=False,
+    )
+    op.drop_index(
+        "uq_windgenerationforecast_farm_time_granularity",
+        table_name="windgenerationforecast",
+    )
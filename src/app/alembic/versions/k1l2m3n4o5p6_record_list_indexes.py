@@ -0,0 +1,45 @@
+"""Add composite indexes for wind and turbine generation record lists.
+
+Revision ID: k1l2m3n4o5p6
+Revises: j0k1l2m3n4o5
+Create Date: 2026-10-16
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "k1l2m3n4o5p6"
+down_revision = "j0k1l2m3n4o5"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filter by owner key, newest first: the list endpoints' access path.
+    # Farm generation records and forecasts are already covered by their
+    # (wind_farm_id, time) indexes.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_windrecord_location_id_timestamp",
+            "windrecord",
+            ["location_id", sa.text("timestamp DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_windturbinegenerationrecord_wind_turbine_id_timestamp",
+            "windturbinegenerationrecord",
+            ["wind_turbine_id", sa.text("timestamp DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_windturbinegenerationrecord_wind_turbine_id_timestamp",
+        table_name="windturbinegenerationrecord",
+    )
+    op.drop_index("ix_windrecord_location_id_timestamp", table_name="windrecord")
@@ -0,0 +1,55 @@
+"""Make wind turbine types unique.
+
+Revision ID: l2m3n4o5p6q7
+Revises: k1l2m3n4o5p6
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "l2m3n4o5p6q7"
+down_revision = "k1l2m3n4o5p6"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Point fleets and generation records at the oldest turbine of each type,
+    # then drop the duplicates so the unique index can be built
+    op.execute("""
+        CREATE TEMPORARY TABLE turbine_dedupe ON COMMIT DROP AS
+        SELECT id, min(id) OVER (PARTITION BY turbine_type) AS keep_id
+        FROM windturbine
+        WHERE turbine_type IS NOT NULL
+    """)
+    op.execute("""
+        UPDATE windturbinefleet f
+        SET wind_turbine_id = d.keep_id
+        FROM turbine_dedupe d
+        WHERE f.wind_turbine_id = d.id AND d.id <> d.keep_id
+    """)
+    op.execute("""
+        UPDATE windturbinegenerationrecord r
+        SET wind_turbine_id = d.keep_id
+        FROM turbine_dedupe d
+        WHERE r.wind_turbine_id = d.id AND d.id <> d.keep_id
+    """)
+    op.execute("""
+        DELETE FROM windturbine t
+        USING turbine_dedupe d
+        WHERE t.id = d.id AND d.id <> d.keep_id
+    """)
+
+    # Conflict target for the idempotent turbine library import
+    op.create_index(
+        "ix_windturbine_turbine_type",
+        "windturbine",
+        ["turbine_type"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_windturbine_turbine_type", table_name="windturbine")
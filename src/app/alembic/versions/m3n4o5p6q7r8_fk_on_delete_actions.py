@@ -0,0 +1,49 @@
+"""Let the database cascade deletes of farms, turbines and power curves.
+
+Revision ID: m3n4o5p6q7r8
+Revises: l2m3n4o5p6q7
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "m3n4o5p6q7r8"
+down_revision = "l2m3n4o5p6q7"
+branch_labels = None
+depends_on = None
+
+# (table, column, referenced table, ON DELETE action)
+FOREIGN_KEYS = [
+    ("windturbinefleet", "wind_farm_id", "windfarm", "CASCADE"),
+    ("windfarmgenerationrecord", "wind_farm_id", "windfarm", "CASCADE"),
+    ("windgenerationforecast", "wind_farm_id", "windfarm", "CASCADE"),
+    ("forecastrun", "wind_farm_id", "windfarm", "CASCADE"),
+    ("windturbine", "power_curve_id", "powercurve", "SET NULL"),
+    ("windturbinegenerationrecord", "wind_turbine_id", "windturbine", "SET NULL"),
+]
+
+
+def _recreate(ondelete: bool) -> None:
+    for table, column, referent, action in FOREIGN_KEYS:
+        name = f"{table}_{column}_fkey"
+        op.drop_constraint(name, table, type_="foreignkey")
+        op.create_foreign_key(
+            name,
+            table,
+            referent,
+            [column],
+            ["id"],
+            ondelete=action if ondelete else None,
+        )
+
+
+def upgrade() -> None:
+    # Single-statement deletes in the API rely on the database to clear or
+    # detach dependent rows instead of the ORM loading them first
+    _recreate(ondelete=True)
+
+
+def downgrade() -> None:
+    _recreate(ondelete=False)
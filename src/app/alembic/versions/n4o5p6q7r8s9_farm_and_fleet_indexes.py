@@ -0,0 +1,40 @@
+"""Add indexes for per-user wind farm and per-farm fleet lookups.
+
+Revision ID: n4o5p6q7r8s9
+Revises: m3n4o5p6q7r8
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "n4o5p6q7r8s9"
+down_revision = "m3n4o5p6q7r8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Wind farm endpoints filter by owner and page or look up by id; fleets
+    # are listed per farm and removed by the farm's ON DELETE CASCADE.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_windfarm_user_id_id",
+            "windfarm",
+            ["user_id", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_windturbinefleet_wind_farm_id",
+            "windturbinefleet",
+            ["wind_farm_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_windturbinefleet_wind_farm_id", table_name="windturbinefleet")
+    op.drop_index("ix_windfarm_user_id_id", table_name="windfarm")
@@ -0,0 +1,85 @@
+"""Store power curves as parallel wind speed and power arrays.
+
+Revision ID: o5p6q7r8s9t0
+Revises: n4o5p6q7r8s9
+Create Date: 2026-10-16
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "o5p6q7r8s9t0"
+down_revision = "n4o5p6q7r8s9"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Sorted float8[] columns feed numpy.interp directly, without parsing
+    # stringified wind speed keys
+    op.add_column(
+        "powercurve",
+        sa.Column(
+            "wind_speeds",
+            postgresql.ARRAY(sa.Float()),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.add_column(
+        "powercurve",
+        sa.Column(
+            "power_values",
+            postgresql.ARRAY(sa.Float()),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.execute(
+        """
+        UPDATE powercurve SET
+            wind_speeds = ARRAY(
+                SELECT key::float8
+                FROM json_each_text(wind_speed_value_map)
+                ORDER BY key::float8
+            ),
+            power_values = ARRAY(
+                SELECT value::float8
+                FROM json_each_text(wind_speed_value_map)
+                ORDER BY key::float8
+            )
+        """
+    )
+    op.alter_column("powercurve", "wind_speeds", server_default=None)
+    op.alter_column("powercurve", "power_values", server_default=None)
+    op.drop_column("powercurve", "wind_speed_value_map")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "powercurve",
+        sa.Column(
+            "wind_speed_value_map",
+            sa.JSON(),
+            nullable=False,
+            server_default="{}",
+        ),
+    )
+    op.execute(
+        """
+        UPDATE powercurve SET
+            wind_speed_value_map = COALESCE(
+                (
+                    SELECT json_object_agg(speed::text, power ORDER BY speed)
+                    FROM unnest(wind_speeds, power_values) AS point(speed, power)
+                ),
+                '{}'::json
+            )
+        """
+    )
+    op.alter_column("powercurve", "wind_speed_value_map", server_default=None)
+    op.drop_column("powercurve", "power_values")
+    op.drop_column("powercurve", "wind_speeds")
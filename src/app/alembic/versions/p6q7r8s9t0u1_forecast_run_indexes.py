@@ -0,0 +1,41 @@
+"""Add range-scan indexes for forecast run listings.
+
+Revision ID: p6q7r8s9t0u1
+Revises: o5p6q7r8s9t0
+Create Date: 2026-10-16
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "p6q7r8s9t0u1"
+down_revision = "o5p6q7r8s9t0"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # /forecasts/runs returns the newest runs, optionally for one farm; the
+    # composite index also serves the farm's ON DELETE CASCADE
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_forecastrun_wind_farm_id_started_at",
+            "forecastrun",
+            ["wind_farm_id", sa.text("started_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_forecastrun_started_at",
+            "forecastrun",
+            [sa.text("started_at DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_forecastrun_started_at", table_name="forecastrun")
+    op.drop_index("ix_forecastrun_wind_farm_id_started_at", table_name="forecastrun")
@@ -0,0 +1,47 @@
+"""Add BRIN indexes on the time columns of the measurement record tables.
+
+Revision ID: q7r8s9t0u1v2
+Revises: p6q7r8s9t0u1
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "q7r8s9t0u1v2"
+down_revision = "p6q7r8s9t0u1"
+branch_labels = None
+depends_on = None
+
+# (index name, table, column) for the time-ordered columns not yet covered
+BRIN_INDEXES = [
+    ("ix_windrecord_timestamp_brin", "windrecord", "timestamp"),
+    (
+        "ix_windturbinegenerationrecord_timestamp_brin",
+        "windturbinegenerationrecord",
+        "timestamp",
+    ),
+]
+
+
+def upgrade() -> None:
+    # Measurements are ingested in time order like the generation tables, so
+    # time range scans across locations or turbines get the same small BRIN
+    # summary; the per-location/turbine B-trees stay for the list endpoints
+    with op.get_context().autocommit_block():
+        for name, table, column in BRIN_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using="brin",
+                postgresql_with={"pages_per_range": 32},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    for name, table, _column in reversed(BRIN_INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,108 @@
+"""Partition wind measurement records by month.
+
+Revision ID: r8s9t0u1v2w3
+Revises: q7r8s9t0u1v2
+Create Date: 2026-10-16
+
+Same layout as the generation tables: ``PARTITION BY RANGE (timestamp)`` with
+monthly partitions for 2025-2027 and a DEFAULT partition catching anything
+outside that range.
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "r8s9t0u1v2w3"
+down_revision = "q7r8s9t0u1v2"
+branch_labels = None
+depends_on = None
+
+TABLE = "windrecord"
+FIRST_PARTITION_YEAR = 2025
+LAST_PARTITION_YEAR = 2027
+
+# (name, DDL suffix after "ON windrecord")
+INDEXES = [
+    ("ix_windrecord_location_id_timestamp", "(location_id, timestamp DESC)"),
+    (
+        "ix_windrecord_timestamp_brin",
+        "USING brin (timestamp) WITH (pages_per_range = 32)",
+    ),
+]
+
+
+def _month_ranges() -> list[tuple[str, str, str]]:
+    """Return (suffix, from, to) for every monthly partition."""
+    ranges = []
+    for year in range(FIRST_PARTITION_YEAR, LAST_PARTITION_YEAR + 1):
+        for month in range(1, 13):
+            next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+            ranges.append(
+                (
+                    f"{year}_{month:02d}",
+                    f"{year}-{month:02d}-01 00:00+00",
+                    f"{next_year}-{next_month:02d}-01 00:00+00",
+                )
+            )
+    return ranges
+
+
+def _rebuild_table(partitioned: bool) -> None:
+    """Recreate windrecord with the same columns and move its rows across.
+
+    Args:
+        partitioned: Range-partition by timestamp, or build a plain table.
+    """
+    old = f"{TABLE}_old"
+
+    op.execute(f"ALTER TABLE {TABLE} RENAME TO {old}")
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {TABLE}_pkey TO {old}_pkey")
+    op.execute(
+        f"ALTER TABLE {old} RENAME CONSTRAINT {TABLE}_location_id_fkey "
+        f"TO {old}_location_id_fkey"
+    )
+    for name, _definition in INDEXES:
+        op.execute(f"DROP INDEX {name}")
+
+    if partitioned:
+        op.execute(
+            f"CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS INCLUDING COMMENTS)"
+            " PARTITION BY RANGE (timestamp)"
+        )
+        # The primary key of a partitioned table must contain the partition key
+        op.execute(
+            f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey "
+            "PRIMARY KEY (id, timestamp)"
+        )
+        for suffix, start, end in _month_ranges():
+            op.execute(
+                f"CREATE TABLE {TABLE}_{suffix} PARTITION OF {TABLE} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            )
+        op.execute(f"CREATE TABLE {TABLE}_default PARTITION OF {TABLE} DEFAULT")
+    else:
+        op.execute(
+            f"CREATE TABLE {TABLE} (LIKE {old} INCLUDING DEFAULTS INCLUDING COMMENTS)"
+        )
+        op.execute(f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_pkey PRIMARY KEY (id)")
+
+    op.execute(
+        f"ALTER TABLE {TABLE} ADD CONSTRAINT {TABLE}_location_id_fkey "
+        "FOREIGN KEY (location_id) REFERENCES location (id)"
+    )
+    # Keep the id sequence alive when the old table is dropped
+    op.execute(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    op.execute(f"INSERT INTO {TABLE} SELECT * FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+
+    for name, definition in INDEXES:
+        op.execute(f"CREATE INDEX {name} ON {TABLE} {definition}")
+
+
+def upgrade() -> None:
+    _rebuild_table(partitioned=True)
+
+
+def downgrade() -> None:
+    _rebuild_table(partitioned=False)
@@ -0,0 +1,53 @@
+"""Store granularity as a SMALLINT code instead of a Postgres enum.
+
+Revision ID: s9t0u1v2w3x4
+Revises: r8s9t0u1v2w3
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "s9t0u1v2w3x4"
+down_revision = "r8s9t0u1v2w3"
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    "windturbinegenerationrecord",
+    "windfarmgenerationrecord",
+    "windgenerationforecast",
+]
+
+# Enum label -> stored code, matching GRANULARITY_CODES on the models
+CODES = {
+    "min_1": 1,
+    "min_5": 2,
+    "min_15": 3,
+    "min_30": 4,
+    "min_60": 5,
+}
+
+
+def upgrade() -> None:
+    # Two bytes per row instead of the enum's four, on every generation and
+    # forecast row
+    cases = " ".join(f"WHEN '{label}' THEN {code}" for label, code in CODES.items())
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN granularity TYPE SMALLINT "
+            f"USING CASE granularity::text {cases} END"
+        )
+    op.execute("DROP TYPE granularityenum")
+
+
+def downgrade() -> None:
+    labels = ", ".join(f"'{label}'" for label in CODES)
+    cases = " ".join(f"WHEN {code} THEN '{label}'" for label, code in CODES.items())
+    op.execute(f"CREATE TYPE granularityenum AS ENUM ({labels})")
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN granularity TYPE granularityenum "
+            f"USING (CASE granularity {cases} END)::granularityenum"
+        )
@@ -0,0 +1,34 @@
+"""Store wind directions as SMALLINT tenths of a degree.
+
+Revision ID: t0u1v2w3x4y5
+Revises: s9t0u1v2w3x4
+Create Date: 2026-10-16
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "t0u1v2w3x4y5"
+down_revision = "s9t0u1v2w3x4"
+branch_labels = None
+depends_on = None
+
+TABLES = ["windrecord", "windfarmgenerationrecord", "windgenerationforecast"]
+
+
+def upgrade() -> None:
+    # 0.1 degree is all the precision the sources carry; matches DirectionType
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN wind_direction TYPE SMALLINT "
+            "USING (round(wind_direction * 10)::integer % 3600)"
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN wind_direction TYPE DOUBLE PRECISION "
+            "USING wind_direction / 10.0"
+        )
@@ -4,16 +4,20 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy import select
+from sqlalchemy import insert, lambda_stmt, select
+from sqlalchemy.exc import IntegrityError
 
 from app.core.deps import CurrentUser, DatabaseSession
 from app.core.security import (
     create_access_token,
+    dummy_verify_password,
+    generate_api_key,
     get_password_hash,
     verify_password,
 )
+from app.models.api_key import APIKey
 from app.models.user import User
-from app.schemas.auth import Token
+from app.schemas.auth import APIKeyCreate, APIKeyCreated, Token
 from app.schemas.user import UserCreate, UserRead
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -36,25 +40,26 @@ async def register(
     Raises:
         HTTPException: If email already registered.
     """
-    # Check if user exists
-    result = await db.execute(select(User).where(User.email == user_in.email))
-    if result.scalar_one_or_none():
+    # Create user in a single INSERT ... RETURNING round-trip; the unique
+    # index on email rejects duplicates
+    stmt = (
+        insert(User)
+        .values(
+            email=user_in.email,
+            hashed_password=get_password_hash(user_in.password),
+            full_name=user_in.full_name,
+        )
+        .returning(User)
+    )
+    try:
+        result = await db.execute(stmt)
+    except IntegrityError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
 
-    # Create user
-    user = User(
-        email=user_in.email,
-        hashed_password=get_password_hash(user_in.password),
-        full_name=user_in.full_name,
-    )
-    db.add(user)
-    await db.flush()
-    await db.refresh(user)
-
-    return user
+    return result.scalar_one()
 
 
 @router.post("/login", response_model=Token)
@@ -74,23 +79,35 @@ async def login(
     Raises:
         HTTPException: If credentials are invalid.
     """
-    # Find user by email
-    result = await db.execute(select(User).where(User.email == form_data.username))
+    # Find user by email; lambda_stmt caches the built statement, so only
+    # the email is bound per request
+    email = form_data.username
+    result = await db.execute(
+        lambda_stmt(lambda: select(User).where(User.email == email))
+    )
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email or password",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    if not user:
+        # Same bcrypt cost as a real check so unknown emails can't be timed
+        dummy_verify_password(form_data.password)
+        raise credentials_exception
 
+    # Deactivated accounts are rejected before paying for bcrypt
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user",
         )
 
+    if not verify_password(form_data.password, user.hashed_password):
+        raise credentials_exception
+
     # Create access token
     access_token = create_access_token(subject=user.id)
 
@@ -108,3 +125,43 @@ async def get_current_user_info(current_user: CurrentUser) -> User:
         Current user data.
     """
     return current_user
+
+
+@router.post(
+    "/api-keys", response_model=APIKeyCreated, status_code=status.HTTP_201_CREATED
+)
+async def create_api_key(
+    key_in: APIKeyCreate,
+    current_user: CurrentUser,
+    db: DatabaseSession,
+) -> APIKeyCreated:
+    """Issue an API key for the current user.
+
+    Intended for service accounts such as the forecast pipeline, which can
+    then authenticate with "Authorization: ApiKey <key>" instead of a
+    password login. The plain key is only returned in this response.
+
+    Args:
+        key_in: API key name.
+        current_user: Current authenticated user.
+        db: Database session.
+
+    Returns:
+        Issued API key.
+    """
+    key, prefix, key_hash = generate_api_key()
+    result = await db.execute(
+        insert(APIKey)
+        .values(
+            user_id=current_user.id,
+            name=key_in.name,
+            prefix=prefix,
+            key_hash=key_hash,
+        )
+        .returning(APIKey.id, APIKey.created_at)
+    )
+    row = result.one()
+
+    return APIKeyCreated(
+        id=row.id, name=key_in.name, key=key, created_at=row.created_at
+    )
@@ -2,23 +2,33 @@
 
 import logging
 import traceback
+from collections.abc import AsyncIterator
 
+import orjson
 from fastapi import APIRouter
-from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 
-from app.core.deps import CurrentUser, DatabaseSession
-from app.services.ai_agent_service import AIAgentService
+from app.core.database import async_session_maker
+from app.core.deps import CurrentUser
+from app.services.ai_agent_service import get_agent
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Upper bounds on what a client may send per turn
+MAX_MESSAGE_LENGTH = 4000
+MAX_HISTORY_MESSAGES = 20
+
 
 class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
 
-    message: str
-    conversation_history: list[dict[str, str]] | None = None
+    message: str = Field(max_length=MAX_MESSAGE_LENGTH)
+    conversation_history: list[dict[str, str]] | None = Field(
+        default=None, max_length=MAX_HISTORY_MESSAGES
+    )
 
 
 class ChatResponse(BaseModel):
@@ -28,10 +38,15 @@ class ChatResponse(BaseModel):
     success: bool = True
 
 
+def _sse_event(data: dict[str, str], event: str | None = None) -> bytes:
+    """Encode one server-sent event with a JSON payload."""
+    prefix = f"event: {event}\n".encode() if event else b""
+    return prefix + b"data: " + orjson.dumps(data) + b"\n\n"
+
+
 @router.post("/", response_model=ChatResponse)
 async def chat_with_agent(
     request: ChatRequest,
-    session: DatabaseSession,
     current_user: CurrentUser,
 ) -> ChatResponse:
     """
@@ -48,10 +63,10 @@ async def chat_with_agent(
         logger.info(
             f"Chat request from user {current_user.id}: {request.message[:100]}"
         )
-        agent = AIAgentService()
+        agent = get_agent()
         response = await agent.chat(
             message=request.message,
-            session=session,
+            session_factory=async_session_maker,
             user_id=current_user.id,
             conversation_history=request.conversation_history,
         )
@@ -60,3 +75,48 @@ async def chat_with_agent(
     except Exception as e:
         logger.error(f"Chat error: {str(e)}\n{traceback.format_exc()}")
         return ChatResponse(response=f"Error: {str(e)}", success=False)
+
+
+@router.post("/stream", response_class=StreamingResponse)
+async def stream_chat_with_agent(
+    request: ChatRequest,
+    current_user: CurrentUser,
+) -> StreamingResponse:
+    """
+    Chat with the AI agent, streaming the reply as server-sent events.
+
+    Each ``data`` event carries ``{"content": ...}`` with the next piece of
+    the reply. When the model calls tools, a ``turn`` event closes the text
+    it wrote in that turn; the final answer is the text after the last
+    ``turn`` event. The stream ends with a ``done`` event, or an ``error``
+    event carrying ``{"error": ...}`` if the agent failed.
+    """
+    logger.info(
+        f"Streaming chat request from user {current_user.id}: {request.message[:100]}"
+    )
+    agent = get_agent()
+    user_id = current_user.id
+
+    async def events() -> AsyncIterator[bytes]:
+        try:
+            async for piece in agent.chat_stream(
+                message=request.message,
+                session_factory=async_session_maker,
+                user_id=user_id,
+                conversation_history=request.conversation_history,
+            ):
+                if piece is None:
+                    yield _sse_event({}, event="turn")
+                else:
+                    yield _sse_event({"content": piece})
+        except Exception as e:
+            logger.error(f"Chat error: {str(e)}\n{traceback.format_exc()}")
+            yield _sse_event({"error": str(e)}, event="error")
+            return
+        yield _sse_event({}, event="done")
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,19 +1,76 @@
 """Forecast API endpoints."""
 
-from datetime import UTC, datetime
-
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
-from pydantic import BaseModel
-from sqlalchemy import select
+import logging
+from datetime import UTC, datetime, timedelta
+from typing import Annotated, Literal
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from pydantic import AfterValidator, BaseModel, Field
+from sqlalchemy import delete, func, lambda_stmt, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.database import async_session_maker
 from app.core.deps import CurrentUser, get_db
-from app.models import ForecastRun, GranularityEnum, WindGenerationForecast
-from app.services.forecast_service import ForecastService
+from app.core.responses import (
+    LambdaStep,
+    json_rows_stream,
+    list_etag,
+    not_modified,
+    schema_columns,
+    with_steps,
+)
+from app.models import ForecastRun, GranularityEnum, WindFarm, WindGenerationForecast
+from app.services.forecast_service import (
+    ForecastService,
+    forget_farm_forecasts,
+    request_cache,
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/forecasts", tags=["forecasts"])
 
 
+def _parse_granularity(value: str) -> GranularityEnum:
+    """Map an enum value ("60min") or member name ("min_60") to the enum."""
+    if value.startswith("min_"):
+        return GranularityEnum[value]
+    return GranularityEnum(value)
+
+
+# Granularity accepted by the generate endpoints (supports both formats)
+Granularity = Annotated[
+    Literal[
+        "1min",
+        "5min",
+        "15min",
+        "30min",
+        "60min",
+        "min_1",
+        "min_5",
+        "min_15",
+        "min_30",
+        "min_60",
+    ],
+    AfterValidator(_parse_granularity),
+]
+
+# Resolutions offered by the on-demand forecast request endpoint
+RequestGranularity = Literal["15min", "30min", "60min"]
+
+# Upper bound on wind farms accepted by a single batch request
+MAX_BATCH_SIZE = 100
+
+
 # ==================== Schemas ====================
 
 
@@ -22,7 +79,7 @@ class ForecastRequest(BaseModel):
 
     wind_farm_id: int
     forecast_hours: int = 48
-    granularity: str = "60min"
+    granularity: Granularity = GranularityEnum.min_60
     weather_model: str = "best_match"
 
 
@@ -39,6 +96,30 @@ class ForecastResponse(BaseModel):
     total_forecasted_generation_kwh: float = 0.0
 
 
+class BatchForecastRequest(BaseModel):
+    """Request to generate forecasts for several wind farms."""
+
+    wind_farm_ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+    forecast_hours: int = 48
+    granularity: Granularity = GranularityEnum.min_60
+    weather_model: str = "best_match"
+
+
+class BatchForecastItem(BaseModel):
+    """Outcome for one wind farm in a batch."""
+
+    wind_farm_id: int
+    run_id: int | None = None
+    records_created: int = 0
+    error: str | None = None
+
+
+class BatchForecastResponse(BaseModel):
+    """Response after generating a batch of forecasts."""
+
+    results: list[BatchForecastItem]
+
+
 class ForecastRecordOut(BaseModel):
     """Forecast record output schema."""
 
@@ -78,6 +159,42 @@ class ForecastRunOut(BaseModel):
 # ==================== Endpoints ====================
 
 
+async def _run_queued_forecast(
+    run_id: int,
+    wind_farm_id: int,
+    forecast_hours: int,
+    granularity: GranularityEnum,
+    weather_model: str,
+) -> None:
+    """Generate a queued forecast in the background on its own session."""
+    async with async_session_maker() as db:
+        run = await db.get(ForecastRun, run_id)
+        if run is None:
+            return
+        try:
+            await ForecastService(db).generate_forecast(
+                wind_farm_id=wind_farm_id,
+                forecast_hours=forecast_hours,
+                granularity=granularity,
+                weather_model=weather_model,
+                run=run,
+            )
+            await db.commit()
+        except Exception as e:
+            logger.error(f"Forecast run {run_id} failed: {e}")
+            await db.rollback()
+            await db.execute(
+                update(ForecastRun)
+                .where(ForecastRun.id == run_id)
+                .values(
+                    status="failed",
+                    error_message=str(e)[:1000],
+                    completed_at=func.clock_timestamp(),
+                )
+            )
+            await db.commit()
+
+
 @router.post(
     "/generate",
     response_model=ForecastResponse,
@@ -89,64 +206,106 @@ async def generate_forecast(
     current_user: CurrentUser,
     db: AsyncSession = Depends(get_db),
 ) -> ForecastResponse:
-    """Generate wind power forecast for a wind farm.
+    """Queue a wind power forecast for a wind farm.
 
     Uses Open-Meteo weather forecast data and wind farm configuration
-    to predict future power generation.
+    to predict future power generation. The forecast runs in the background
+    after the response is sent; poll /forecasts/runs for its outcome.
     """
-    # Map granularity string to enum (supports both formats)
-    granularity_map = {
-        "1min": GranularityEnum.min_1,
-        "5min": GranularityEnum.min_5,
-        "15min": GranularityEnum.min_15,
-        "30min": GranularityEnum.min_30,
-        "60min": GranularityEnum.min_60,
-        "min_1": GranularityEnum.min_1,
-        "min_5": GranularityEnum.min_5,
-        "min_15": GranularityEnum.min_15,
-        "min_30": GranularityEnum.min_30,
-        "min_60": GranularityEnum.min_60,
-    }
-    granularity = granularity_map.get(request.granularity, GranularityEnum.min_60)
+    granularity = request.granularity
+
+    farm_exists = await db.scalar(
+        select(literal(1)).where(
+            WindFarm.id == request.wind_farm_id, WindFarm.user_id == current_user.id
+        )
+    )
+    if farm_exists is None:
+        raise HTTPException(
+            status_code=400, detail=f"Wind farm {request.wind_farm_id} not found"
+        )
+
+    run = ForecastRun(
+        wind_farm_id=request.wind_farm_id,
+        forecast_hours=request.forecast_hours,
+        weather_model=request.weather_model,
+        status="queued",
+    )
+    db.add(run)
+    await db.commit()
+
+    background_tasks.add_task(
+        _run_queued_forecast,
+        run.id,
+        request.wind_farm_id,
+        request.forecast_hours,
+        granularity,
+        request.weather_model,
+    )
+
+    return ForecastResponse(
+        wind_farm_id=request.wind_farm_id,
+        run_id=run.id,
+        message="Forecast queued",
+        weather_model=request.weather_model,
+    )
+
+
+@router.post(
+    "/generate-batch",
+    response_model=BatchForecastResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def generate_forecast_batch(
+    request: BatchForecastRequest,
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(get_db),
+) -> BatchForecastResponse:
+    """Generate wind power forecasts for several wind farms in one call.
+
+    Weather is downloaded once per location and shared by co-located farms.
+    A failure for one farm is reported in its result and does not affect
+    the others.
+    """
+    granularity = request.granularity
 
     service = ForecastService(db)
 
     try:
-        result = await service.generate_forecast(
-            wind_farm_id=request.wind_farm_id,
+        results = await service.generate_forecasts(
+            wind_farm_ids=request.wind_farm_ids,
+            user_id=current_user.id,
             forecast_hours=request.forecast_hours,
             granularity=granularity,
             weather_model=request.weather_model,
         )
 
         await db.commit()
-
-        return ForecastResponse(
-            wind_farm_id=result.wind_farm_id,
-            run_id=result.run_id,
-            message="Forecast generated successfully",
-            records_created=result.records_created,
-            forecast_start=result.forecast_start,
-            forecast_end=result.forecast_end,
-            weather_model=result.weather_model,
-            total_forecasted_generation_kwh=result.total_forecasted_generation_kwh,
-        )
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         await db.rollback()
         raise HTTPException(
             status_code=500,
-            detail=f"Failed to generate forecast: {e}",
+            detail=f"Failed to generate forecasts: {e}",
         )
 
+    return BatchForecastResponse(
+        results=[
+            BatchForecastItem(
+                wind_farm_id=r.wind_farm_id,
+                run_id=r.result.run_id if r.result else None,
+                records_created=r.result.records_created if r.result else 0,
+                error=r.error,
+            )
+            for r in results
+        ]
+    )
+
 
 class HistoricalForecastRequest(BaseModel):
     """Request to generate historical forecast."""
 
     wind_farm_id: int
     days_back: int = 30
-    granularity: str = "min_60"
+    granularity: Granularity = GranularityEnum.min_60
 
 
 @router.post(
@@ -164,20 +323,7 @@ async def generate_historical_forecast(
     This creates forecast records for past dates, allowing comparison
     with actual generation data for accuracy analysis.
     """
-    # Map granularity string to enum
-    granularity_map = {
-        "1min": GranularityEnum.min_1,
-        "5min": GranularityEnum.min_5,
-        "15min": GranularityEnum.min_15,
-        "30min": GranularityEnum.min_30,
-        "60min": GranularityEnum.min_60,
-        "min_1": GranularityEnum.min_1,
-        "min_5": GranularityEnum.min_5,
-        "min_15": GranularityEnum.min_15,
-        "min_30": GranularityEnum.min_30,
-        "min_60": GranularityEnum.min_60,
-    }
-    granularity = granularity_map.get(request.granularity, GranularityEnum.min_60)
+    granularity = request.granularity
 
     service = ForecastService(db)
 
@@ -215,26 +361,55 @@ async def generate_historical_forecast(
     response_model=list[ForecastRecordOut],
 )
 async def list_forecasts(
+    request: Request,
     current_user: CurrentUser,
     db: AsyncSession = Depends(get_db),
     wind_farm_id: int | None = None,
     start_time: datetime | None = None,
     end_time: datetime | None = None,
     limit: int = Query(default=1000, le=10000),
-) -> list[WindGenerationForecast]:
+) -> Response:
     """List forecast records with optional filters."""
-    query = select(WindGenerationForecast)
-
+    filters: list[LambdaStep] = []
     if wind_farm_id:
-        query = query.where(WindGenerationForecast.wind_farm_id == wind_farm_id)
+        filters.append(
+            lambda s: s.where(WindGenerationForecast.wind_farm_id == wind_farm_id)
+        )
     if start_time:
-        query = query.where(WindGenerationForecast.forecast_time >= start_time)
+        filters.append(
+            lambda s: s.where(WindGenerationForecast.forecast_time >= start_time)
+        )
     if end_time:
-        query = query.where(WindGenerationForecast.forecast_time <= end_time)
+        filters.append(
+            lambda s: s.where(WindGenerationForecast.forecast_time <= end_time)
+        )
 
-    query = query.order_by(WindGenerationForecast.forecast_time).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    # Regenerating upserts rows and resets created_at, so the latest
+    # created_at moves whenever any listed forecast changes
+    etag, total = await list_etag(
+        db,
+        with_steps(
+            lambda_stmt(
+                lambda: select(
+                    func.count(), func.max(WindGenerationForecast.created_at)
+                )
+            ),
+            filters,
+        ),
+    )
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    # lambda_stmt caches the compiled SQL per combination of filters
+    query = with_steps(
+        lambda_stmt(
+            lambda: select(*schema_columns(WindGenerationForecast, ForecastRecordOut))
+        ),
+        filters,
+    )
+    query += lambda s: s.order_by(WindGenerationForecast.forecast_time).limit(limit)
+    return await json_rows_stream(query, total, etag=etag)
 
 
 @router.get(
@@ -248,12 +423,12 @@ async def list_forecast_runs(
     limit: int = Query(default=50, le=500),
 ) -> list[ForecastRun]:
     """List forecast pipeline runs."""
-    query = select(ForecastRun)
+    query = lambda_stmt(lambda: select(ForecastRun))
 
     if wind_farm_id:
-        query = query.where(ForecastRun.wind_farm_id == wind_farm_id)
+        query += lambda s: s.where(ForecastRun.wind_farm_id == wind_farm_id)
 
-    query = query.order_by(ForecastRun.started_at.desc()).limit(limit)
+    query += lambda s: s.order_by(ForecastRun.started_at.desc()).limit(limit)
     result = await db.execute(query)
     return list(result.scalars().all())
 
@@ -272,47 +447,42 @@ async def request_forecast(
     start_hours_from_now: int = Query(
         default=0, ge=0, description="Start offset in hours from now"
     ),
-    granularity: str = Query(
+    granularity: RequestGranularity = Query(
         default="60min", description="Time resolution: 15min, 30min, or 60min"
     ),
 ) -> list[ForecastRecordOut]:
     """Request forecast data for a wind farm.
 
-    This endpoint ALWAYS generates a new forecast on each request (similar to /generate).
+    Generates a new forecast (similar to /generate) unless the same request was
+    answered within the last REQUEST_CACHE_TTL_SECONDS, in which case that
+    response is returned as is.
     Returns forecast data in the requested format with time horizon and granularity.
     """
-    from datetime import datetime, timedelta
-
-    from sqlalchemy import and_, delete
-
     # Verify ownership
-    from app.models import WindFarm
-
-    farm_stmt = select(WindFarm).where(
-        WindFarm.id == wind_farm_id, WindFarm.user_id == current_user.id
+    owned = await db.scalar(
+        select(literal(1)).where(
+            WindFarm.id == wind_farm_id, WindFarm.user_id == current_user.id
+        )
     )
-    farm_result = await db.execute(farm_stmt)
-    if not farm_result.scalar_one_or_none():
+    if owned is None:
         raise HTTPException(
             status_code=404, detail="Wind farm not found or access denied"
         )
 
-    # Map granularity string to enum
-    granularity_map = {
-        "15min": GranularityEnum.min_15,
-        "30min": GranularityEnum.min_30,
-        "60min": GranularityEnum.min_60,
-    }
-    gran_enum = granularity_map.get(granularity, GranularityEnum.min_60)
+    gran_enum = GranularityEnum(granularity)
 
-    # Always generate new forecast - delete old forecasts first
-    await db.execute(
-        delete(WindGenerationForecast).where(
-            WindGenerationForecast.wind_farm_id == wind_farm_id
-        )
+    cache_key = (
+        current_user.id,
+        wind_farm_id,
+        horizon_hours,
+        start_hours_from_now,
+        gran_enum.value,
     )
+    cached = request_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    # Generate new forecast
+    # Generate new forecast; existing rows for the same times are updated
     service = ForecastService(db)
     try:
         await service.generate_forecast(
@@ -334,23 +504,25 @@ async def request_forecast(
     end_time = start_time + timedelta(hours=horizon_hours)
 
     # Retrieve the newly generated forecasts matching the requested time range and granularity
-    query = (
-        select(WindGenerationForecast)
-        .where(
-            and_(
+    query = lambda_stmt(
+        lambda: (
+            select(WindGenerationForecast)
+            .where(
                 WindGenerationForecast.wind_farm_id == wind_farm_id,
                 WindGenerationForecast.forecast_time >= start_time,
                 WindGenerationForecast.forecast_time <= end_time,
                 WindGenerationForecast.granularity == gran_enum,
             )
+            .order_by(WindGenerationForecast.forecast_time.asc())
+            .limit(1000)  # Limit to 1000 records
         )
-        .order_by(WindGenerationForecast.forecast_time.asc())
     )
 
     result = await db.execute(query)
-    forecasts = list(result.scalars().all())
+    forecasts = [ForecastRecordOut.model_validate(f) for f in result.scalars()]
 
-    return forecasts[:1000]  # Limit to 1000 records
+    request_cache[cache_key] = forecasts
+    return forecasts
 
 
 @router.delete(
@@ -363,11 +535,15 @@ async def delete_forecasts(
     db: AsyncSession = Depends(get_db),
 ) -> None:
     """Delete all forecasts for a wind farm."""
-    from sqlalchemy import delete
-
     await db.execute(
-        delete(WindGenerationForecast).where(
-            WindGenerationForecast.wind_farm_id == wind_farm_id
-        )
+        lambda_stmt(
+            lambda: delete(WindGenerationForecast).where(
+                WindGenerationForecast.wind_farm_id == wind_farm_id
+            )
+        ),
+        execution_options={"synchronize_session": False},
     )
     await db.commit()
+
+    # Don't keep serving the deleted forecasts from the request cache
+    forget_farm_forecasts(wind_farm_id)
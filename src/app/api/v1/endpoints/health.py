@@ -1,6 +1,12 @@
 """Health check endpoints."""
 
-from fastapi import APIRouter
+import logging
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.core.database import warm_up_pool
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["health"])
 
@@ -21,6 +27,16 @@ async def readiness_check() -> dict[str, str]:
 
     Returns:
         Readiness status response.
+
+    Raises:
+        HTTPException: If the database is unreachable.
     """
-    # TODO: Add database connectivity check when PostgreSQL is added
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        logger.warning(f"Readiness check failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Database unavailable",
+        )
     return {"status": "ready"}
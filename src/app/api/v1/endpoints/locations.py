@@ -1,11 +1,14 @@
 """Location CRUD endpoints."""
 
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import lambda_stmt, select, update
 
+from app.core.database import on_commit
 from app.core.deps import CurrentUser, DatabaseSession
 from app.models import Location
 from app.schemas.wind_energy import LocationCreate, LocationRead, LocationUpdate
+from app.services.ai_agent_service import forget_user_farms
+from app.services.forecast_service import forget_farm_forecasts
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
@@ -35,7 +38,9 @@ async def list_locations(
     limit: int = 100,
 ) -> list[Location]:
     """List all locations."""
-    result = await db.execute(select(Location).offset(skip).limit(limit))
+    result = await db.execute(
+        lambda_stmt(lambda: select(Location).offset(skip).limit(limit))
+    )
     return list(result.scalars().all())
 
 
@@ -46,7 +51,9 @@ async def get_location(
     current_user: CurrentUser,
 ) -> Location:
     """Get a location by ID."""
-    result = await db.execute(select(Location).where(Location.id == location_id))
+    result = await db.execute(
+        lambda_stmt(lambda: select(Location).where(Location.id == location_id))
+    )
     location = result.scalar_one_or_none()
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
@@ -60,18 +67,24 @@ async def update_location(
     db: DatabaseSession,
     current_user: CurrentUser,
 ) -> Location:
-    """Update a location."""
-    result = await db.execute(select(Location).where(Location.id == location_id))
-    location = result.scalar_one_or_none()
+    """Update a location in one UPDATE ... RETURNING statement."""
+    update_data = location_in.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_location(location_id, db, current_user)
+
+    location = await db.scalar(
+        update(Location)
+        .where(Location.id == location_id)
+        .values(**update_data)
+        .returning(Location),
+        execution_options={"populate_existing": True},
+    )
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
-
-    update_data = location_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(location, field, value)
-
-    await db.flush()
-    await db.refresh(location)
+    # Locations are shared, so every user's cached farms and forecasts may
+    # depend on them
+    forget_user_farms(db)
+    on_commit(db, forget_farm_forecasts)
     return location
 
 
@@ -82,7 +95,9 @@ async def delete_location(
     current_user: CurrentUser,
 ) -> None:
     """Delete a location."""
-    result = await db.execute(select(Location).where(Location.id == location_id))
+    result = await db.execute(
+        lambda_stmt(lambda: select(Location).where(Location.id == location_id))
+    )
     location = result.scalar_one_or_none()
     if not location:
         raise HTTPException(status_code=404, detail="Location not found")
@@ -1,11 +1,31 @@
 """Wind and generation record endpoints."""
 
+from collections.abc import Callable
 from datetime import datetime
-
-from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import select
-
+from functools import cache
+from operator import attrgetter
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import delete, func, insert, lambda_stmt, select, tuple_
+
+from app.core.database import (
+    copy_converters,
+    copy_records,
+    reserve_ids,
+    stored_values,
+)
 from app.core.deps import CurrentUser, DatabaseSession
+from app.core.responses import (
+    LambdaStep,
+    json_rows_response,
+    list_etag,
+    not_modified,
+    schema_columns,
+    with_steps,
+)
 from app.models import WindFarmGenerationRecord, WindRecord, WindTurbineGenerationRecord
 from app.schemas.wind_energy import (
     GenerationRecordBulkCreate,
@@ -21,6 +41,130 @@ from app.schemas.wind_energy import (
 
 router = APIRouter(tags=["records"])
 
+# Bulk payloads at least this large are loaded with COPY instead of INSERT
+COPY_THRESHOLD = 1000
+
+
+@cache
+def _field_reader(
+    schema: type[BaseModel],
+) -> tuple[tuple[str, ...], Callable[[BaseModel], tuple[Any, ...]]]:
+    """Return a payload schema's field names and a getter reading them as a tuple.
+
+    Built once per schema, so bulk inserts read each payload with one C-level
+    attrgetter call instead of going through model_dump().
+    """
+    fields = tuple(schema.model_fields)
+    return fields, attrgetter(*fields)
+
+
+def _bulk_request_body(schema: type[BaseModel]) -> dict[str, Any]:
+    """OpenAPI request body for a bulk endpoint that parses its own payload.
+
+    The record schemas are already registered as components by the
+    single-record endpoints, so the nested definitions point there.
+    """
+    json_schema = schema.model_json_schema(ref_template="#/components/schemas/{model}")
+    json_schema.pop("$defs", None)
+    return {
+        "requestBody": {
+            "content": {"application/json": {"schema": json_schema}},
+            "required": True,
+        }
+    }
+
+
+async def _parse_bulk[BulkT: BaseModel](request: Request, schema: type[BulkT]) -> BulkT:
+    """Validate a bulk payload straight from the raw request body.
+
+    pydantic-core parses and validates the JSON in one pass, instead of
+    FastAPI decoding it with the stdlib json module and validating the
+    resulting Python objects afterwards.
+    """
+    try:
+        return schema.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError(
+            [
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ]
+        )
+
+
+async def _bulk_insert(
+    db: DatabaseSession, model: type[Any], records: list[BaseModel]
+) -> list[dict[str, Any]]:
+    """Insert payload records and return them as stored, with their ids.
+
+    Rows go through Core inserts on the model's table, so no ORM instances
+    are built or tracked. Small batches use one multi-row INSERT ... RETURNING
+    id. Large ones reserve their ids from the table's sequence and are
+    streamed in with COPY.
+    """
+    if not records:
+        return []
+
+    table = model.__table__
+    fields, read = _field_reader(type(records[0]))
+    # Normalized up front, so the returned rows match what was stored
+    read_back = stored_values(table, fields)
+    values = [read_back(read(r)) for r in records]
+    if len(values) < COPY_THRESHOLD:
+        result = await db.scalars(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            [dict(zip(fields, v, strict=True)) for v in values],
+        )
+        ids = list(result)
+    else:
+        ids = await reserve_ids(db, table.name, len(values))
+        converters = copy_converters(table, fields)
+        await copy_records(
+            db,
+            table.name,
+            ["id", *fields],
+            (
+                [id_, *(convert(x) for convert, x in zip(converters, v, strict=True))]
+                for id_, v in zip(ids, values, strict=True)
+            ),
+        )
+    return [
+        dict(zip(fields, v, strict=True), id=id_)
+        for id_, v in zip(ids, values, strict=True)
+    ]
+
+
+async def _insert_record(
+    db: DatabaseSession, model: type[Any], record: BaseModel
+) -> dict[str, Any]:
+    """Insert one payload record through the bulk path and return it as a row.
+
+    One INSERT ... RETURNING id, with no ORM instance and no refresh SELECT.
+    """
+    (row,) = await _bulk_insert(db, model, [record])
+    return row
+
+
+async def _get_record(
+    db: DatabaseSession, model: type[Any], record_id: int
+) -> Any | None:
+    """Load a record by id; the statement is compiled once per model."""
+    result = await db.execute(
+        lambda_stmt(lambda: select(model).where(model.id == record_id))
+    )
+    return result.scalar_one_or_none()
+
+
+async def _delete_record(db: DatabaseSession, model: type[Any], record_id: int) -> bool:
+    """Delete a record by id in one statement and report whether it existed."""
+    result = await db.execute(
+        lambda_stmt(
+            lambda: delete(model).where(model.id == record_id).returning(model.id)
+        ),
+        execution_options={"synchronize_session": False},
+    )
+    return result.scalar_one_or_none() is not None
+
 
 # ============== WindRecord Endpoints ==============
 @router.post(
@@ -33,19 +177,9 @@ async def create_wind_record(
     record_in: WindRecordCreate,
     db: DatabaseSession,
     current_user: CurrentUser,
-) -> WindRecord:
+) -> dict[str, Any]:
     """Create a new wind record."""
-    record = WindRecord(
-        location_id=record_in.location_id,
-        timestamp=record_in.timestamp,
-        wind_speed=record_in.wind_speed,
-        wind_direction=record_in.wind_direction,
-        temperature=record_in.temperature,
-    )
-    db.add(record)
-    await db.flush()
-    await db.refresh(record)
-    return record
+    return await _insert_record(db, WindRecord, record_in)
 
 
 @router.post(
@@ -53,55 +187,80 @@ async def create_wind_record(
     response_model=list[WindRecordRead],
     status_code=status.HTTP_201_CREATED,
     tags=["wind-records"],
+    openapi_extra=_bulk_request_body(WindRecordBulkCreate),
 )
 async def create_wind_records_bulk(
-    bulk_in: WindRecordBulkCreate,
+    request: Request,
     db: DatabaseSession,
     current_user: CurrentUser,
-) -> list[WindRecord]:
+) -> list[dict[str, Any]]:
     """Create multiple wind records in bulk."""
-    records = [
-        WindRecord(
-            location_id=r.location_id,
-            timestamp=r.timestamp,
-            wind_speed=r.wind_speed,
-            wind_direction=r.wind_direction,
-            temperature=r.temperature,
-        )
-        for r in bulk_in.records
-    ]
-    db.add_all(records)
-    await db.flush()
-    for record in records:
-        await db.refresh(record)
-    return records
+    bulk_in = await _parse_bulk(request, WindRecordBulkCreate)
+    return await _bulk_insert(db, WindRecord, bulk_in.records)
 
 
 @router.get(
     "/wind-records/", response_model=list[WindRecordRead], tags=["wind-records"]
 )
 async def list_wind_records(
+    request: Request,
     db: DatabaseSession,
     current_user: CurrentUser,
     location_id: int | None = None,
     start_time: datetime | None = None,
     end_time: datetime | None = None,
     skip: int = 0,
+    after_time: datetime | None = Query(
+        default=None, description="Keyset cursor: timestamp of the last row seen"
+    ),
+    after_id: int | None = Query(
+        default=None, description="Keyset cursor: id of the last row seen"
+    ),
     limit: int = Query(default=100, le=1000),
-) -> list[WindRecord]:
-    """List wind records with optional filters."""
-    query = select(WindRecord)
+) -> Response:
+    """List wind records with optional filters, newest first.
 
+    Page with after_time/after_id set to the last row's timestamp and id;
+    unlike skip, this seeks straight to the next page instead of scanning past
+    the earlier ones.
+    """
+    filters: list[LambdaStep] = []
     if location_id:
-        query = query.where(WindRecord.location_id == location_id)
+        filters.append(lambda s: s.where(WindRecord.location_id == location_id))
     if start_time:
-        query = query.where(WindRecord.timestamp >= start_time)
+        filters.append(lambda s: s.where(WindRecord.timestamp >= start_time))
     if end_time:
-        query = query.where(WindRecord.timestamp <= end_time)
+        filters.append(lambda s: s.where(WindRecord.timestamp <= end_time))
+
+    # Polling clients get a 304 until rows are added or removed
+    etag, total = await list_etag(
+        db,
+        with_steps(
+            lambda_stmt(lambda: select(func.count(), func.max(WindRecord.timestamp))),
+            filters,
+        ),
+    )
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    # lambda_stmt caches the compiled SQL per combination of filters
+    query = with_steps(
+        lambda_stmt(lambda: select(*schema_columns(WindRecord, WindRecordRead))),
+        filters,
+    )
+
+    if after_time is not None and after_id is not None:
+        query += lambda s: s.where(
+            tuple_(WindRecord.timestamp, WindRecord.id) < tuple_(after_time, after_id)
+        )
 
-    query = query.order_by(WindRecord.timestamp.desc()).offset(skip).limit(limit)
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    query += lambda s: (
+        s.order_by(WindRecord.timestamp.desc(), WindRecord.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return await json_rows_response(db, query, total, etag=etag)
 
 
 @router.delete(
@@ -115,11 +274,8 @@ async def delete_wind_record(
     current_user: CurrentUser,
 ) -> None:
     """Delete a wind record."""
-    result = await db.execute(select(WindRecord).where(WindRecord.id == record_id))
-    record = result.scalar_one_or_none()
-    if not record:
+    if not await _delete_record(db, WindRecord, record_id):
         raise HTTPException(status_code=404, detail="Wind record not found")
-    await db.delete(record)
 
 
 # ============== GenerationRecord Endpoints ==============
@@ -133,23 +289,13 @@ async def create_generation_record(
     record_in: GenerationRecordCreate,
     db: DatabaseSession,
     current_user: CurrentUser,
-) -> WindTurbineGenerationRecord:
+) -> dict[str, Any]:
     """Create a new generation record.
 
     wind_turbine_id is optional - if not provided, represents aggregated data.
     is_synthetic indicates if the data was synthetically generated.
     """
-    record = WindTurbineGenerationRecord(
-        wind_turbine_id=record_in.wind_turbine_id,  # Can be None
-        timestamp=record_in.timestamp,
-        generation=record_in.generation,
-        granularity=record_in.granularity,
-        is_synthetic=record_in.is_synthetic,
-    )
-    db.add(record)
-    await db.flush()
-    await db.refresh(record)
-    return record
+    return await _insert_record(db, WindTurbineGenerationRecord, record_in)
 
 
 @router.post(
@@ -157,28 +303,16 @@ async def create_generation_record(
     response_model=list[GenerationRecordRead],
     status_code=status.HTTP_201_CREATED,
     tags=["generation-records"],
+    openapi_extra=_bulk_request_body(GenerationRecordBulkCreate),
 )
 async def create_generation_records_bulk(
-    bulk_in: GenerationRecordBulkCreate,
+    request: Request,
     db: DatabaseSession,
     current_user: CurrentUser,
-) -> list[WindTurbineGenerationRecord]:
+) -> list[dict[str, Any]]:
     """Create multiple generation records in bulk."""
-    records = [
-        WindTurbineGenerationRecord(
-            wind_turbine_id=r.wind_turbine_id,
-            timestamp=r.timestamp,
-            generation=r.generation,
-            granularity=r.granularity,
-            is_synthetic=r.is_synthetic,
-        )
-        for r in bulk_in.records
-    ]
-    db.add_all(records)
-    await db.flush()
-    for record in records:
-        await db.refresh(record)
-    return records
+    bulk_in = await _parse_bulk(request, GenerationRecordBulkCreate)
+    return await _bulk_insert(db, WindTurbineGenerationRecord, bulk_in.records)
 
 
 @router.get(
@@ -187,33 +321,86 @@ async def create_generation_records_bulk(
     tags=["generation-records"],
 )
 async def list_generation_records(
+    request: Request,
     db: DatabaseSession,
     current_user: CurrentUser,
     wind_turbine_id: int | None = None,
     start_time: datetime | None = None,
     end_time: datetime | None = None,
     skip: int = 0,
+    after_time: datetime | None = Query(
+        default=None, description="Keyset cursor: timestamp of the last row seen"
+    ),
+    after_id: int | None = Query(
+        default=None, description="Keyset cursor: id of the last row seen"
+    ),
     limit: int = Query(default=100, le=1000),
-) -> list[WindTurbineGenerationRecord]:
-    """List generation records with optional filters."""
-    query = select(WindTurbineGenerationRecord)
+) -> Response:
+    """List generation records with optional filters, newest first.
 
+    Page with after_time/after_id set to the last row's timestamp and id;
+    unlike skip, this seeks straight to the next page instead of scanning past
+    the earlier ones.
+    """
+    filters: list[LambdaStep] = []
     if wind_turbine_id:
-        query = query.where(
-            WindTurbineGenerationRecord.wind_turbine_id == wind_turbine_id
+        filters.append(
+            lambda s: s.where(
+                WindTurbineGenerationRecord.wind_turbine_id == wind_turbine_id
+            )
         )
     if start_time:
-        query = query.where(WindTurbineGenerationRecord.timestamp >= start_time)
+        filters.append(
+            lambda s: s.where(WindTurbineGenerationRecord.timestamp >= start_time)
+        )
     if end_time:
-        query = query.where(WindTurbineGenerationRecord.timestamp <= end_time)
+        filters.append(
+            lambda s: s.where(WindTurbineGenerationRecord.timestamp <= end_time)
+        )
+
+    # Polling clients get a 304 until rows are added or removed
+    etag, total = await list_etag(
+        db,
+        with_steps(
+            lambda_stmt(
+                lambda: select(
+                    func.count(), func.max(WindTurbineGenerationRecord.timestamp)
+                )
+            ),
+            filters,
+        ),
+    )
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    # lambda_stmt caches the compiled SQL per combination of filters
+    query = with_steps(
+        lambda_stmt(
+            lambda: select(
+                *schema_columns(WindTurbineGenerationRecord, GenerationRecordRead)
+            )
+        ),
+        filters,
+    )
+
+    if after_time is not None and after_id is not None:
+        query += lambda s: s.where(
+            tuple_(
+                WindTurbineGenerationRecord.timestamp, WindTurbineGenerationRecord.id
+            )
+            < tuple_(after_time, after_id)
+        )
 
-    query = (
-        query.order_by(WindTurbineGenerationRecord.timestamp.desc())
+    query += lambda s: (
+        s.order_by(
+            WindTurbineGenerationRecord.timestamp.desc(),
+            WindTurbineGenerationRecord.id.desc(),
+        )
         .offset(skip)
         .limit(limit)
     )
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    return await json_rows_response(db, query, total, etag=etag)
 
 
 @router.delete(
@@ -227,15 +414,8 @@ async def delete_generation_record(
     current_user: CurrentUser,
 ) -> None:
     """Delete a generation record."""
-    result = await db.execute(
-        select(WindTurbineGenerationRecord).where(
-            WindTurbineGenerationRecord.id == record_id
-        )
-    )
-    record = result.scalar_one_or_none()
-    if not record:
+    if not await _delete_record(db, WindTurbineGenerationRecord, record_id):
         raise HTTPException(status_code=404, detail="Generation record not found")
-    await db.delete(record)
 
 
 # ============== WindFarmGenerationRecord Endpoints ==============
@@ -249,24 +429,13 @@ async def create_farm_generation_record(
     record_in: WindFarmGenerationRecordCreate,
     db: DatabaseSession,
     current_user: CurrentUser,
-) -> WindFarmGenerationRecord:
+) -> dict[str, Any]:
     """Create a new wind farm generation record.
 
     The fleet_statuses field should be a dict mapping fleet_id (as string) to status ("on" or "off").
     Example: {"1": "on", "2": "off", "3": "on"}
     """
-    record = WindFarmGenerationRecord(
-        wind_farm_id=record_in.wind_farm_id,
-        timestamp=record_in.timestamp,
-        generation=record_in.generation,
-        granularity=record_in.granularity,
-        fleet_statuses=record_in.fleet_statuses,
-        is_synthetic=record_in.is_synthetic,
-    )
-    db.add(record)
-    await db.flush()
-    await db.refresh(record)
-    return record
+    return await _insert_record(db, WindFarmGenerationRecord, record_in)
 
 
 @router.post(
@@ -274,29 +443,16 @@ async def create_farm_generation_record(
     response_model=list[WindFarmGenerationRecordRead],
     status_code=status.HTTP_201_CREATED,
     tags=["farm-generation-records"],
+    openapi_extra=_bulk_request_body(WindFarmGenerationRecordBulkCreate),
 )
 async def create_farm_generation_records_bulk(
-    bulk_in: WindFarmGenerationRecordBulkCreate,
+    request: Request,
     db: DatabaseSession,
     current_user: CurrentUser,
-) -> list[WindFarmGenerationRecord]:
+) -> list[dict[str, Any]]:
     """Create multiple wind farm generation records in bulk."""
-    records = [
-        WindFarmGenerationRecord(
-            wind_farm_id=r.wind_farm_id,
-            timestamp=r.timestamp,
-            generation=r.generation,
-            granularity=r.granularity,
-            fleet_statuses=r.fleet_statuses,
-            is_synthetic=r.is_synthetic,
-        )
-        for r in bulk_in.records
-    ]
-    db.add_all(records)
-    await db.flush()
-    for record in records:
-        await db.refresh(record)
-    return records
+    bulk_in = await _parse_bulk(request, WindFarmGenerationRecordBulkCreate)
+    return await _bulk_insert(db, WindFarmGenerationRecord, bulk_in.records)
 
 
 @router.get(
@@ -305,31 +461,82 @@ async def create_farm_generation_records_bulk(
     tags=["farm-generation-records"],
 )
 async def list_farm_generation_records(
+    request: Request,
     db: DatabaseSession,
     current_user: CurrentUser,
     wind_farm_id: int | None = None,
     start_time: datetime | None = None,
     end_time: datetime | None = None,
     skip: int = 0,
+    after_time: datetime | None = Query(
+        default=None, description="Keyset cursor: timestamp of the last row seen"
+    ),
+    after_id: int | None = Query(
+        default=None, description="Keyset cursor: id of the last row seen"
+    ),
     limit: int = Query(default=1000, le=10000),
-) -> list[WindFarmGenerationRecord]:
-    """List wind farm generation records with optional filters."""
-    query = select(WindFarmGenerationRecord)
+) -> Response:
+    """List wind farm generation records with optional filters, newest first.
 
+    Page with after_time/after_id set to the last row's timestamp and id;
+    unlike skip, this seeks straight to the next page instead of scanning past
+    the earlier ones.
+    """
+    filters: list[LambdaStep] = []
     if wind_farm_id:
-        query = query.where(WindFarmGenerationRecord.wind_farm_id == wind_farm_id)
+        filters.append(
+            lambda s: s.where(WindFarmGenerationRecord.wind_farm_id == wind_farm_id)
+        )
     if start_time:
-        query = query.where(WindFarmGenerationRecord.timestamp >= start_time)
+        filters.append(
+            lambda s: s.where(WindFarmGenerationRecord.timestamp >= start_time)
+        )
     if end_time:
-        query = query.where(WindFarmGenerationRecord.timestamp <= end_time)
+        filters.append(
+            lambda s: s.where(WindFarmGenerationRecord.timestamp <= end_time)
+        )
 
-    query = (
-        query.order_by(WindFarmGenerationRecord.timestamp.desc())
+    # Polling clients get a 304 until rows are added or removed
+    etag, total = await list_etag(
+        db,
+        with_steps(
+            lambda_stmt(
+                lambda: select(
+                    func.count(), func.max(WindFarmGenerationRecord.timestamp)
+                )
+            ),
+            filters,
+        ),
+    )
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+
+    # lambda_stmt caches the compiled SQL per combination of filters
+    query = with_steps(
+        lambda_stmt(
+            lambda: select(
+                *schema_columns(WindFarmGenerationRecord, WindFarmGenerationRecordRead)
+            )
+        ),
+        filters,
+    )
+
+    if after_time is not None and after_id is not None:
+        query += lambda s: s.where(
+            tuple_(WindFarmGenerationRecord.timestamp, WindFarmGenerationRecord.id)
+            < tuple_(after_time, after_id)
+        )
+
+    query += lambda s: (
+        s.order_by(
+            WindFarmGenerationRecord.timestamp.desc(),
+            WindFarmGenerationRecord.id.desc(),
+        )
         .offset(skip)
         .limit(limit)
     )
-    result = await db.execute(query)
-    return list(result.scalars().all())
+    return await json_rows_response(db, query, total, etag=etag)
 
 
 @router.get(
@@ -343,10 +550,7 @@ async def get_farm_generation_record(
     current_user: CurrentUser,
 ) -> WindFarmGenerationRecord:
     """Get a specific wind farm generation record."""
-    result = await db.execute(
-        select(WindFarmGenerationRecord).where(WindFarmGenerationRecord.id == record_id)
-    )
-    record = result.scalar_one_or_none()
+    record = await _get_record(db, WindFarmGenerationRecord, record_id)
     if not record:
         raise HTTPException(status_code=404, detail="Farm generation record not found")
     return record
@@ -363,10 +567,5 @@ async def delete_farm_generation_record(
     current_user: CurrentUser,
 ) -> None:
     """Delete a wind farm generation record."""
-    result = await db.execute(
-        select(WindFarmGenerationRecord).where(WindFarmGenerationRecord.id == record_id)
-    )
-    record = result.scalar_one_or_none()
-    if not record:
+    if not await _delete_record(db, WindFarmGenerationRecord, record_id):
         raise HTTPException(status_code=404, detail="Farm generation record not found")
-    await db.delete(record)
@@ -1,12 +1,12 @@
 """Weather data API endpoints."""
 
-from fastapi import APIRouter, Query
+import orjson
+from fastapi import APIRouter, Query, Response
 
 from app.core.deps import CurrentUser
 from app.schemas.weather import (
     WeatherDataOut,
     WeatherModelsOut,
-    WeatherRecordOut,
     WeatherResolutionsOut,
 )
 from app.services.weather_service import WeatherService
@@ -25,7 +25,7 @@ async def get_weather_data(
     resolution_minutes: int = Query(
         60, description="Resolution in minutes (15, 30, 60)"
     ),
-) -> WeatherDataOut:
+) -> Response:
     """Fetch weather data for a location.
 
     Returns historical and forecast weather data from Open-Meteo API.
@@ -40,45 +40,20 @@ async def get_weather_data(
         resolution_minutes=resolution_minutes,
     )
 
-    return WeatherDataOut(
-        historical=[
-            WeatherRecordOut(
-                time=r.time,
-                temperature=r.temperature,
-                temperature_80m=r.temperature_80m,
-                wind_speed=r.wind_speed,
-                wind_speed_80m=r.wind_speed_80m,
-                wind_speed_100m=r.wind_speed_100m,
-                wind_direction=r.wind_direction,
-                wind_direction_80m=r.wind_direction_80m,
-                wind_direction_100m=r.wind_direction_100m,
-                pressure=r.pressure,
-                precipitation=r.precipitation,
-                cloud_cover=r.cloud_cover,
-            )
-            for r in response.historical
-        ],
-        forecast=[
-            WeatherRecordOut(
-                time=r.time,
-                temperature=r.temperature,
-                temperature_80m=r.temperature_80m,
-                wind_speed=r.wind_speed,
-                wind_speed_80m=r.wind_speed_80m,
-                wind_speed_100m=r.wind_speed_100m,
-                wind_direction=r.wind_direction,
-                wind_direction_80m=r.wind_direction_80m,
-                wind_direction_100m=r.wind_direction_100m,
-                pressure=r.pressure,
-                precipitation=r.precipitation,
-                cloud_cover=r.cloud_cover,
-            )
-            for r in response.forecast
-        ],
-        model_used=response.model_used,
-        resolution_info=response.resolution_info,
-        latitude=response.latitude,
-        longitude=response.longitude,
+    # The service keeps weather column-wise; records only exist on the wire.
+    # They are already JSON-safe, so they go to orjson without revalidation.
+    return Response(
+        orjson.dumps(
+            {
+                "historical": response.historical.records(),
+                "forecast": response.forecast.records(),
+                "model_used": response.model_used,
+                "resolution_info": response.resolution_info,
+                "latitude": response.latitude,
+                "longitude": response.longitude,
+            }
+        ),
+        media_type="application/json",
     )
 
 
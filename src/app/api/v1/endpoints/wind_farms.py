@@ -1,11 +1,13 @@
 """WindFarm CRUD endpoints."""
 
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import raiseload
 
 from app.core.deps import CurrentUser, DatabaseSession
 from app.models import WindFarm
 from app.schemas.wind_energy import WindFarmCreate, WindFarmRead, WindFarmUpdate
+from app.services.ai_agent_service import forget_user_farms
 
 router = APIRouter(prefix="/wind-farms", tags=["wind-farms"])
 
@@ -25,6 +27,7 @@ async def create_wind_farm(
     db.add(wind_farm)
     await db.flush()
     await db.refresh(wind_farm)
+    forget_user_farms(db, current_user.id)
     return wind_farm
 
 
@@ -34,14 +37,23 @@ async def list_wind_farms(
     current_user: CurrentUser,
     skip: int = 0,
     limit: int = 100,
+    cursor: int | None = None,
 ) -> list[WindFarm]:
-    """List all wind farms for the current user."""
-    result = await db.execute(
+    """List all wind farms for the current user, ordered by ID.
+
+    Pass the ID of the last farm of a page as ``cursor`` to fetch the next
+    page without scanning past skipped rows.
+    """
+    # Farm responses carry no relationships; raiseload keeps a future schema
+    # change from turning this into one lazy load per farm
+    stmt = (
         select(WindFarm)
+        .options(raiseload("*"))
         .where(WindFarm.user_id == current_user.id)
-        .offset(skip)
-        .limit(limit)
     )
+    if cursor is not None:
+        stmt = stmt.where(WindFarm.id > cursor)
+    result = await db.execute(stmt.order_by(WindFarm.id).offset(skip).limit(limit))
     return list(result.scalars().all())
 
 
@@ -71,23 +83,24 @@ async def update_wind_farm(
     db: DatabaseSession,
     current_user: CurrentUser,
 ) -> WindFarm:
-    """Update a wind farm."""
-    result = await db.execute(
-        select(WindFarm).where(
+    """Update a wind farm in one UPDATE ... RETURNING statement."""
+    update_data = wind_farm_in.model_dump(exclude_unset=True)
+    if not update_data:
+        return await get_wind_farm(wind_farm_id, db, current_user)
+
+    wind_farm = await db.scalar(
+        update(WindFarm)
+        .where(
             WindFarm.id == wind_farm_id,
             WindFarm.user_id == current_user.id,
         )
+        .values(**update_data)
+        .returning(WindFarm),
+        execution_options={"populate_existing": True},
     )
-    wind_farm = result.scalar_one_or_none()
     if not wind_farm:
         raise HTTPException(status_code=404, detail="Wind farm not found")
-
-    update_data = wind_farm_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(wind_farm, field, value)
-
-    await db.flush()
-    await db.refresh(wind_farm)
+    forget_user_farms(db, current_user.id)
     return wind_farm
 
 
@@ -97,15 +110,16 @@ async def delete_wind_farm(
     db: DatabaseSession,
     current_user: CurrentUser,
 ) -> None:
-    """Delete a wind farm."""
+    """Delete a wind farm; its fleets, records and forecasts cascade in the database."""
     result = await db.execute(
-        select(WindFarm).where(
+        delete(WindFarm)
+        .where(
             WindFarm.id == wind_farm_id,
             WindFarm.user_id == current_user.id,
         )
+        .returning(WindFarm.id),
+        execution_options={"synchronize_session": False},
     )
-    wind_farm = result.scalar_one_or_none()
-    if not wind_farm:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Wind farm not found")
-
-    await db.delete(wind_farm)
+    forget_user_farms(db, current_user.id)
@@ -1,11 +1,16 @@
 """WindTurbine, PowerCurve, and Fleet CRUD endpoints."""
 
+from functools import partial
+
 from fastapi import APIRouter, HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import String, any_, bindparam, delete, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import joinedload, selectinload
 
+from app.core.database import on_commit
 from app.core.deps import CurrentUser, DatabaseSession
-from app.models import PowerCurve, WindTurbine, WindTurbineFleet
+from app.models import Location, PowerCurve, WindTurbine, WindTurbineFleet
 from app.schemas.wind_energy import (
     PowerCurveCreate,
     PowerCurveRead,
@@ -17,6 +22,8 @@ from app.schemas.wind_energy import (
     WindTurbineRead,
     WindTurbineUpdate,
 )
+from app.services.ai_agent_service import forget_user_farms
+from app.services.forecast_service import forget_farm_forecasts
 from app.services.turbine_library_service import import_wind_turbine_library
 
 router = APIRouter(tags=["wind-turbines"])
@@ -36,42 +43,73 @@ async def import_wind_turbines(
 
     Skips turbines that already exist (by turbine_type). Does not delete existing data.
     """
-    skipped_count = 0
-
-    # Get existing turbine types to skip duplicates
-    result = await db.execute(select(WindTurbine.turbine_type))
-    existing_types = {t for t in result.scalars().all() if t}
-
     wind_turbines_data = import_wind_turbine_library()
-    imported: list[WindTurbine] = []
-
-    for power_curve_data, wind_turbine_data in wind_turbines_data:
-        turbine_type = wind_turbine_data.get("turbine_type")
-
-        # Skip if already exists
-        if turbine_type in existing_types:
-            skipped_count += 1
-            continue
 
-        # Create and store PowerCurve
-        new_power_curve = PowerCurve(wind_speed_value_map=power_curve_data)
-        db.add(new_power_curve)
-        await db.flush()
-        await db.refresh(new_power_curve)
-
-        # Attach the new power_curve_id to wind turbine
-        wind_turbine_data["power_curve_id"] = new_power_curve.id
-
-        new_wind_turbine = WindTurbine(**wind_turbine_data)
-        db.add(new_wind_turbine)
-        await db.flush()
-
-        imported.append(new_wind_turbine)
-        existing_types.add(turbine_type)  # Track to avoid duplicates in same batch
+    # Look up only the incoming types, in one array parameter, so no curves
+    # are written for turbines that are already known
+    existing = set(
+        await db.scalars(
+            select(WindTurbine.turbine_type).where(
+                WindTurbine.turbine_type
+                == any_(
+                    bindparam(
+                        "turbine_types",
+                        [data["turbine_type"] for _, data in wind_turbines_data],
+                        type_=ARRAY(String),
+                    )
+                )
+            )
+        )
+    )
+    new_turbines_data = [
+        (curve, data)
+        for curve, data in wind_turbines_data
+        if data["turbine_type"] not in existing
+    ]
+    if not new_turbines_data:
+        skipped_count = len(wind_turbines_data)
+        return {
+            "message": f"Imported 0 turbines, skipped {skipped_count} duplicates",
+            "imported": 0,
+            "skipped": skipped_count,
+        }
+
+    # Curves first so each turbine row can carry its power_curve_id
+    curve_ids = await db.scalars(
+        pg_insert(PowerCurve).returning(PowerCurve.id, sort_by_parameter_order=True),
+        [PowerCurve.split_map(curve) for curve, _ in new_turbines_data],
+    )
+    rows = [
+        {**wind_turbine_data, "power_curve_id": curve_id}
+        for (_, wind_turbine_data), curve_id in zip(
+            new_turbines_data, curve_ids, strict=True
+        )
+    ]
+
+    # The unique turbine_type index still decides what is a duplicate, so
+    # concurrent imports cannot both insert the same turbine
+    result = await db.scalars(
+        pg_insert(WindTurbine)
+        .on_conflict_do_nothing(index_elements=["turbine_type"])
+        .returning(WindTurbine.power_curve_id),
+        rows,
+    )
+    used_curve_ids = set(result)
+    imported_count = len(used_curve_ids)
+    skipped_count = len(wind_turbines_data) - imported_count
+
+    # Drop the curves created for turbines another import inserted first
+    orphaned = [
+        row["power_curve_id"]
+        for row in rows
+        if row["power_curve_id"] not in used_curve_ids
+    ]
+    if orphaned:
+        await db.execute(delete(PowerCurve).where(PowerCurve.id.in_(orphaned)))
 
     return {
-        "message": f"Imported {len(imported)} turbines, skipped {skipped_count} duplicates",
-        "imported": len(imported),
+        "message": f"Imported {imported_count} turbines, skipped {skipped_count} duplicates",
+        "imported": imported_count,
         "skipped": skipped_count,
     }
 
@@ -142,18 +180,24 @@ async def update_power_curve(
     db: DatabaseSession,
     current_user: CurrentUser,
 ) -> PowerCurve:
-    """Update a power curve."""
-    result = await db.execute(select(PowerCurve).where(PowerCurve.id == power_curve_id))
-    power_curve = result.scalar_one_or_none()
+    """Update a power curve in one UPDATE ... RETURNING statement."""
+    update_data = power_curve_in.model_dump(exclude_unset=True)
+    if (curve := update_data.pop("wind_speed_value_map", None)) is not None:
+        update_data.update(PowerCurve.split_map(curve))
+    if not update_data:
+        return await get_power_curve(power_curve_id, db, current_user)
+
+    power_curve = await db.scalar(
+        update(PowerCurve)
+        .where(PowerCurve.id == power_curve_id)
+        .values(**update_data)
+        .returning(PowerCurve),
+        execution_options={"populate_existing": True},
+    )
     if not power_curve:
         raise HTTPException(status_code=404, detail="Power curve not found")
-
-    update_data = power_curve_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(power_curve, field, value)
-
-    await db.flush()
-    await db.refresh(power_curve)
+    # Forecasts of every farm with a turbine on this curve are now stale
+    on_commit(db, forget_farm_forecasts)
     return power_curve
 
 
@@ -167,12 +211,15 @@ async def delete_power_curve(
     db: DatabaseSession,
     current_user: CurrentUser,
 ) -> None:
-    """Delete a power curve."""
-    result = await db.execute(select(PowerCurve).where(PowerCurve.id == power_curve_id))
-    power_curve = result.scalar_one_or_none()
-    if not power_curve:
+    """Delete a power curve; turbines using it are detached by the database."""
+    result = await db.execute(
+        delete(PowerCurve)
+        .where(PowerCurve.id == power_curve_id)
+        .returning(PowerCurve.id),
+        execution_options={"synchronize_session": False},
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Power curve not found")
-    await db.delete(power_curve)
 
 
 # ============== WindTurbine Endpoints ==============
@@ -187,22 +234,22 @@ async def create_wind_turbine(
     current_user: CurrentUser,
 ) -> WindTurbine:
     """Create a new wind turbine specification."""
+    # Attach the related row up front so the response needs no reload
+    power_curve = None
+    if turbine_in.power_curve_id is not None:
+        power_curve = await db.get(PowerCurve, turbine_in.power_curve_id)
+        if not power_curve:
+            raise HTTPException(status_code=404, detail="Power curve not found")
+
     turbine = WindTurbine(
         turbine_type=turbine_in.turbine_type,
         hub_height=turbine_in.hub_height,
         nominal_power=turbine_in.nominal_power,
-        power_curve_id=turbine_in.power_curve_id,
+        power_curve=power_curve,
     )
     db.add(turbine)
     await db.flush()
-
-    # Reload with relationships for response
-    result = await db.execute(
-        select(WindTurbine)
-        .options(selectinload(WindTurbine.power_curve))
-        .where(WindTurbine.id == turbine.id)
-    )
-    return result.scalar_one()
+    return turbine
 
 
 @router.get("/wind-turbines/", response_model=list[WindTurbineRead])
@@ -247,18 +294,25 @@ async def update_wind_turbine(
     db: DatabaseSession,
     current_user: CurrentUser,
 ) -> WindTurbine:
-    """Update a wind turbine."""
-    result = await db.execute(select(WindTurbine).where(WindTurbine.id == turbine_id))
-    turbine = result.scalar_one_or_none()
-    if not turbine:
-        raise HTTPException(status_code=404, detail="Wind turbine not found")
-
+    """Update a wind turbine in one UPDATE ... RETURNING statement."""
     update_data = turbine_in.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(turbine, field, value)
+    if not update_data:
+        return await get_wind_turbine(turbine_id, db, current_user)
 
-    await db.flush()
-    await db.refresh(turbine)
+    turbine = await db.scalar(
+        update(WindTurbine)
+        .where(WindTurbine.id == turbine_id)
+        .values(**update_data)
+        .returning(WindTurbine)
+        .options(selectinload(WindTurbine.power_curve)),
+        execution_options={"populate_existing": True},
+    )
+    if not turbine:
+        raise HTTPException(status_code=404, detail="Wind turbine not found")
+    # Turbine models are shared, so every user's cached farms and forecasts
+    # may depend on them
+    forget_user_farms(db)
+    on_commit(db, forget_farm_forecasts)
     return turbine
 
 
@@ -269,11 +323,14 @@ async def delete_wind_turbine(
     current_user: CurrentUser,
 ) -> None:
     """Delete a wind turbine."""
-    result = await db.execute(select(WindTurbine).where(WindTurbine.id == turbine_id))
-    turbine = result.scalar_one_or_none()
-    if not turbine:
+    result = await db.execute(
+        delete(WindTurbine)
+        .where(WindTurbine.id == turbine_id)
+        .returning(WindTurbine.id),
+        execution_options={"synchronize_session": False},
+    )
+    if result.scalar_one_or_none() is None:
         raise HTTPException(status_code=404, detail="Wind turbine not found")
-    await db.delete(turbine)
 
 
 # ============== WindTurbineFleet Endpoints ==============
@@ -289,27 +346,29 @@ async def create_fleet(
     current_user: CurrentUser,
 ) -> WindTurbineFleet:
     """Create a new wind turbine fleet (link turbine spec to location in a farm)."""
+    # Attach the related rows up front so the response needs no reload
+    wind_turbine = await db.get(
+        WindTurbine,
+        fleet_in.wind_turbine_id,
+        options=[joinedload(WindTurbine.power_curve)],
+    )
+    if not wind_turbine:
+        raise HTTPException(status_code=404, detail="Wind turbine not found")
+    location = await db.get(Location, fleet_in.location_id)
+    if not location:
+        raise HTTPException(status_code=404, detail="Location not found")
+
     fleet = WindTurbineFleet(
         wind_farm_id=fleet_in.wind_farm_id,
-        wind_turbine_id=fleet_in.wind_turbine_id,
-        location_id=fleet_in.location_id,
+        wind_turbine=wind_turbine,
+        location=location,
         number_of_turbines=fleet_in.number_of_turbines,
     )
     db.add(fleet)
     await db.flush()
-
-    # Reload with relationships for response
-    result = await db.execute(
-        select(WindTurbineFleet)
-        .options(
-            selectinload(WindTurbineFleet.location),
-            selectinload(WindTurbineFleet.wind_turbine).selectinload(
-                WindTurbine.power_curve
-            ),
-        )
-        .where(WindTurbineFleet.id == fleet.id)
-    )
-    return result.scalar_one()
+    forget_user_farms(db, current_user.id)
+    on_commit(db, partial(forget_farm_forecasts, fleet.wind_farm_id))
+    return fleet
 
 
 @router.get("/fleets/", response_model=list[WindTurbineFleetRead], tags=["fleets"])
@@ -321,11 +380,12 @@ async def list_fleets(
     limit: int = 100,
 ) -> list[WindTurbineFleet]:
     """List all fleets, optionally filtered by wind farm."""
+    # Location and turbine are many-to-one, so joining them adds no rows.
+    # Power curves stay on selectinload: fleets often share a turbine model,
+    # and a join would repeat the same curve JSON on each of their rows.
     query = select(WindTurbineFleet).options(
-        selectinload(WindTurbineFleet.location),
-        selectinload(WindTurbineFleet.wind_turbine).selectinload(
-            WindTurbine.power_curve
-        ),
+        joinedload(WindTurbineFleet.location),
+        joinedload(WindTurbineFleet.wind_turbine).selectinload(WindTurbine.power_curve),
     )
     if wind_farm_id:
         query = query.where(WindTurbineFleet.wind_farm_id == wind_farm_id)
@@ -342,21 +402,32 @@ async def update_fleet(
     db: DatabaseSession,
     current_user: CurrentUser,
 ) -> WindTurbineFleet:
-    """Update a fleet."""
-    result = await db.execute(
-        select(WindTurbineFleet).where(WindTurbineFleet.id == fleet_id)
+    """Update a fleet in one UPDATE ... RETURNING statement."""
+    update_data = fleet_in.model_dump(exclude_none=True)
+    if update_data:
+        stmt = (
+            update(WindTurbineFleet)
+            .where(WindTurbineFleet.id == fleet_id)
+            .values(**update_data)
+            .returning(WindTurbineFleet)
+        )
+    else:
+        stmt = select(WindTurbineFleet).where(WindTurbineFleet.id == fleet_id)
+
+    fleet = await db.scalar(
+        stmt.options(
+            selectinload(WindTurbineFleet.location),
+            selectinload(WindTurbineFleet.wind_turbine).selectinload(
+                WindTurbine.power_curve
+            ),
+        ),
+        execution_options={"populate_existing": True},
     )
-    fleet = result.scalar_one_or_none()
     if not fleet:
         raise HTTPException(status_code=404, detail="Fleet not found")
-
-    if fleet_in.number_of_turbines is not None:
-        fleet.number_of_turbines = fleet_in.number_of_turbines
-    if fleet_in.location_id is not None:
-        fleet.location_id = fleet_in.location_id
-
-    await db.flush()
-    await db.refresh(fleet)
+    if update_data:
+        forget_user_farms(db, current_user.id)
+        on_commit(db, partial(forget_farm_forecasts, fleet.wind_farm_id))
     return fleet
 
 
@@ -369,10 +440,13 @@ async def delete_fleet(
     current_user: CurrentUser,
 ) -> None:
     """Delete a fleet."""
-    result = await db.execute(
-        select(WindTurbineFleet).where(WindTurbineFleet.id == fleet_id)
+    wind_farm_id = await db.scalar(
+        delete(WindTurbineFleet)
+        .where(WindTurbineFleet.id == fleet_id)
+        .returning(WindTurbineFleet.wind_farm_id),
+        execution_options={"synchronize_session": False},
     )
-    fleet = result.scalar_one_or_none()
-    if not fleet:
+    if wind_farm_id is None:
         raise HTTPException(status_code=404, detail="Fleet not found")
-    await db.delete(fleet)
+    forget_user_farms(db, current_user.id)
+    on_commit(db, partial(forget_farm_forecasts, wind_farm_id))
@@ -27,6 +27,14 @@ class Settings(BaseSettings):
     postgres_user: str = "postgres"
     postgres_password: str = "postgres"
     postgres_db: str = "koppen_mvp"
+    db_pool_size: int = 20
+    db_max_overflow: int = 40
+    # Pooled connections are recycled instead of pinged on every checkout
+    db_pool_pre_ping: bool = False
+    db_pool_recycle_seconds: int = 1800
+    # asyncpg statement caches, sized for the distinct queries the API runs
+    db_statement_cache_size: int = 1024
+    db_prepared_statement_cache_size: int = 512
 
     @computed_field  # type: ignore[prop-decorator]
     @property
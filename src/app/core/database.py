@@ -1,14 +1,30 @@
 """Database configuration and session management."""
 
-from collections.abc import AsyncGenerator
+import enum
+from collections.abc import AsyncGenerator, Callable, Iterable, Sequence
+from datetime import UTC, datetime
+from functools import partial
+from typing import Any
 
-from sqlalchemy import Column, Integer
+import orjson
+from sqlalchemy import (
+    Column,
+    Integer,
+    Table,
+    TypeDecorator,
+    event,
+    func,
+    literal,
+    select,
+    text,
+)
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 from sqlalchemy.orm import (
+    Session,
     declarative_base,
     declared_attr,
 )
@@ -27,10 +43,30 @@ class PreBase:
 Base = declarative_base(cls=PreBase)
 
 
+def utc_now() -> datetime:
+    """Current time as an aware UTC datetime, for Python-side column defaults.
+
+    Timestamp columns keep their ``server_default`` for COPY and ad-hoc SQL,
+    but ORM and Core inserts bind this value client-side, so bulk inserts
+    don't need RETURNING to read the generated timestamps back.
+    """
+    return datetime.now(UTC)
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    pool_pre_ping=True,
+    isolation_level="READ COMMITTED",
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    connect_args={
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_prepared_statement_cache_size,
+        # The API runs short OLTP queries where JIT compilation only adds latency
+        "server_settings": {"jit": "off"},
+    },
 )
 
 async_session_maker = async_sessionmaker(
@@ -40,6 +76,16 @@ async_session_maker = async_sessionmaker(
 )
 
 
+async def warm_up_pool() -> None:
+    """Open a pooled connection and run a trivial query on it.
+
+    Called at startup so the first request does not pay for the connection
+    handshake, and from the readiness probe to check connectivity.
+    """
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
 async def get_db() -> AsyncGenerator[AsyncSession]:
     """Dependency that provides a database session.
 
@@ -53,3 +99,120 @@ async def get_db() -> AsyncGenerator[AsyncSession]:
         except Exception:
             await session.rollback()
             raise
+
+
+def on_commit(db: AsyncSession | Session, callback: Callable[[], None]) -> None:
+    """Run ``callback`` once, after the session's current transaction commits.
+
+    Used to drop in-process caches only when the change they depend on is
+    visible to other sessions. Accepts the sync session too, as handed to
+    mapper events.
+    """
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    event.listen(session, "after_commit", lambda _session: callback(), once=True)
+
+
+def copy_value(value: Any) -> Any:
+    """Convert a column value to what COPY expects for its column type."""
+    if isinstance(value, enum.Enum):
+        return value.name
+    if isinstance(value, dict):
+        return orjson.dumps(value).decode()
+    return value
+
+
+def copy_converters(table: Table, columns: Sequence[str]) -> list[Callable[[Any], Any]]:
+    """Return, for each column, a function preparing its values for COPY.
+
+    COPY skips SQLAlchemy's bind processing, so columns with a custom
+    TypeDecorator (coded granularity, deci-degree directions) go through its
+    ``process_bind_param``; every other column uses ``copy_value``.
+    """
+    converters = []
+    for name in columns:
+        column_type = table.c[name].type
+        if isinstance(column_type, TypeDecorator):
+            converters.append(partial(column_type.process_bind_param, dialect=None))
+        else:
+            converters.append(copy_value)
+    return converters
+
+
+def stored_values(
+    table: Table, columns: Sequence[str]
+) -> Callable[[Sequence[Any]], tuple[Any, ...]]:
+    """Return a function mapping a row's values to what the database reads back.
+
+    Only TypeDecorator columns change on the way through, e.g. directions are
+    rounded to 0.1° and wrapped into 0..360; other values pass unchanged.
+    """
+    decorated = [
+        (i, table.c[name].type)
+        for i, name in enumerate(columns)
+        if isinstance(table.c[name].type, TypeDecorator)
+    ]
+
+    def read_back(values: Sequence[Any]) -> tuple[Any, ...]:
+        row = list(values)
+        for i, column_type in decorated:
+            stored = column_type.process_bind_param(row[i], None)
+            row[i] = column_type.process_result_value(stored, None)
+        return tuple(row)
+
+    return read_back
+
+
+async def copy_records(
+    db: AsyncSession,
+    table_name: str,
+    columns: Sequence[str],
+    records: Iterable[Sequence[Any]],
+) -> None:
+    """Bulk-load rows into a table using PostgreSQL COPY.
+
+    The rows are written on the session's connection, inside its current
+    transaction. Column defaults apply to columns that are not listed, but
+    values are passed to the driver as-is: enum columns expect the member
+    name, JSON columns a serialized string and TypeDecorator columns their
+    stored value (see ``copy_converters``).
+
+    Args:
+        db: Database session.
+        table_name: Target table name.
+        columns: Column names, in the order values appear in each record.
+        records: Row tuples to load.
+    """
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    # The driver opens its transaction lazily on the first statement; make
+    # sure COPY does not run (and commit) outside of it
+    if not driver_connection.is_in_transaction():
+        await db.execute(select(literal(1)))
+
+    await driver_connection.copy_records_to_table(
+        table_name, columns=list(columns), records=records
+    )
+
+
+async def reserve_ids(db: AsyncSession, table_name: str, count: int) -> list[int]:
+    """Draw ids from a table's serial sequence ahead of inserting rows.
+
+    Rows loaded with COPY can then carry their ids, so they don't have to be
+    read back afterwards.
+
+    Args:
+        db: Database session.
+        table_name: Table whose ``id`` sequence to draw from.
+        count: Number of ids to reserve.
+
+    Returns:
+        The reserved ids.
+    """
+    result = await db.execute(
+        select(func.nextval(func.pg_get_serial_sequence(table_name, "id"))).select_from(
+            func.generate_series(1, count)
+        )
+    )
+    return list(result.scalars())
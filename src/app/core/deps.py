@@ -1,28 +1,60 @@
 """Dependency injection utilities."""
 
-from typing import Annotated
+import time
+from typing import Annotated, Any
 
-from fastapi import Depends, HTTPException, status
+import jwt
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import event, lambda_stmt, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached, object_session
 
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, on_commit
+from app.core.security import verify_api_key
+from app.models.api_key import APIKey
 from app.models.user import User
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.api_v1_prefix}/auth/login")
+# auto_error is off so "Authorization: ApiKey <key>" reaches get_current_user
+oauth2_scheme = OAuth2PasswordBearer(
+    tokenUrl=f"{settings.api_v1_prefix}/auth/login", auto_error=False
+)
+
+API_KEY_SCHEME = "apikey"
+
+# Decoded bearer tokens are reused for this long (or until they expire), so
+# repeated requests with the same token skip the signature check
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_SIZE = 10_000
+
+# Column values of users resolved from tokens are kept briefly to skip the
+# per-request lookup; each request rebuilds its own User from them
+USER_CACHE_TTL_SECONDS = 30
+USER_CACHE_SIZE = 10_000
+
+_token_cache: TTLCache[str, tuple[int, float]] = TTLCache(
+    maxsize=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS
+)
+_user_cache: TTLCache[int, dict[str, Any]] = TTLCache(
+    maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS
+)
 
 
 async def get_current_user(
-    token: Annotated[str, Depends(oauth2_scheme)],
+    request: Request,
+    token: Annotated[str | None, Depends(oauth2_scheme)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
-    """Get the current authenticated user from JWT token.
+    """Get the current authenticated user from a JWT token or an API key.
+
+    Human users send "Authorization: Bearer <jwt>"; service accounts may send
+    "Authorization: ApiKey <key>" instead of logging in.
 
     Args:
-        token: JWT access token from request header.
+        request: Incoming request, used to read the Authorization header.
+        token: JWT access token from request header, if a bearer token.
         db: Database session.
 
     Returns:
@@ -37,30 +69,143 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == API_KEY_SCHEME and credentials:
+        user = await _get_api_key_user(db, credentials)
+        if user is None:
+            raise credentials_exception
+        return _ensure_active(user)
+
+    if token is None:
+        raise credentials_exception
+
+    uid = _decode_token(token)
+    if uid is None:
+        raise credentials_exception
+
+    columns = _user_cache.get(uid)
+    if columns is None:
+        # lambda_stmt caches the statement for the cache-miss path
+        result = await db.execute(
+            lambda_stmt(lambda: select(User).where(User.id == uid))
+        )
+        user = result.scalar_one_or_none()
+        if user is None:
+            _token_cache.pop(token, None)
+            raise credentials_exception
+        _user_cache[uid] = _user_columns(user)
+    else:
+        user = await _user_from_columns(db, columns)
+
+    if not user.is_active:
+        forget_user(uid)
+    return _ensure_active(user)
+
+
+def _user_columns(user: User) -> dict[str, Any]:
+    """Copy a loaded user's column values for the user cache.
+
+    Plain values rather than the instance: an instance belongs to the
+    session that loaded it and is expired by its rollback or close.
+    """
+    return {attr.key: getattr(user, attr.key) for attr in User.__mapper__.column_attrs}
+
+
+async def _user_from_columns(db: AsyncSession, columns: dict[str, Any]) -> User:
+    """Rebuild a cached user inside the request's session without a query."""
+    user = User(**columns)
+    make_transient_to_detached(user)
+    return await db.merge(user, load=False)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _forget_changed_user(_mapper: Any, _connection: Any, user: User) -> None:
+    """Evict a user from the caches once a change to it is committed."""
+    session = object_session(user)
+    if session is not None:
+        # Read now: after the commit the instance may be expired or detached
+        user_id = user.id
+        on_commit(session, lambda: forget_user(user_id))
+
+
+def _decode_token(token: str) -> int | None:
+    """Return the user id of a valid JWT, reusing recent decodes.
+
+    Args:
+        token: Bearer token from the request.
+
+    Returns:
+        User id from the token's subject, or None if the token is invalid.
+    """
+    cached = _token_cache.get(token)
+    if cached is not None:
+        uid, expires_at = cached
+        if expires_at > time.time():
+            return uid
+        del _token_cache[token]
+
     try:
         payload = jwt.decode(
             token,
             settings.jwt_secret_key,
             algorithms=[settings.jwt_algorithm],
+            options={"require": ["exp", "sub"]},
         )
-        user_id: str | None = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+    except jwt.InvalidTokenError:
+        return None
 
-    result = await db.execute(select(User).where(User.id == int(user_id)))
-    user = result.scalar_one_or_none()
+    uid = int(payload["sub"])
+    _token_cache[token] = (uid, payload["exp"])
+    return uid
 
-    if user is None:
-        raise credentials_exception
 
+def forget_user(user_id: int) -> None:
+    """Drop a user's cached lookup and decoded tokens.
+
+    Call after changing a user's status so the next request re-reads it.
+
+    Args:
+        user_id: Id of the user to evict.
+    """
+    _user_cache.pop(user_id, None)
+    for token in [t for t, (uid, _) in _token_cache.items() if uid == user_id]:
+        _token_cache.pop(token, None)
+
+
+async def _get_api_key_user(db: AsyncSession, key: str) -> User | None:
+    """Resolve the user owning an API key.
+
+    Args:
+        db: Database session.
+        key: Plain API key from the Authorization header.
+
+    Returns:
+        Owning user, or None if the key is unknown.
+    """
+    prefix, _, _secret = key.partition(".")
+    result = await db.execute(
+        lambda_stmt(
+            lambda: (
+                select(APIKey.key_hash, User)
+                .join(User, User.id == APIKey.user_id)
+                .where(APIKey.prefix == prefix)
+            )
+        )
+    )
+    row = result.one_or_none()
+    if row is None or not verify_api_key(key, row.key_hash):
+        return None
+    return row.User
+
+
+def _ensure_active(user: User) -> User:
+    """Reject inactive users with 403."""
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Inactive user",
         )
-
     return user
 
 
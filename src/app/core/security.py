@@ -1,9 +1,13 @@
 """Security utilities for password hashing and JWT tokens."""
 
+import hashlib
+import hmac
+import secrets
 from datetime import UTC, datetime, timedelta
+from functools import cache
 
 import bcrypt
-from jose import jwt
+import jwt
 
 from app.core.config import settings
 
@@ -24,6 +28,23 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+def dummy_verify_password(plain_password: str) -> None:
+    """Spend the same bcrypt work as verify_password for an unknown user.
+
+    Keeps login timing independent of whether the email is registered.
+
+    Args:
+        plain_password: Plain text password from the login attempt.
+    """
+    bcrypt.checkpw(plain_password.encode("utf-8"), _dummy_password_hash())
+
+
+@cache
+def _dummy_password_hash() -> bytes:
+    """Hash compared against when no user matches, computed once."""
+    return bcrypt.hashpw(b"dummy-password", bcrypt.gensalt())
+
+
 def get_password_hash(password: str) -> str:
     """Hash a password.
 
@@ -60,3 +81,42 @@ def create_access_token(subject: int, expires_delta: timedelta | None = None) ->
         settings.jwt_secret_key,
         algorithm=settings.jwt_algorithm,
     )
+
+
+def generate_api_key() -> tuple[str, str, str]:
+    """Generate a new random API key.
+
+    Returns:
+        Tuple of (key, lookup prefix, key hash). Only the prefix and hash are
+        meant to be stored.
+    """
+    prefix = secrets.token_hex(4)
+    key = f"{prefix}.{secrets.token_urlsafe(32)}"
+    return key, prefix, hash_api_key(key)
+
+
+def hash_api_key(key: str) -> str:
+    """Hash an API key for storage and comparison.
+
+    API keys are long random strings, so a single SHA-256 is sufficient.
+
+    Args:
+        key: Plain API key.
+
+    Returns:
+        Hex-encoded SHA-256 digest.
+    """
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def verify_api_key(key: str, key_hash: str) -> bool:
+    """Verify an API key against its stored hash in constant time.
+
+    Args:
+        key: Plain API key presented by the client.
+        key_hash: Stored hash to compare against.
+
+    Returns:
+        True if the key matches, False otherwise.
+    """
+    return hmac.compare_digest(hash_api_key(key), key_hash)
@@ -1,10 +1,30 @@
 """FastAPI application entry point."""
 
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 import uvicorn
 from fastapi import FastAPI
 
 from app.api.v1.router import api_router
 from app.core.config import settings
+from app.core.database import engine, warm_up_pool
+from app.services.weather_service import close_http_client
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Warm the database pool on startup; close it and the HTTP client on shutdown."""
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        logger.warning(f"Database warm-up failed: {e}")
+    yield
+    await close_http_client()
+    await engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -20,6 +40,7 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        lifespan=lifespan,
     )
 
     # Include API routers
@@ -1,5 +1,6 @@
 """SQLAlchemy models."""
 
+from app.models.api_key import APIKey
 from app.models.forecast import (
     ForecastModelEnum,
     ForecastRun,
@@ -20,6 +21,7 @@ from app.models.wind_energy_unit import (
 )
 
 __all__ = [
+    "APIKey",
     "User",
     "ForecastModelEnum",
     "ForecastRun",
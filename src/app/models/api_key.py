@@ -0,0 +1,38 @@
+"""API key model for non-interactive clients."""
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.core.database import Base, utc_now
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+
+class APIKey(Base):
+    """API key authenticating a service account without a password login.
+
+    Only the SHA-256 digest of the key is stored; the lookup prefix lets the
+    key be found without comparing against every stored digest.
+    """
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id"), nullable=False
+    )
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    prefix: Mapped[str] = mapped_column(
+        String(16), unique=True, index=True, nullable=False
+    )
+    key_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utc_now,
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    # Relationships
+    user: Mapped["User"] = relationship("User")
@@ -6,7 +6,6 @@ from typing import TYPE_CHECKING
 
 from sqlalchemy import (
     DateTime,
-    Enum,
     Float,
     ForeignKey,
     Integer,
@@ -16,7 +15,11 @@ from sqlalchemy import (
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
-from app.models.wind_energy_unit import GranularityEnum
+from app.models.wind_energy_unit import (
+    DirectionType,
+    GranularityEnum,
+    GranularityType,
+)
 
 if TYPE_CHECKING:
     from app.models.wind_energy_unit import WindFarm
@@ -37,30 +40,36 @@ class WindGenerationForecast(Base):
     Similar to WindFarmGenerationRecord but for future predictions.
     """
 
+    # Serial id must be flagged explicitly within a composite primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     wind_farm_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("windfarm.id"), nullable=False
+        Integer, ForeignKey("windfarm.id", ondelete="CASCADE"), nullable=False
     )
-    # When the forecast was generated
+    # When the forecast was generated; server-side so every write path (insert,
+    # upsert, COPY) stamps a batch with the same transaction time
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
-    # The future timestamp this forecast is for
+    # The future timestamp this forecast is for; part of the primary key as
+    # the table is range-partitioned by it
     forecast_time: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), primary_key=True, nullable=False
     )
     # Forecasted generation
     generation: Mapped[float] = mapped_column(
         Float, nullable=False, doc="Forecasted power generation in kW"
     )
     granularity: Mapped[GranularityEnum] = mapped_column(
-        Enum(GranularityEnum), nullable=False, default=GranularityEnum.min_60
+        GranularityType(), nullable=False, default=GranularityEnum.min_60
     )
     # Weather data used for forecast
     wind_speed: Mapped[float | None] = mapped_column(
         Float, nullable=True, doc="Forecasted wind speed in m/s"
     )
     wind_direction: Mapped[float | None] = mapped_column(
-        Float, nullable=True, doc="Forecasted wind direction in degrees"
+        DirectionType(),
+        nullable=True,
+        doc="Forecasted wind direction in degrees",
     )
     temperature: Mapped[float | None] = mapped_column(
         Float, nullable=True, doc="Forecasted temperature in Celsius"
@@ -73,10 +82,9 @@ class WindGenerationForecast(Base):
         Integer, nullable=True, doc="How many hours ahead this forecast is"
     )
 
-    # Relationships
-    wind_farm: Mapped["WindFarm"] = relationship(
-        "WindFarm", back_populates="generation_forecasts"
-    )
+    # Relationships; rows are listed in bulk, so the farm must be loaded
+    # explicitly rather than one lazy SELECT per row
+    wind_farm: Mapped["WindFarm"] = relationship("WindFarm", lazy="raise")
 
     def __str__(self) -> str:
         return (
@@ -89,10 +97,13 @@ class ForecastRun(Base):
     """Record of a forecast pipeline run."""
 
     wind_farm_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("windfarm.id"), nullable=False
+        Integer, ForeignKey("windfarm.id", ondelete="CASCADE"), nullable=False
     )
+    # clock_timestamp() rather than now(): runs created in one transaction
+    # (batch generation) still get their real start times. Kept server-side so
+    # it shares a clock with completed_at
     started_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), server_default=func.clock_timestamp(), nullable=False
     )
     completed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -106,9 +117,7 @@ class ForecastRun(Base):
     error_message: Mapped[str | None] = mapped_column(String(1000), nullable=True)
 
     # Relationships
-    wind_farm: Mapped["WindFarm"] = relationship(
-        "WindFarm", back_populates="forecast_runs"
-    )
+    wind_farm: Mapped["WindFarm"] = relationship("WindFarm", lazy="raise")
 
     def __str__(self) -> str:
         return f"ForecastRun(id={self.id}, status={self.status})"
@@ -1,26 +1,27 @@
 """Wind energy models for turbines, farms, and power curves."""
 
 import enum
+import math
+from bisect import bisect_left
+from collections.abc import Mapping
 from datetime import datetime
 from typing import TYPE_CHECKING
 
 from sqlalchemy import (
-    JSON,
     DateTime,
-    Enum,
     Float,
     ForeignKey,
     Integer,
+    SmallInteger,
     String,
     Text,
+    TypeDecorator,
     func,
 )
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from app.core.database import Base
-
-if TYPE_CHECKING:
-    from app.models.forecast import ForecastRun, WindGenerationForecast
+from app.core.database import Base, utc_now
 
 
 class GranularityEnum(str, enum.Enum):
@@ -32,6 +33,65 @@ class GranularityEnum(str, enum.Enum):
     min_30 = "30min"
     min_60 = "60min"
 
+    @property
+    def code(self) -> int:
+        """Small integer stored for this granularity in the database."""
+        return GRANULARITY_CODES[self]
+
+
+# Stored codes; never renumber an existing member, rows keep the old code
+GRANULARITY_CODES = {
+    GranularityEnum.min_1: 1,
+    GranularityEnum.min_5: 2,
+    GranularityEnum.min_15: 3,
+    GranularityEnum.min_30: 4,
+    GranularityEnum.min_60: 5,
+}
+_GRANULARITIES_BY_CODE = {code: member for member, code in GRANULARITY_CODES.items()}
+
+
+class GranularityType(TypeDecorator):
+    """Store a GranularityEnum as a SMALLINT code instead of a Postgres enum.
+
+    The column sits on every generation and forecast row, so two bytes keep
+    those rows narrower than the enum's four-byte OID.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):  # noqa: ARG002
+        if value is None:
+            return None
+        return GranularityEnum(value).code
+
+    def process_result_value(self, value, dialect):  # noqa: ARG002
+        if value is None:
+            return None
+        return _GRANULARITIES_BY_CODE[value]
+
+
+class DirectionType(TypeDecorator):
+    """Store a direction in degrees as SMALLINT tenths of a degree (0..3599).
+
+    Measured and forecast directions carry no more than 0.1° of precision,
+    so two bytes replace an eight-byte double on every record row. NaN and
+    infinite directions have no SMALLINT form and are stored as NULL.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):  # noqa: ARG002
+        if value is None or not math.isfinite(value):
+            return None
+        return round(float(value) * 10) % 3600
+
+    def process_result_value(self, value, dialect):  # noqa: ARG002
+        if value is None:
+            return None
+        return value / 10
+
 
 class TurbineStatusEnum(str, enum.Enum):
     """Turbine operational status."""
@@ -50,7 +110,10 @@ class Location(Base):
     longitude: Mapped[float] = mapped_column(Float, nullable=False)
     latitude: Mapped[float] = mapped_column(Float, nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=utc_now,
+        server_default=func.now(),
+        nullable=False,
     )
 
     # Relationships
@@ -74,32 +137,29 @@ class WindFarm(Base):
         Integer, ForeignKey("users.id"), nullable=False
     )
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=utc_now,
+        server_default=func.now(),
+        nullable=False,
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=utc_now,
         server_default=func.now(),
-        onupdate=func.now(),
+        onupdate=utc_now,
         nullable=False,
     )
 
-    # Relationships
+    # Relationships; children are removed by ON DELETE CASCADE in the database,
+    # so deleting a farm does not load them first. Generation records,
+    # forecasts and forecast runs only point back at the farm: those tables
+    # hold millions of rows and are always queried directly with filters
     user: Mapped["User"] = relationship("User", back_populates="wind_farms")
     wind_turbine_fleets: Mapped[list["WindTurbineFleet"]] = relationship(
-        "WindTurbineFleet", back_populates="wind_farm", cascade="all, delete-orphan"
-    )
-    generation_records: Mapped[list["WindFarmGenerationRecord"]] = relationship(
-        "WindFarmGenerationRecord",
-        back_populates="wind_farm",
-        cascade="all, delete-orphan",
-    )
-    generation_forecasts: Mapped[list["WindGenerationForecast"]] = relationship(
-        "WindGenerationForecast",
+        "WindTurbineFleet",
         back_populates="wind_farm",
         cascade="all, delete-orphan",
-    )
-    forecast_runs: Mapped[list["ForecastRun"]] = relationship(
-        "ForecastRun", back_populates="wind_farm", cascade="all, delete-orphan"
+        passive_deletes=True,
     )
 
     def __str__(self) -> str:
@@ -107,23 +167,65 @@ class WindFarm(Base):
 
 
 class PowerCurve(Base):
-    """Power curve mapping wind speed to power output."""
+    """Power curve mapping wind speed to power output.
+
+    The curve is stored as two parallel arrays sorted by wind speed, so it
+    can be handed to ``numpy.interp`` as is. ``wind_speed_value_map`` keeps
+    the ``{str(wind_speed): value}`` form used by the API.
+    """
 
     name: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    wind_speed_value_map: Mapped[dict] = mapped_column(
-        JSON, nullable=False, default=dict
+    wind_speeds: Mapped[list[float]] = mapped_column(
+        ARRAY(Float), nullable=False, default=list, doc="Wind speeds in m/s, ascending"
+    )
+    power_values: Mapped[list[float]] = mapped_column(
+        ARRAY(Float), nullable=False, default=list, doc="Power at each wind speed"
     )
 
     # Relationships
     wind_turbines: Mapped[list["WindTurbine"]] = relationship(
-        "WindTurbine", back_populates="power_curve"
-    )
+        "WindTurbine", back_populates="power_curve", passive_deletes=True
+    )
+
+    @staticmethod
+    def split_map(
+        wind_speed_value_map: Mapping[str, float],
+    ) -> dict[str, list[float]]:
+        """Split a wind speed -> value map into sorted column values."""
+        points = sorted((float(k), v) for k, v in wind_speed_value_map.items())
+        return {
+            "wind_speeds": [speed for speed, _ in points],
+            "power_values": [value for _, value in points],
+        }
+
+    @property
+    def wind_speed_value_map(self) -> dict[str, float]:
+        """Power curve as a mapping of stringified wind speed to value."""
+        return {
+            str(speed): value
+            for speed, value in zip(
+                self.wind_speeds or [], self.power_values or [], strict=True
+            )
+        }
+
+    @wind_speed_value_map.setter
+    def wind_speed_value_map(self, wind_speed_value_map: Mapping[str, float]) -> None:
+        for column, values in self.split_map(wind_speed_value_map).items():
+            setattr(self, column, values)
 
     def add_entry(self, wind_speed: float, value: float) -> None:
-        """Add a wind speed to power value mapping."""
-        if self.wind_speed_value_map is None:
-            self.wind_speed_value_map = {}
-        self.wind_speed_value_map[str(wind_speed)] = value
+        """Add a wind speed to power value mapping, keeping speeds sorted."""
+        speeds = list(self.wind_speeds or [])
+        values = list(self.power_values or [])
+        index = bisect_left(speeds, wind_speed)
+        if index < len(speeds) and speeds[index] == wind_speed:
+            values[index] = value
+        else:
+            speeds.insert(index, wind_speed)
+            values.insert(index, value)
+        # Reassign rather than mutate so the change is flushed
+        self.wind_speeds = speeds
+        self.power_values = values
 
     def __str__(self) -> str:
         return f"PowerCurve(id={self.id}, name={self.name})"
@@ -132,7 +234,9 @@ class PowerCurve(Base):
 class WindTurbine(Base):
     """Wind turbine specification/template (reusable across projects)."""
 
-    turbine_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    turbine_type: Mapped[str | None] = mapped_column(
+        String(255), unique=True, index=True, nullable=True
+    )
     hub_height: Mapped[float] = mapped_column(
         Float, nullable=False, default=100.0, doc="Height of the wind turbine in meters"
     )
@@ -143,7 +247,7 @@ class WindTurbine(Base):
         doc="Nominal power of the wind turbine in MW",
     )
     power_curve_id: Mapped[int | None] = mapped_column(
-        Integer, ForeignKey("powercurve.id"), nullable=True
+        Integer, ForeignKey("powercurve.id", ondelete="SET NULL"), nullable=True
     )
 
     # Relationships
@@ -154,7 +258,9 @@ class WindTurbine(Base):
         "WindTurbineFleet", back_populates="wind_turbine"
     )
     generation_records: Mapped[list["WindTurbineGenerationRecord"]] = relationship(
-        "WindTurbineGenerationRecord", back_populates="wind_turbine"
+        "WindTurbineGenerationRecord",
+        back_populates="wind_turbine",
+        passive_deletes=True,
     )
 
     def __str__(self) -> str:
@@ -165,7 +271,7 @@ class WindTurbineFleet(Base):
     """Links turbine specs to a specific location within a wind farm."""
 
     wind_farm_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("windfarm.id"), nullable=False
+        Integer, ForeignKey("windfarm.id", ondelete="CASCADE"), nullable=False
     )
     wind_turbine_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("windturbine.id"), nullable=False
@@ -193,15 +299,20 @@ class WindTurbineFleet(Base):
 class WindRecord(Base):
     """Historical wind measurement record."""
 
+    # Serial id must be flagged explicitly within a composite primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     location_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("location.id"), nullable=False
     )
-    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    # Part of the primary key: the table is range-partitioned by timestamp
+    timestamp: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, nullable=False
+    )
     wind_speed: Mapped[float] = mapped_column(
         Float, nullable=False, doc="Wind speed in m/s"
     )
     wind_direction: Mapped[float] = mapped_column(
-        Float, nullable=False, doc="Wind direction in degrees"
+        DirectionType(), nullable=False, doc="Wind direction in degrees"
     )
     temperature: Mapped[float | None] = mapped_column(
         Float, nullable=True, doc="Temperature in Celsius"
@@ -224,14 +335,14 @@ class WindTurbineGenerationRecord(Base):
     """
 
     wind_turbine_id: Mapped[int | None] = mapped_column(
-        Integer, ForeignKey("windturbine.id"), nullable=True
+        Integer, ForeignKey("windturbine.id", ondelete="SET NULL"), nullable=True
     )
     timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     generation: Mapped[float] = mapped_column(
         Float, nullable=False, doc="Power generation in kW"
     )
     granularity: Mapped[GranularityEnum] = mapped_column(
-        Enum(GranularityEnum), nullable=False, default=GranularityEnum.min_60
+        GranularityType(), nullable=False, default=GranularityEnum.min_60
     )
     is_synthetic: Mapped[bool] = mapped_column(
         nullable=False, default=False, doc="True if data is synthetically generated"
@@ -252,19 +363,24 @@ class WindFarmGenerationRecord(Base):
     Stores aggregated generation and individual turbine fleet statuses.
     """
 
+    # Serial id must be flagged explicitly within a composite primary key
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     wind_farm_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("windfarm.id"), nullable=False
+        Integer, ForeignKey("windfarm.id", ondelete="CASCADE"), nullable=False
+    )
+    # Part of the primary key: the table is range-partitioned by timestamp
+    timestamp: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, nullable=False
     )
-    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     generation: Mapped[float] = mapped_column(
         Float, nullable=False, doc="Total power generation in kW"
     )
     granularity: Mapped[GranularityEnum] = mapped_column(
-        Enum(GranularityEnum), nullable=False, default=GranularityEnum.min_60
+        GranularityType(), nullable=False, default=GranularityEnum.min_60
     )
     # Turbine fleet statuses: {fleet_id: "on" | "off"}
     fleet_statuses: Mapped[dict] = mapped_column(
-        JSON,
+        JSONB,
         nullable=False,
         default=dict,
         doc="Status of each turbine fleet: {fleet_id: 'on'|'off'}",
@@ -277,16 +393,14 @@ class WindFarmGenerationRecord(Base):
         Float, nullable=True, doc="Average wind speed in m/s used for generation"
     )
     wind_direction: Mapped[float | None] = mapped_column(
-        Float, nullable=True, doc="Wind direction in degrees"
+        DirectionType(), nullable=True, doc="Wind direction in degrees"
     )
     temperature: Mapped[float | None] = mapped_column(
         Float, nullable=True, doc="Temperature in Celsius"
     )
 
     # Relationships
-    wind_farm: Mapped["WindFarm"] = relationship(
-        "WindFarm", back_populates="generation_records"
-    )
+    wind_farm: Mapped["WindFarm"] = relationship("WindFarm", lazy="raise")
 
     def __str__(self) -> str:
         return f"WindFarmGenerationRecord(id={self.id}, farm_id={self.wind_farm_id}, generation={self.generation}kW)"
@@ -1,6 +1,6 @@
 """Pydantic schemas for request/response validation."""
 
-from app.schemas.auth import Token, TokenPayload
+from app.schemas.auth import APIKeyCreate, APIKeyCreated, Token, TokenPayload
 from app.schemas.user import UserCreate, UserRead, UserUpdate
 from app.schemas.weather import (
     WeatherDataOut,
@@ -36,6 +36,8 @@ from app.schemas.wind_energy import (
 )
 
 __all__ = [
+    "APIKeyCreate",
+    "APIKeyCreated",
     "Token",
     "TokenPayload",
     "UserCreate",
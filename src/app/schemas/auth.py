@@ -1,6 +1,8 @@
 """Authentication schemas."""
 
-from pydantic import BaseModel
+from datetime import datetime
+
+from pydantic import BaseModel, Field
 
 
 class Token(BaseModel):
@@ -15,3 +17,18 @@ class TokenPayload(BaseModel):
 
     sub: int  # user id
     exp: int  # expiration timestamp
+
+
+class APIKeyCreate(BaseModel):
+    """Schema for issuing an API key."""
+
+    name: str = Field(..., min_length=1, max_length=100)
+
+
+class APIKeyCreated(BaseModel):
+    """Issued API key; the plain key is only ever returned here."""
+
+    id: int
+    name: str
+    key: str
+    created_at: datetime
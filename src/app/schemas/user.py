@@ -1,14 +1,37 @@
 """User schemas for request/response validation."""
 
 from datetime import datetime
+from functools import lru_cache
+from typing import Annotated
 
-from pydantic import BaseModel, ConfigDict, EmailStr
+from pydantic import AfterValidator, BaseModel, ConfigDict, WithJsonSchema
+from pydantic.networks import validate_email
+
+
+@lru_cache(maxsize=4096)
+def _validate_email(value: str) -> str:
+    """Validate and normalize an email address, as ``EmailStr`` does.
+
+    email-validator dominates model init for user schemas, and the same
+    addresses come back on every read of a user, so results are memoized.
+    Invalid addresses raise and are not cached.
+    """
+    _name, email = validate_email(value)
+    return email
+
+
+# Drop-in for EmailStr that only runs email-validator once per address
+CachedEmailStr = Annotated[
+    str,
+    AfterValidator(_validate_email),
+    WithJsonSchema({"type": "string", "format": "email"}),
+]
 
 
 class UserBase(BaseModel):
     """Base user schema with shared attributes."""
 
-    email: EmailStr
+    email: CachedEmailStr
     full_name: str | None = None
 
 
@@ -21,7 +44,7 @@ class UserCreate(UserBase):
 class UserUpdate(BaseModel):
     """Schema for user update (all fields optional)."""
 
-    email: EmailStr | None = None
+    email: CachedEmailStr | None = None
     full_name: str | None = None
     password: str | None = None
 
@@ -2,12 +2,15 @@
 
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class WeatherRecordOut(BaseModel):
     """Single weather data point output."""
 
+    # Built once per data point and never mutated
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
     time: datetime
     temperature: float | None = None
     temperature_80m: float | None = None
@@ -25,6 +28,8 @@ class WeatherRecordOut(BaseModel):
 class WeatherDataOut(BaseModel):
     """Weather API response."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     historical: list[WeatherRecordOut] = Field(default_factory=list)
     forecast: list[WeatherRecordOut] = Field(default_factory=list)
     model_used: str | None = None
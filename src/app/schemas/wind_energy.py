@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.models.wind_energy_unit import GranularityEnum
 
@@ -169,10 +169,14 @@ class WindTurbineFleetRead(WindTurbineFleetBase):
 class WindRecordBase(BaseModel):
     """Base wind record schema."""
 
+    # Bulk payloads build one instance per row, never mutated after validation
+    model_config = ConfigDict(frozen=True)
+
     location_id: int
     timestamp: datetime
     wind_speed: float
-    wind_direction: float
+    # Stored as SMALLINT tenths of a degree, which has no NaN or infinity
+    wind_direction: float = Field(allow_inf_nan=False)
     temperature: float | None = None
 
 
@@ -203,6 +207,8 @@ class GenerationRecordBase(BaseModel):
     wind_turbine_id is optional - if not provided, represents aggregated data.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     wind_turbine_id: int | None = None
     timestamp: datetime
     generation: float
@@ -234,6 +240,8 @@ class GenerationRecordRead(GenerationRecordBase):
 class WindFarmGenerationRecordBase(BaseModel):
     """Base wind farm generation record schema."""
 
+    model_config = ConfigDict(frozen=True)
+
     wind_farm_id: int
     timestamp: datetime
     generation: float
@@ -242,7 +250,7 @@ class WindFarmGenerationRecordBase(BaseModel):
     is_synthetic: bool = False
     # Weather data used for generation
     wind_speed: float | None = None
-    wind_direction: float | None = None
+    wind_direction: float | None = Field(None, allow_inf_nan=False)
     temperature: float | None = None
 
 
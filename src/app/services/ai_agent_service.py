@@ -1,22 +1,89 @@
 """AI Agent service with MCP-style tools for wind farm analysis."""
 
-import json
+import asyncio
+import hashlib
 import os
-from datetime import UTC
+from collections import OrderedDict
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime, timedelta
+from functools import cache, partial
 from typing import Any
 
-from groq import Groq
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+import orjson
+from cachetools import TTLCache
+from groq import AsyncGroq
+from sqlalchemy import Subquery, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
+from app.core.database import on_commit
 from app.models.forecast import WindGenerationForecast
 from app.models.wind_energy_unit import (
     WindFarm,
     WindFarmGenerationRecord,
+    WindTurbine,
     WindTurbineFleet,
 )
 
+# Most recent history messages sent to the LLM verbatim
+HISTORY_WINDOW = 10
+# Summaries of older history kept per process, keyed by user and by the last
+# messages they cover
+HISTORY_SUMMARY_CACHE_SIZE = 256
+# Older messages are folded into the summary this many at a time; until a
+# block is full they are sent verbatim after the cached summary
+HISTORY_SUMMARY_BLOCK = 6
+# Trailing messages identifying the point a cached summary covers up to.
+# BLOCK + ANCHOR must fit in the older part of a full client history (20 sent,
+# 10 kept verbatim), or the anchor slides out before the summary is extended
+HISTORY_SUMMARY_ANCHOR = 2
+# Reply sent when the model returns no text
+NO_RESPONSE = "I couldn't generate a response."
+# Tools that change data; run before the read-only calls of the same turn
+WRITE_TOOLS = frozenset({"regenerate_forecast"})
+# Forecast errors are computed over this many recent days unless asked
+FORECAST_ERROR_LOOKBACK_DAYS = 30
+MAX_FORECAST_ERROR_LOOKBACK_DAYS = 365
+
+# Farm lists and details are fetched on most chat turns but rarely change;
+# they are reused for this long, or until forget_user_farms() is called
+FARM_CACHE_TTL_SECONDS = 60
+FARM_CACHE_SIZE = 1024
+
+_farm_list_cache: TTLCache[int, list[dict[str, Any]]] = TTLCache(
+    maxsize=FARM_CACHE_SIZE, ttl=FARM_CACHE_TTL_SECONDS
+)
+_farm_details_cache: TTLCache[tuple[int, int], dict[str, Any]] = TTLCache(
+    maxsize=FARM_CACHE_SIZE, ttl=FARM_CACHE_TTL_SECONDS
+)
+
+
+def _forget_farms(user_id: int | None) -> None:
+    """Drop cached farm lists and details for one user, or for everyone."""
+    if user_id is None:
+        _farm_list_cache.clear()
+        _farm_details_cache.clear()
+        return
+    _farm_list_cache.pop(user_id, None)
+    for key in [k for k in _farm_details_cache if k[0] == user_id]:
+        _farm_details_cache.pop(key, None)
+
+
+def forget_user_farms(db: AsyncSession, user_id: int | None = None) -> None:
+    """Drop the agent's cached farm list and farm details once ``db`` commits.
+
+    Call after creating, changing or deleting a user's farms or fleets.
+    Evicting only after the commit keeps a concurrent chat turn from caching
+    the rows as they were before it.
+
+    Args:
+        db: Session holding the change.
+        user_id: Owner of the changed farms. None drops every user's entries,
+            for shared rows such as turbine models and locations.
+    """
+    on_commit(db, partial(_forget_farms, user_id))
+
+
 # MCP-style tool definitions
 TOOLS = [
     {
@@ -77,7 +144,7 @@ TOOLS = [
         "type": "function",
         "function": {
             "name": "get_forecast_errors",
-            "description": "Calculate forecast accuracy metrics (MAE, RMSE, MAPE, bias) by comparing forecasts with actual generation data for a wind farm. Use get_user_wind_farms first to find the numeric ID.",
+            "description": "Calculate forecast accuracy metrics (MAE, RMSE, MAPE, bias) by comparing forecasts with actual generation data for a wind farm over a recent window. Use get_user_wind_farms first to find the numeric ID.",
             "parameters": {
                 "type": "object",
                 "properties": {
@@ -85,6 +152,10 @@ TOOLS = [
                         "type": "integer",
                         "description": "The numeric ID of the wind farm (from get_user_wind_farms)",
                     },
+                    "lookback_days": {
+                        "type": "integer",
+                        "description": "Number of past days to compare (default 30, max 365)",
+                    },
                 },
                 "required": ["wind_farm_id"],
             },
@@ -140,70 +211,166 @@ class AIAgentService:
     """AI Agent that can answer questions about wind farms using MCP-style tools."""
 
     def __init__(self) -> None:
-        """Initialize the AI agent with Groq client."""
+        """Initialize the AI agent with an async Groq client."""
         from app.core.config import settings
 
         api_key = settings.groq_api_key or os.getenv("GROQ_API_KEY")
         if not api_key:
             raise ValueError("GROQ_API_KEY environment variable is not set")
-        self.client = Groq(api_key=api_key)
+        self.client = AsyncGroq(api_key=api_key)
         # Primary model - best quality
         self.primary_model = "llama-3.3-70b-versatile"
         # Backup model - used when primary hits rate limit
         self.backup_model = "llama-3.1-8b-instant"
-        self.model = self.primary_model
+        self._history_summaries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def _summary_key(user_id: int, covered: list[dict[str, str]]) -> str:
+        """Key a summary by its user and the last messages it covers."""
+        anchor = covered[-HISTORY_SUMMARY_ANCHOR:]
+        return hashlib.sha256(orjson.dumps([user_id, anchor])).hexdigest()
+
+    async def _condense_history(
+        self, history: list[dict[str, str]], user_id: int
+    ) -> list[dict[str, str]]:
+        """Collapse all but the last HISTORY_WINDOW messages into a summary.
+
+        The client sends a sliding window of the conversation, so the older
+        messages shift by one exchange every turn. Summaries are therefore
+        extended incrementally: the latest cached summary covering a prefix of
+        the older messages is reused, and the messages after it are sent
+        verbatim until HISTORY_SUMMARY_BLOCK of them have piled up. Only then
+        does the backup model fold them into a new summary, so most turns
+        make no extra completion.
+
+        Args:
+            history: Conversation history as sent by the client.
+            user_id: Owner of the conversation; summaries are never shared
+                between users.
+
+        Returns:
+            The recent messages, preceded by a system message summarizing
+            the older ones when the history was longer than the window.
+        """
+        if len(history) <= HISTORY_WINDOW:
+            return history
+
+        older, recent = history[:-HISTORY_WINDOW], history[-HISTORY_WINDOW:]
+
+        # Longest prefix of the older messages that a cached summary covers
+        summary, covered = None, 0
+        for end in range(len(older), HISTORY_SUMMARY_ANCHOR - 1, -1):
+            key = self._summary_key(user_id, older[:end])
+            if (cached := self._history_summaries.get(key)) is not None:
+                self._history_summaries.move_to_end(key)
+                summary, covered = cached, end
+                break
+
+        pending = older[covered:]
+        if summary is None or len(pending) >= HISTORY_SUMMARY_BLOCK:
+            transcript = "\n".join(
+                f"{m.get('role', 'user')}: {m.get('content', '')}" for m in pending
+            )
+            if summary is not None:
+                transcript = f"Earlier summary: {summary}\n\n{transcript}"
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.backup_model,
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "Summarize this conversation between a user and a wind farm assistant in a few sentences. Keep wind farm names, IDs, dates and figures.",
+                        },
+                        {"role": "user", "content": transcript},
+                    ],
+                    max_tokens=512,
+                )
+            except Exception as e:
+                print(f"[CHAT] History summary failed, dropping it: {e}", flush=True)
+                return recent
+
+            summary = response.choices[0].message.content or ""
+            self._history_summaries[self._summary_key(user_id, older)] = summary
+            if len(self._history_summaries) > HISTORY_SUMMARY_CACHE_SIZE:
+                self._history_summaries.popitem(last=False)
+            pending = []
+
+        return [
+            {
+                "role": "system",
+                "content": f"Summary of the earlier conversation: {summary}",
+            },
+            *pending,
+            *recent,
+        ]
 
     async def _get_user_wind_farms(
         self, session: AsyncSession, user_id: int
     ) -> list[dict[str, Any]]:
         """Get all wind farms for a user."""
+        if (cached := _farm_list_cache.get(user_id)) is not None:
+            return cached
+
+        # Only per-farm totals are reported, so sum them in the database
+        # rather than loading every fleet and turbine
+        fleet = WindTurbineFleet
         stmt = (
-            select(WindFarm)
-            .options(
-                selectinload(WindFarm.wind_turbine_fleets).selectinload(
-                    WindTurbineFleet.wind_turbine
-                )
+            select(
+                WindFarm.id,
+                WindFarm.name,
+                WindFarm.description,
+                WindFarm.created_at,
+                func.coalesce(func.sum(fleet.number_of_turbines), 0),
+                func.coalesce(
+                    func.sum(fleet.number_of_turbines * WindTurbine.nominal_power), 0
+                ),
             )
+            .outerjoin(fleet, fleet.wind_farm_id == WindFarm.id)
+            .outerjoin(WindTurbine, WindTurbine.id == fleet.wind_turbine_id)
             .where(WindFarm.user_id == user_id)
+            .group_by(WindFarm.id)
         )
         result = await session.execute(stmt)
-        farms = result.scalars().all()
 
-        farm_list = []
-        for farm in farms:
-            total_turbines = sum(f.number_of_turbines for f in farm.wind_turbine_fleets)
-            total_capacity = sum(
-                f.number_of_turbines
-                * (f.wind_turbine.nominal_power if f.wind_turbine else 0)
-                for f in farm.wind_turbine_fleets
-            )
-            farm_list.append(
-                {
-                    "id": farm.id,
-                    "name": farm.name,
-                    "description": farm.description,
-                    "total_turbines": total_turbines,
-                    "total_capacity_mw": round(total_capacity, 2),
-                    "created_at": farm.created_at.isoformat()
-                    if farm.created_at
-                    else None,
-                }
-            )
+        farm_list = [
+            {
+                "id": farm_id,
+                "name": name,
+                "description": description,
+                "total_turbines": total_turbines,
+                "total_capacity_mw": round(total_capacity, 2),
+                "created_at": created_at.isoformat() if created_at else None,
+            }
+            for (
+                farm_id,
+                name,
+                description,
+                created_at,
+                total_turbines,
+                total_capacity,
+            ) in result
+        ]
+        _farm_list_cache[user_id] = farm_list
         return farm_list
 
     async def _get_wind_farm_details(
         self, session: AsyncSession, user_id: int, wind_farm_id: int
     ) -> dict[str, Any] | None:
         """Get detailed info about a wind farm."""
+        key = (user_id, wind_farm_id)
+        if (cached := _farm_details_cache.get(key)) is not None:
+            return cached
+
         stmt = (
             select(WindFarm)
             .options(
-                selectinload(WindFarm.wind_turbine_fleets).selectinload(
-                    WindTurbineFleet.wind_turbine
-                ),
-                selectinload(WindFarm.wind_turbine_fleets).selectinload(
-                    WindTurbineFleet.location
+                # One query for the fleets, joining their many-to-one turbine
+                # and location rows
+                selectinload(WindFarm.wind_turbine_fleets).options(
+                    joinedload(WindTurbineFleet.wind_turbine),
+                    joinedload(WindTurbineFleet.location),
                 ),
+                raiseload("*"),
             )
             .where(WindFarm.id == wind_farm_id, WindFarm.user_id == user_id)
         )
@@ -236,7 +403,7 @@ class AIAgentService:
                 }
             )
 
-        return {
+        details = {
             "id": farm.id,
             "name": farm.name,
             "description": farm.description,
@@ -250,6 +417,8 @@ class AIAgentService:
                 for f in farm.wind_turbine_fleets
             ),
         }
+        _farm_details_cache[key] = details
+        return details
 
     async def _get_forecasts(
         self,
@@ -268,8 +437,6 @@ class AIAgentService:
             horizon_hours: Number of hours to forecast (default 48)
             start_hours_from_now: Start offset from now in hours (0 = now, 24 = tomorrow)
         """
-        from datetime import datetime, timedelta
-
         # Verify ownership and get farm name
         farm_stmt = select(WindFarm).where(
             WindFarm.id == wind_farm_id, WindFarm.user_id == user_id
@@ -346,10 +513,41 @@ class AIAgentService:
             "hourly_forecasts": hourly_forecasts,
         }
 
+    @staticmethod
+    def _hourly_generation(
+        time_column: Any, generation_column: Any, *criteria: Any
+    ) -> Subquery:
+        """Subquery of mean generation per hour, with ``hour`` and ``generation``.
+
+        Series at a finer granularity than hourly are averaged per hour so
+        they can be compared with each other.
+        """
+        hour = func.date_trunc("hour", time_column)
+        return (
+            select(
+                hour.label("hour"),
+                func.avg(generation_column).label("generation"),
+            )
+            .where(*criteria)
+            .group_by(hour)
+            .subquery()
+        )
+
     async def _get_forecast_errors(
-        self, session: AsyncSession, user_id: int, wind_farm_id: int
+        self,
+        session: AsyncSession,
+        user_id: int,
+        wind_farm_id: int,
+        lookback_days: int = FORECAST_ERROR_LOOKBACK_DAYS,
     ) -> dict[str, Any]:
-        """Calculate forecast errors by comparing with actual generation."""
+        """Calculate forecast errors by comparing with actual generation.
+
+        Args:
+            session: Database session
+            user_id: Current user ID
+            wind_farm_id: Wind farm ID
+            lookback_days: Only compare the most recent days (default 30)
+        """
         # Verify ownership
         farm_stmt = select(WindFarm).where(
             WindFarm.id == wind_farm_id, WindFarm.user_id == user_id
@@ -359,84 +557,100 @@ class AIAgentService:
         if not farm:
             return {"error": "Wind farm not found or access denied"}
 
-        # Get forecasts
-        forecast_stmt = select(WindGenerationForecast).where(
-            WindGenerationForecast.wind_farm_id == wind_farm_id
+        # Only a recent window: the full history grows without bound
+        window_end = datetime.now(UTC)
+        window_start = window_end - timedelta(
+            days=min(lookback_days, MAX_FORECAST_ERROR_LOOKBACK_DAYS)
         )
-        forecast_result = await session.execute(forecast_stmt)
-        forecasts = forecast_result.scalars().all()
-
-        # Get actual generation
-        gen_stmt = select(WindFarmGenerationRecord).where(
-            WindFarmGenerationRecord.wind_farm_id == wind_farm_id
+        window = {"start": window_start.isoformat(), "end": window_end.isoformat()}
+        forecast_criteria = (
+            WindGenerationForecast.wind_farm_id == wind_farm_id,
+            WindGenerationForecast.forecast_time >= window_start,
+            WindGenerationForecast.forecast_time < window_end,
+        )
+        actual_criteria = (
+            WindFarmGenerationRecord.wind_farm_id == wind_farm_id,
+            WindFarmGenerationRecord.timestamp >= window_start,
+            WindFarmGenerationRecord.timestamp < window_end,
         )
-        gen_result = await session.execute(gen_stmt)
-        actuals = gen_result.scalars().all()
-
-        if not forecasts or not actuals:
-            return {
-                "wind_farm_id": wind_farm_id,
-                "wind_farm_name": farm.name,
-                "error": "Insufficient data for error calculation",
-                "forecast_count": len(forecasts),
-                "actual_count": len(actuals),
-            }
-
-        # Match forecasts with actuals by hour
-        forecast_by_hour = {
-            f.forecast_time.replace(minute=0, second=0, microsecond=0): f.generation
-            for f in forecasts
-            if f.generation is not None
-        }
-        actual_by_hour = {
-            a.timestamp.replace(minute=0, second=0, microsecond=0): a.generation
-            for a in actuals
-            if a.generation is not None
-        }
-
-        # Find matching hours
-        matched_hours = set(forecast_by_hour.keys()) & set(actual_by_hour.keys())
 
-        if len(matched_hours) < 2:
+        # Match forecasts with actuals by hour and aggregate the differences
+        # in the database, instead of loading both series
+        forecast = self._hourly_generation(
+            WindGenerationForecast.forecast_time,
+            WindGenerationForecast.generation,
+            *forecast_criteria,
+        )
+        actual = self._hourly_generation(
+            WindFarmGenerationRecord.timestamp,
+            WindFarmGenerationRecord.generation,
+            *actual_criteria,
+        )
+        diff = forecast.c.generation - actual.c.generation
+        errors_stmt = select(
+            func.count(),
+            func.sum(func.abs(diff)),
+            func.sum(diff * diff),
+            func.sum(diff),
+            func.avg(func.abs(diff) / actual.c.generation * 100).filter(
+                actual.c.generation > 0
+            ),
+            func.sum(actual.c.generation),
+            func.sum(forecast.c.generation),
+        ).select_from(forecast.join(actual, forecast.c.hour == actual.c.hour))
+        (
+            n,
+            abs_error_sum,
+            squared_error_sum,
+            error_sum,
+            mape,
+            actual_sum,
+            forecast_sum,
+        ) = (await session.execute(errors_stmt)).one()
+
+        if n < 2:
+            forecast_count, actual_count = (
+                await session.execute(
+                    select(
+                        select(func.count())
+                        .select_from(WindGenerationForecast)
+                        .where(*forecast_criteria)
+                        .scalar_subquery(),
+                        select(func.count())
+                        .select_from(WindFarmGenerationRecord)
+                        .where(*actual_criteria)
+                        .scalar_subquery(),
+                    )
+                )
+            ).one()
+            if not forecast_count or not actual_count:
+                return {
+                    "wind_farm_id": wind_farm_id,
+                    "wind_farm_name": farm.name,
+                    "error": "Insufficient data for error calculation",
+                    "window": window,
+                    "forecast_count": forecast_count,
+                    "actual_count": actual_count,
+                }
             return {
                 "wind_farm_id": wind_farm_id,
                 "wind_farm_name": farm.name,
                 "error": "Not enough overlapping time points",
-                "matched_hours": len(matched_hours),
+                "window": window,
+                "matched_hours": n,
             }
 
-        # Calculate errors
-        errors = []
-        for hour in matched_hours:
-            forecast_val = forecast_by_hour[hour]
-            actual_val = actual_by_hour[hour]
-            errors.append(
-                {
-                    "forecast": forecast_val,
-                    "actual": actual_val,
-                    "error": forecast_val - actual_val,
-                    "abs_error": abs(forecast_val - actual_val),
-                    "pct_error": abs(forecast_val - actual_val) / actual_val * 100
-                    if actual_val > 0
-                    else None,
-                }
-            )
-
         # Calculate metrics
-        n = len(errors)
-        mae = sum(e["abs_error"] for e in errors) / n
-        rmse = (sum(e["error"] ** 2 for e in errors) / n) ** 0.5
-        bias = sum(e["error"] for e in errors) / n
-
-        pct_errors = [e["pct_error"] for e in errors if e["pct_error"] is not None]
-        mape = sum(pct_errors) / len(pct_errors) if pct_errors else None
-
-        avg_actual = sum(e["actual"] for e in errors) / n
-        avg_forecast = sum(e["forecast"] for e in errors) / n
+        mae = abs_error_sum / n
+        rmse = (squared_error_sum / n) ** 0.5
+        bias = error_sum / n
+        avg_actual = actual_sum / n
+        avg_forecast = forecast_sum / n
 
         return {
             "wind_farm_id": wind_farm_id,
             "wind_farm_name": farm.name,
+            "window": window,
             "matched_hours": n,
             "metrics": {
                 "mae_kw": round(mae, 2),
@@ -450,10 +664,8 @@ class AIAgentService:
             "summary": {
                 "avg_actual_kw": round(avg_actual, 2),
                 "avg_forecast_kw": round(avg_forecast, 2),
-                "total_actual_mwh": round(sum(e["actual"] for e in errors) / 1000, 2),
-                "total_forecast_mwh": round(
-                    sum(e["forecast"] for e in errors) / 1000, 2
-                ),
+                "total_actual_mwh": round(actual_sum / 1000, 2),
+                "total_forecast_mwh": round(forecast_sum / 1000, 2),
             },
         }
 
@@ -470,41 +682,53 @@ class AIAgentService:
         if not farm:
             return {"error": "Wind farm not found or access denied"}
 
-        gen_stmt = (
-            select(WindFarmGenerationRecord)
-            .where(WindFarmGenerationRecord.wind_farm_id == wind_farm_id)
-            .order_by(WindFarmGenerationRecord.timestamp)
-        )
-        gen_result = await session.execute(gen_stmt)
-        records = gen_result.scalars().all()
-
-        if not records:
+        # Aggregate in the database: a farm can have hundreds of thousands
+        # of records, and only these few figures are reported
+        record = WindFarmGenerationRecord
+        gen_stmt = select(
+            func.count(),
+            func.sum(record.generation),
+            func.avg(record.generation),
+            func.max(record.generation),
+            func.min(record.generation),
+            func.count().filter(record.is_synthetic),
+            func.min(record.timestamp),
+            func.max(record.timestamp),
+        ).where(record.wind_farm_id == wind_farm_id)
+        (
+            record_count,
+            total_kw,
+            avg_kw,
+            max_kw,
+            min_kw,
+            synthetic_count,
+            start,
+            end,
+        ) = (await session.execute(gen_stmt)).one()
+
+        if not record_count:
             return {
                 "wind_farm_id": wind_farm_id,
                 "wind_farm_name": farm.name,
                 "message": "No generation data available",
             }
 
-        generations = [r.generation for r in records if r.generation is not None]
-
         return {
             "wind_farm_id": wind_farm_id,
             "wind_farm_name": farm.name,
-            "record_count": len(records),
+            "record_count": record_count,
             "time_range": {
-                "start": records[0].timestamp.isoformat(),
-                "end": records[-1].timestamp.isoformat(),
+                "start": start.isoformat(),
+                "end": end.isoformat(),
             },
             "generation_stats": {
-                "total_mwh": round(sum(generations) / 1000, 2),
-                "avg_kw": round(sum(generations) / len(generations), 2)
-                if generations
-                else 0,
-                "max_kw": round(max(generations), 2) if generations else 0,
-                "min_kw": round(min(generations), 2) if generations else 0,
+                "total_mwh": round(total_kw / 1000, 2),
+                "avg_kw": round(avg_kw, 2),
+                "max_kw": round(max_kw, 2),
+                "min_kw": round(min_kw, 2),
             },
-            "synthetic_count": sum(1 for r in records if r.is_synthetic),
-            "real_count": sum(1 for r in records if not r.is_synthetic),
+            "synthetic_count": synthetic_count,
+            "real_count": record_count - synthetic_count,
         }
 
     async def _regenerate_forecast(
@@ -589,7 +813,12 @@ class AIAgentService:
                 )
             elif tool_name == "get_forecast_errors":
                 result = await self._get_forecast_errors(
-                    session, user_id, arguments["wind_farm_id"]
+                    session,
+                    user_id,
+                    arguments["wind_farm_id"],
+                    lookback_days=arguments.get(
+                        "lookback_days", FORECAST_ERROR_LOOKBACK_DAYS
+                    ),
                 )
             elif tool_name == "get_generation_summary":
                 result = await self._get_generation_summary(
@@ -606,22 +835,88 @@ class AIAgentService:
             else:
                 result = {"error": f"Unknown tool: {tool_name}"}
 
-            return json.dumps(result, indent=2)
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2).decode()
         except Exception as e:
-            return json.dumps({"error": str(e)})
+            return orjson.dumps({"error": str(e)}).decode()
 
-    async def chat(
+    async def _run_tool_call(
         self,
-        message: str,
-        session: AsyncSession,
+        tool_call: dict[str, Any],
+        session_factory: async_sessionmaker[AsyncSession],
         user_id: int,
-        conversation_history: list[dict[str, str]] | None = None,
     ) -> str:
-        """Process a chat message and return the response."""
-        import logging
+        """Execute one tool call from the LLM on its own database session.
 
-        logging.getLogger(__name__)
+        A session is not safe for concurrent use, so each call of a turn
+        gets a short-lived one from the factory.
+        """
+        function_name = tool_call["function"]["name"]
+        arguments = tool_call["function"]["arguments"]
+        # Handle empty or malformed arguments
+        try:
+            function_args = orjson.loads(arguments) if arguments else {}
+        except orjson.JSONDecodeError:
+            function_args = {}
+        print(
+            f"[CHAT] Executing tool: {function_name} with args: {function_args}",
+            flush=True,
+        )
 
+        async with session_factory() as session:
+            tool_result = await self._execute_tool(
+                function_name, function_args, session, user_id
+            )
+        print(f"[CHAT] Tool result length: {len(tool_result)}", flush=True)
+        return tool_result
+
+    @staticmethod
+    async def _stream_reply(
+        stream: AsyncIterator[Any], tool_calls: dict[int, dict[str, Any]]
+    ) -> AsyncIterator[str]:
+        """Yield the text of a streamed completion, collecting its tool calls.
+
+        Tool calls can arrive split over several chunks: the id and name with
+        the first fragment, the arguments as pieces of JSON text. Fragments
+        are merged by index into ``tool_calls``, in the message format the
+        next completion request expects.
+        """
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta
+            if delta.content:
+                yield delta.content
+            for fragment in delta.tool_calls or []:
+                call = tool_calls.setdefault(
+                    fragment.index,
+                    {
+                        "id": "",
+                        "type": "function",
+                        "function": {"name": "", "arguments": ""},
+                    },
+                )
+                if fragment.id:
+                    call["id"] = fragment.id
+                if fragment.function:
+                    call["function"]["name"] += fragment.function.name or ""
+                    call["function"]["arguments"] += fragment.function.arguments or ""
+
+    async def _stream_answer(self, stream: AsyncIterator[Any]) -> AsyncIterator[str]:
+        """Yield the text of a streamed completion made without tools."""
+        empty = True
+        async for piece in self._stream_reply(stream, {}):
+            empty = False
+            yield piece
+        if empty:
+            yield NO_RESPONSE
+
+    async def _build_messages(
+        self,
+        message: str,
+        conversation_history: list[dict[str, str]] | None,
+        user_id: int,
+    ) -> list[dict[str, Any]]:
+        """Assemble the system prompt, condensed history and user message."""
         messages: list[dict[str, Any]] = [
             {
                 "role": "system",
@@ -656,18 +951,50 @@ Only access data for wind farms belonging to the current user.""",
 
         # Add conversation history
         if conversation_history:
-            messages.extend(conversation_history)
+            messages.extend(await self._condense_history(conversation_history, user_id))
 
         # Add user message
         messages.append({"role": "user", "content": message})
 
+        return messages
+
+    async def chat_stream(
+        self,
+        message: str,
+        session_factory: async_sessionmaker[AsyncSession],
+        user_id: int,
+        conversation_history: list[dict[str, str]] | None = None,
+    ) -> AsyncIterator[str | None]:
+        """Process a chat message, yielding the response as it is generated.
+
+        Completions are streamed, so text reaches the caller as soon as the
+        model produces it instead of after the whole reply. The model may
+        also write text in a turn that ends in tool calls; such a turn is
+        closed with ``None``, so callers can tell that text apart from the
+        final answer.
+
+        Args:
+            message: The user's message.
+            session_factory: Opens a database session for each tool call.
+            user_id: Owner whose wind farms the tools may access.
+            conversation_history: Earlier messages of the conversation.
+
+        Yields:
+            Consecutive pieces of the assistant's reply, and None after each
+            turn that called tools.
+        """
+        messages = await self._build_messages(message, conversation_history, user_id)
+
+        # Chosen per call so a rate-limit fallback doesn't stick to the shared agent
+        model = self.primary_model
+
         try:
             # First API call with tools
             print(
                 f"[CHAT] Calling Groq API for user message: {message[:50]}...",
                 flush=True,
             )
-            print(f"[CHAT] Using model: {self.model}", flush=True)
+            print(f"[CHAT] Using model: {model}", flush=True)
 
             # Multi-turn tool calling loop
             max_iterations = 5  # Prevent infinite loops
@@ -678,12 +1005,13 @@ Only access data for wind farms belonging to the current user.""",
                 print(f"[CHAT] Iteration {iteration}", flush=True)
 
                 try:
-                    response = self.client.chat.completions.create(
-                        model=self.model,
+                    stream = await self.client.chat.completions.create(
+                        model=model,
                         messages=messages,
                         tools=TOOLS,
                         tool_choice="auto",
                         max_tokens=4096,
+                        stream=True,
                     )
                 except Exception as api_error:
                     error_str = str(api_error)
@@ -695,12 +1023,12 @@ Only access data for wind farms belonging to the current user.""",
                     # Check if it's a rate limit error on primary model - switch to backup
                     if (
                         "rate_limit" in error_str.lower() or "429" in error_str
-                    ) and self.model == self.primary_model:
+                    ) and model == self.primary_model:
                         print(
-                            f"[CHAT] Rate limit hit on {self.model}, switching to backup model {self.backup_model}",
+                            f"[CHAT] Rate limit hit on {model}, switching to backup model {self.backup_model}",
                             flush=True,
                         )
-                        self.model = self.backup_model
+                        model = self.backup_model
                         # Retry with backup model
                         continue
 
@@ -710,89 +1038,115 @@ Only access data for wind farms belonging to the current user.""",
 
                     # For other errors, try without tool_choice
                     try:
-                        response = self.client.chat.completions.create(
-                            model=self.model,
+                        stream = await self.client.chat.completions.create(
+                            model=model,
                             messages=messages,
                             max_tokens=4096,
-                        )
-                        return (
-                            response.choices[0].message.content
-                            or "I couldn't generate a response."
+                            stream=True,
                         )
                     except Exception:
                         raise api_error
-
-                response_message = response.choices[0].message
+                    async for piece in self._stream_answer(stream):
+                        yield piece
+                    return
+
+                content: list[str] = []
+                pending_calls: dict[int, dict[str, Any]] = {}
+                async for piece in self._stream_reply(stream, pending_calls):
+                    content.append(piece)
+                    yield piece
                 print(
-                    f"[CHAT] Got response, tool_calls: {bool(response_message.tool_calls)}",
+                    f"[CHAT] Got response, tool_calls: {bool(pending_calls)}",
                     flush=True,
                 )
 
                 # Check if model wants to use tools
-                if not response_message.tool_calls:
-                    # No more tool calls, return the final response
-                    return response_message.content or "I couldn't generate a response."
-
-                # Convert response message to dict format for next API call
-                assistant_msg: dict[str, Any] = {
-                    "role": "assistant",
-                    "content": response_message.content or "",
-                    "tool_calls": [
-                        {
-                            "id": tc.id,
-                            "type": "function",
-                            "function": {
-                                "name": tc.function.name,
-                                "arguments": tc.function.arguments,
-                            },
-                        }
-                        for tc in response_message.tool_calls
-                    ],
-                }
-                messages.append(assistant_msg)
+                if not pending_calls:
+                    # No more tool calls, the streamed text was the response
+                    if not content:
+                        yield NO_RESPONSE
+                    return
+
+                yield None
+                tool_calls = [pending_calls[index] for index in sorted(pending_calls)]
+                messages.append(
+                    {
+                        "role": "assistant",
+                        "content": "".join(content),
+                        "tool_calls": tool_calls,
+                    }
+                )
 
-                for tool_call in response_message.tool_calls:
-                    function_name = tool_call.function.name
-                    # Handle empty or malformed arguments
-                    try:
-                        function_args = (
-                            json.loads(tool_call.function.arguments)
-                            if tool_call.function.arguments
-                            else {}
+                # Writes run first, one at a time, so read-only calls issued
+                # in the same turn see their results; the reads run concurrently
+                results: dict[str, str] = {}
+                for tool_call in tool_calls:
+                    if tool_call["function"]["name"] in WRITE_TOOLS:
+                        results[tool_call["id"]] = await self._run_tool_call(
+                            tool_call, session_factory, user_id
                         )
-                    except json.JSONDecodeError:
-                        function_args = {}
-                    print(
-                        f"[CHAT] Executing tool: {function_name} with args: {function_args}",
-                        flush=True,
-                    )
-
-                    # Execute the tool
-                    tool_result = await self._execute_tool(
-                        function_name, function_args, session, user_id
-                    )
-                    print(f"[CHAT] Tool result length: {len(tool_result)}", flush=True)
+                reads = [
+                    tc for tc in tool_calls if tc["function"]["name"] not in WRITE_TOOLS
+                ]
+                read_results = await asyncio.gather(
+                    *(self._run_tool_call(tc, session_factory, user_id) for tc in reads)
+                )
+                results.update(
+                    zip((tc["id"] for tc in reads), read_results, strict=True)
+                )
 
+                for tool_call in tool_calls:
                     messages.append(
                         {
                             "role": "tool",
-                            "tool_call_id": tool_call.id,
-                            "content": tool_result,
+                            "tool_call_id": tool_call["id"],
+                            "content": results[tool_call["id"]],
                         }
                     )
 
             # If we hit max iterations, get a final response without tools
             print("[CHAT] Max iterations reached, getting final response", flush=True)
-            final_response = self.client.chat.completions.create(
-                model=self.model,
+            final_stream = await self.client.chat.completions.create(
+                model=model,
                 messages=messages,
                 max_tokens=4096,
+                stream=True,
             )
-            return (
-                final_response.choices[0].message.content
-                or "I couldn't generate a response."
-            )
+            async for piece in self._stream_answer(final_stream):
+                yield piece
 
         except Exception as e:
             print(f"[CHAT] Error: {str(e)}", flush=True)
             raise
+
+    async def chat(
+        self,
+        message: str,
+        session_factory: async_sessionmaker[AsyncSession],
+        user_id: int,
+        conversation_history: list[dict[str, str]] | None = None,
+    ) -> str:
+        """Process a chat message and return the complete response.
+
+        Collects the final answer from ``chat_stream``; see it for the
+        arguments. Text written in turns that called tools is left out.
+        """
+        pieces: list[str] = []
+        async for piece in self.chat_stream(
+            message, session_factory, user_id, conversation_history
+        ):
+            if piece is None:
+                pieces.clear()
+            else:
+                pieces.append(piece)
+        return "".join(pieces)
+
+
+@cache
+def get_agent() -> AIAgentService:
+    """Return the process-wide agent, creating it on first use.
+
+    Sharing one instance keeps the Groq client's connection pool alive
+    across chat requests.
+    """
+    return AIAgentService()
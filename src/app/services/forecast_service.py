@@ -4,16 +4,23 @@ Generates power generation forecasts using Open-Meteo weather forecasts
 and wind farm configuration from the database.
 """
 
+import asyncio
 import logging
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from functools import partial
+from operator import attrgetter
+from typing import Any
 
 import numpy as np
 import pandas as pd
-from sqlalchemy import delete, select
+from cachetools import TTLCache
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.database import copy_converters, copy_records, on_commit
 from app.models import (
     ForecastRun,
     GranularityEnum,
@@ -23,10 +30,82 @@ from app.models import (
     WindTurbine,
     WindTurbineFleet,
 )
+from app.services.power_curves import interpolate_power
 from app.services.weather_service import WeatherService
 
 logger = logging.getLogger(__name__)
 
+# Batches larger than this are loaded with COPY instead of a multi-row INSERT
+COPY_THRESHOLD = 1000
+
+# Columns written for each forecast record; id and created_at come from the
+# column defaults
+FORECAST_COLUMNS = (
+    "wind_farm_id",
+    "forecast_time",
+    "generation",
+    "granularity",
+    "wind_speed",
+    "wind_direction",
+    "temperature",
+    "weather_model",
+    "forecast_horizon_hours",
+)
+
+# A farm has one forecast value per time and granularity; regenerating
+# updates these rows in place
+FORECAST_CONFLICT_COLUMNS = ("wind_farm_id", "forecast_time", "granularity")
+FORECAST_UPDATE_COLUMNS = tuple(
+    c for c in FORECAST_COLUMNS if c not in FORECAST_CONFLICT_COLUMNS
+)
+
+
+# Open-Meteo forecasts update at most hourly, so a just-generated forecast is
+# served again for identical forecast requests within this window
+REQUEST_CACHE_TTL_SECONDS = 600
+REQUEST_CACHE_SIZE = 1024
+
+# Responses of the forecast request endpoint, keyed by user, farm and request
+# parameters; entries are dropped by forget_farm_forecasts()
+request_cache: TTLCache[tuple[int, int, int, int, str], list[Any]] = TTLCache(
+    maxsize=REQUEST_CACHE_SIZE, ttl=REQUEST_CACHE_TTL_SECONDS
+)
+
+
+def forget_farm_forecasts(wind_farm_id: int | None = None) -> None:
+    """Drop cached forecast request responses for a wind farm.
+
+    Call when a farm's forecasts are rewritten or its configuration changes.
+
+    Args:
+        wind_farm_id: Farm whose entries to drop. None drops every farm's
+            entries, for shared rows such as turbine models and locations.
+    """
+    if wind_farm_id is None:
+        request_cache.clear()
+        return
+    for key in [k for k in request_cache if k[1] == wind_farm_id]:
+        request_cache.pop(key, None)
+
+
+# Open-Meteo resolution used for each forecast granularity
+RESOLUTION_MINUTES = {
+    GranularityEnum.min_1: 15,
+    GranularityEnum.min_5: 15,
+    GranularityEnum.min_15: 15,
+    GranularityEnum.min_30: 60,
+    GranularityEnum.min_60: 60,
+}
+
+# Locations whose coordinates agree to this many decimals (~1 km) share one
+# weather download
+WEATHER_BUCKET_DECIMALS = 2
+
+# Concurrent Open-Meteo requests when prefetching weather for a batch
+WEATHER_FETCH_CONCURRENCY = 8
+
+WeatherKey = tuple[float, float, str, int, int]
+
 
 @dataclass
 class ForecastResult:
@@ -41,6 +120,41 @@ class ForecastResult:
     total_forecasted_generation_kwh: float
 
 
+@dataclass
+class FarmTimestep:
+    """Wind farm totals for one forecast timestamp."""
+
+    time: datetime
+    generation: float
+    wind_speed: float | None
+    wind_direction: float | None
+    temperature: float | None
+
+
+@dataclass
+class BatchForecastResult:
+    """Outcome of forecasting one wind farm within a batch."""
+
+    wind_farm_id: int
+    result: ForecastResult | None = None
+    error: str | None = None
+
+
+def _to_utc(timestamp: pd.Timestamp | datetime) -> datetime:
+    """Convert a weather timestamp to a timezone-aware datetime."""
+    if isinstance(timestamp, pd.Timestamp):
+        timestamp = timestamp.to_pydatetime()
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
+
+
+def _fleet_mean(total: np.ndarray, count: np.ndarray) -> list[float | None]:
+    """Average per timestamp over the fleets that had a value there."""
+    mean = np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+    return [
+        m if c else None for m, c in zip(mean.tolist(), count.tolist(), strict=True)
+    ]
+
+
 class ForecastService:
     """Service for generating wind power forecasts."""
 
@@ -52,6 +166,8 @@ class ForecastService:
         """
         self.db = db
         self.weather_service = WeatherService()
+        # Forecast weather per location bucket, shared across farms
+        self._weather_cache: dict[WeatherKey, pd.DataFrame | None] = {}
 
     async def generate_forecast(
         self,
@@ -59,6 +175,7 @@ class ForecastService:
         forecast_hours: int = 48,
         granularity: GranularityEnum = GranularityEnum.min_60,
         weather_model: str = "best_match",
+        run: ForecastRun | None = None,
     ) -> ForecastResult:
         """Generate power forecast for a wind farm.
 
@@ -67,20 +184,29 @@ class ForecastService:
             forecast_hours: Number of hours to forecast ahead.
             granularity: Time granularity for forecast points.
             weather_model: Open-Meteo weather model to use.
+            run: Previously queued run to record the outcome on. A new run is
+                created when omitted.
 
         Returns:
             ForecastResult with generation statistics.
         """
-        # Create forecast run record
-        run = ForecastRun(
-            wind_farm_id=wind_farm_id,
-            forecast_hours=forecast_hours,
-            weather_model=weather_model,
-            status="running",
-        )
-        self.db.add(run)
-        await self.db.flush()
-        await self.db.refresh(run)
+        # Cached responses for this farm go stale once the new rows commit
+        on_commit(self.db, partial(forget_farm_forecasts, wind_farm_id))
+
+        if run is None:
+            # Create forecast run record
+            run = ForecastRun(
+                wind_farm_id=wind_farm_id,
+                forecast_hours=forecast_hours,
+                weather_model=weather_model,
+                status="running",
+            )
+            self.db.add(run)
+            # The flush's INSERT ... RETURNING already brings back the id and
+            # the server-side started_at, so no refresh is needed
+            await self.db.flush()
+        else:
+            run.status = "running"
 
         try:
             # Load wind farm with fleets and turbines
@@ -96,21 +222,11 @@ class ForecastService:
             if not locations:
                 raise ValueError(f"No locations found for wind farm {wind_farm_id}")
 
-            # Convert granularity to minutes
-            granularity_to_minutes = {
-                GranularityEnum.min_1: 15,
-                GranularityEnum.min_5: 15,
-                GranularityEnum.min_15: 15,
-                GranularityEnum.min_30: 60,
-                GranularityEnum.min_60: 60,
-            }
-            resolution_minutes = granularity_to_minutes.get(granularity, 60)
-
             # Fetch forecast weather data for each location
             weather_data = await self._fetch_forecast_weather(
                 locations=locations,
                 forecast_days=max(1, forecast_hours // 24 + 1),
-                resolution_minutes=resolution_minutes,
+                resolution_minutes=RESOLUTION_MINUTES.get(granularity, 60),
                 weather_model=weather_model,
             )
 
@@ -123,9 +239,16 @@ class ForecastService:
                 forecast_hours=forecast_hours,
             )
 
-            # Delete old forecasts for this wind farm (keep only latest)
+            # Readers expect one resolution per period, so drop rows of other
+            # granularities in the new window; same-granularity rows are
+            # overwritten by the upsert below
             if forecast_records:
-                await self._delete_old_forecasts(wind_farm_id)
+                await self._delete_other_granularities(
+                    wind_farm_id=wind_farm_id,
+                    granularity=granularity,
+                    start_time=min(r.forecast_time for r in forecast_records),
+                    end_time=max(r.forecast_time for r in forecast_records),
+                )
 
             # Save new forecasts
             records_created = await self._save_forecasts(forecast_records)
@@ -133,7 +256,7 @@ class ForecastService:
             # Update run status
             run.status = "success"
             run.records_created = records_created
-            run.completed_at = datetime.now(UTC)
+            run.completed_at = func.clock_timestamp()
 
             # Calculate totals
             total_generation = sum(r.generation for r in forecast_records)
@@ -157,10 +280,85 @@ class ForecastService:
             # Update run with error
             run.status = "failed"
             run.error_message = str(e)[:1000]
-            run.completed_at = datetime.now(UTC)
+            run.completed_at = func.clock_timestamp()
             await self.db.flush()
             raise
 
+    async def generate_forecasts(
+        self,
+        wind_farm_ids: list[int],
+        user_id: int,
+        forecast_hours: int = 48,
+        granularity: GranularityEnum = GranularityEnum.min_60,
+        weather_model: str = "best_match",
+    ) -> list[BatchForecastResult]:
+        """Generate power forecasts for several wind farms.
+
+        Weather for every distinct location bucket is downloaded once, in
+        parallel, before the farms are processed. Each farm then runs in its
+        own SAVEPOINT so one failure does not discard the others.
+
+        Args:
+            wind_farm_ids: IDs of the wind farms to forecast.
+            user_id: Owner of the farms; farms of other users are reported
+                as not found.
+            forecast_hours: Number of hours to forecast ahead.
+            granularity: Time granularity for forecast points.
+            weather_model: Open-Meteo weather model to use.
+
+        Returns:
+            One BatchForecastResult per requested wind farm, in input order.
+        """
+        forecast_days = max(1, forecast_hours // 24 + 1)
+        resolution_minutes = RESOLUTION_MINUTES.get(granularity, 60)
+
+        existing = set(
+            (
+                await self.db.execute(
+                    select(WindFarm.id).where(
+                        WindFarm.id.in_(wind_farm_ids), WindFarm.user_id == user_id
+                    )
+                )
+            ).scalars()
+        )
+
+        result = await self.db.execute(
+            select(Location)
+            .join(WindTurbineFleet, WindTurbineFleet.location_id == Location.id)
+            .where(WindTurbineFleet.wind_farm_id.in_(existing))
+            .distinct()
+        )
+        await self._prefetch_forecast_weather(
+            locations=list(result.scalars()),
+            forecast_days=forecast_days,
+            resolution_minutes=resolution_minutes,
+            weather_model=weather_model,
+        )
+
+        results = []
+        for wind_farm_id in wind_farm_ids:
+            if wind_farm_id not in existing:
+                results.append(
+                    BatchForecastResult(
+                        wind_farm_id, error=f"Wind farm {wind_farm_id} not found"
+                    )
+                )
+                continue
+            try:
+                async with self.db.begin_nested():
+                    forecast = await self.generate_forecast(
+                        wind_farm_id=wind_farm_id,
+                        forecast_hours=forecast_hours,
+                        granularity=granularity,
+                        weather_model=weather_model,
+                    )
+                results.append(BatchForecastResult(wind_farm_id, result=forecast))
+            except Exception as e:
+                logger.warning(f"Forecast failed for wind farm {wind_farm_id}: {e}")
+                results.append(BatchForecastResult(wind_farm_id, error=str(e)))
+
+        return results
+
     async def generate_historical_forecast(
         self,
         wind_farm_id: int,
@@ -180,6 +378,7 @@ class ForecastService:
         Returns:
             ForecastResult with generation statistics.
         """
+        on_commit(self.db, partial(forget_farm_forecasts, wind_farm_id))
 
         # Create forecast run record
         run = ForecastRun(
@@ -240,19 +439,13 @@ class ForecastService:
                 )
 
             # Save records
-            records_created = 0
-            total_generation = 0.0
-            for record in forecast_records:
-                self.db.add(record)
-                records_created += 1
-                total_generation += record.generation
-
-            await self.db.flush()
+            records_created = await self._save_forecasts(forecast_records)
+            total_generation = sum(r.generation for r in forecast_records)
 
             # Update run status
             run.status = "completed"
             run.records_created = records_created
-            run.completed_at = datetime.now(UTC)
+            run.completed_at = func.clock_timestamp()
             await self.db.flush()
 
             forecast_times = [r.forecast_time for r in forecast_records]
@@ -274,7 +467,7 @@ class ForecastService:
         except Exception as e:
             run.status = "failed"
             run.error_message = str(e)[:1000]
-            run.completed_at = datetime.now(UTC)
+            run.completed_at = func.clock_timestamp()
             await self.db.flush()
             raise
 
@@ -302,19 +495,17 @@ class ForecastService:
                 model="best_match",
             )
 
-            if response.historical:
+            weather = response.historical
+            if weather:
                 df = pd.DataFrame(
-                    [
-                        {
-                            "time": r.time,
-                            "wind_speed": r.wind_speed,
-                            "wind_speed_100m": r.wind_speed_100m,
-                            "wind_direction": r.wind_direction,
-                            "temperature": r.temperature,
-                            "pressure": r.pressure,
-                        }
-                        for r in response.historical
-                    ]
+                    {
+                        "time": weather.time,
+                        "wind_speed": weather.wind_speed,
+                        "wind_speed_100m": weather.wind_speed_100m,
+                        "wind_direction": weather.wind_direction,
+                        "temperature": weather.temperature,
+                        "pressure": weather.pressure,
+                    }
                 )
                 df["time"] = pd.to_datetime(df["time"], utc=True)
                 weather_data[loc_id] = df
@@ -352,6 +543,93 @@ class ForecastService:
                 locations[fleet.location_id] = fleet.location
         return locations
 
+    @staticmethod
+    def _weather_key(
+        location: Location,
+        forecast_days: int,
+        resolution_minutes: int,
+        weather_model: str,
+    ) -> WeatherKey:
+        """Build the weather cache key for a location's bucket."""
+        return (
+            round(location.latitude, WEATHER_BUCKET_DECIMALS),
+            round(location.longitude, WEATHER_BUCKET_DECIMALS),
+            weather_model,
+            forecast_days,
+            resolution_minutes,
+        )
+
+    async def _prefetch_forecast_weather(
+        self,
+        locations: list[Location],
+        forecast_days: int,
+        resolution_minutes: int,
+        weather_model: str,
+    ) -> None:
+        """Download forecast weather for all location buckets concurrently."""
+        buckets: dict[WeatherKey, Location] = {}
+        for location in locations:
+            key = self._weather_key(
+                location, forecast_days, resolution_minutes, weather_model
+            )
+            if key not in self._weather_cache:
+                buckets.setdefault(key, location)
+
+        semaphore = asyncio.Semaphore(WEATHER_FETCH_CONCURRENCY)
+
+        async def fetch(location: Location) -> pd.DataFrame | None:
+            async with semaphore:
+                return await self._download_forecast_weather(
+                    location, forecast_days, resolution_minutes, weather_model
+                )
+
+        frames = await asyncio.gather(*(fetch(loc) for loc in buckets.values()))
+        self._weather_cache.update(zip(buckets, frames, strict=True))
+
+    async def _download_forecast_weather(
+        self,
+        location: Location,
+        forecast_days: int,
+        resolution_minutes: int,
+        weather_model: str,
+    ) -> pd.DataFrame | None:
+        """Fetch forecast weather for one location as a DataFrame."""
+        logger.info(
+            f"Fetching forecast weather for location {location.id}: "
+            f"({location.latitude}, {location.longitude}) using model {weather_model}"
+        )
+
+        response = await self.weather_service.get_weather_data(
+            latitude=location.latitude,
+            longitude=location.longitude,
+            past_days=0,
+            forecast_days=forecast_days,
+            resolution_minutes=resolution_minutes,
+            model=weather_model,
+        )
+
+        weather = response.forecast
+        if not weather:
+            logger.warning(f"No forecast weather data for location {location.id}")
+            return None
+
+        # Convert to DataFrame
+        df = pd.DataFrame(
+            {
+                "time": weather.time,
+                "wind_speed": weather.wind_speed,
+                "wind_speed_100m": weather.wind_speed_100m,
+                "wind_direction": weather.wind_direction,
+                "temperature": weather.temperature,
+                "pressure": weather.pressure,
+            }
+        )
+        df["time"] = pd.to_datetime(df["time"])
+        logger.info(
+            f"Got {len(df)} forecast weather records for location {location.id}"
+        )
+        return df
+
     async def _fetch_forecast_weather(
         self,
         locations: dict[int, Location],
@@ -359,46 +637,24 @@ class ForecastService:
         resolution_minutes: int,
         weather_model: str,
     ) -> dict[int, pd.DataFrame]:
-        """Fetch forecast weather data for all locations."""
-        weather_data = {}
-
-        for loc_id, location in locations.items():
-            logger.info(
-                f"Fetching forecast weather for location {loc_id}: "
-                f"({location.latitude}, {location.longitude}) using model {weather_model}"
-            )
+        """Fetch forecast weather data for all locations.
 
-            response = await self.weather_service.get_weather_data(
-                latitude=location.latitude,
-                longitude=location.longitude,
-                past_days=0,
-                forecast_days=forecast_days,
-                resolution_minutes=resolution_minutes,
-                model=weather_model,
-            )
+        Locations in the same bucket, or already fetched by this service, reuse
+        the cached download.
+        """
+        await self._prefetch_forecast_weather(
+            list(locations.values()), forecast_days, resolution_minutes, weather_model
+        )
 
-            if response.forecast:
-                # Convert to DataFrame
-                df = pd.DataFrame(
-                    [
-                        {
-                            "time": r.time,
-                            "wind_speed": r.wind_speed,
-                            "wind_speed_100m": r.wind_speed_100m,
-                            "wind_direction": r.wind_direction,
-                            "temperature": r.temperature,
-                            "pressure": r.pressure,
-                        }
-                        for r in response.forecast
-                    ]
+        weather_data = {}
+        for loc_id, location in locations.items():
+            df = self._weather_cache[
+                self._weather_key(
+                    location, forecast_days, resolution_minutes, weather_model
                 )
-                df["time"] = pd.to_datetime(df["time"])
+            ]
+            if df is not None:
                 weather_data[loc_id] = df
-                logger.info(
-                    f"Got {len(df)} forecast weather records for location {loc_id}"
-                )
-            else:
-                logger.warning(f"No forecast weather data for location {loc_id}")
 
         return weather_data
 
@@ -414,146 +670,24 @@ class ForecastService:
         forecasts = []
         now = datetime.now(UTC)
 
-        # Get all unique timestamps from weather data
-        all_times = set()
-        for df in weather_data.values():
-            all_times.update(df["time"].tolist())
-
-        all_times = sorted(all_times)
-
-        for timestamp in all_times:
-            # Convert to timezone-aware datetime
-            if isinstance(timestamp, pd.Timestamp):
-                ts = timestamp.to_pydatetime()
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=UTC)
-            else:
-                ts = timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
-
+        for step in self._aggregate_fleets(wind_farm, weather_data):
             # Skip if too far in future
-            hours_ahead = (ts - now).total_seconds() / 3600
+            hours_ahead = (step.time - now).total_seconds() / 3600
             if hours_ahead > forecast_hours or hours_ahead < 0:
                 continue
 
-            total_generation = 0.0
-            wind_speeds: list[float] = []
-            wind_directions: list[float] = []
-            temperatures: list[float] = []
-
-            for fleet in wind_farm.wind_turbine_fleets:
-                # Get weather for this fleet's location
-                if fleet.location_id not in weather_data:
-                    continue
-
-                weather_df = weather_data[fleet.location_id]
-                weather_row = weather_df[weather_df["time"] == timestamp]
-
-                if weather_row.empty:
-                    continue
-
-                # Get wind speed at hub height
-                wind_speed = weather_row["wind_speed_100m"].iloc[0]
-                if pd.isna(wind_speed):
-                    wind_speed = weather_row["wind_speed"].iloc[0]
-
-                if pd.isna(wind_speed):
-                    continue
-
-                # Collect weather data
-                wind_speeds.append(float(wind_speed))
-                wind_dir = weather_row["wind_direction"].iloc[0]
-                if not pd.isna(wind_dir):
-                    wind_directions.append(float(wind_dir))
-                temp = weather_row["temperature"].iloc[0]
-                if not pd.isna(temp):
-                    temperatures.append(float(temp))
-
-                # Calculate power output
-                turbine = fleet.wind_turbine
-                if turbine:
-                    power_kw = self._calculate_turbine_power(
-                        wind_speed=wind_speed,
-                        turbine=turbine,
-                        num_turbines=fleet.number_of_turbines,
-                    )
-                    total_generation += power_kw
-
-            # Calculate averages
-            avg_wind_speed = (
-                sum(wind_speeds) / len(wind_speeds) if wind_speeds else None
-            )
-            avg_wind_dir = (
-                sum(wind_directions) / len(wind_directions) if wind_directions else None
-            )
-            avg_temp = sum(temperatures) / len(temperatures) if temperatures else None
-
-            forecast = WindGenerationForecast(
-                wind_farm_id=wind_farm.id,
-                forecast_time=ts,
-                generation=round(total_generation, 2),
-                granularity=granularity,
-                wind_speed=round(avg_wind_speed, 2) if avg_wind_speed else None,
-                wind_direction=round(avg_wind_dir, 1) if avg_wind_dir else None,
-                temperature=round(avg_temp, 1) if avg_temp else None,
-                weather_model=weather_model,
-                forecast_horizon_hours=int(hours_ahead),
+            forecasts.append(
+                self._build_forecast(
+                    wind_farm.id,
+                    step,
+                    granularity,
+                    weather_model=weather_model,
+                    forecast_horizon_hours=int(hours_ahead),
+                )
             )
-            forecasts.append(forecast)
 
         return forecasts
 
-    def _calculate_turbine_power(
-        self,
-        wind_speed: float,
-        turbine: WindTurbine,
-        num_turbines: int = 1,
-    ) -> float:
-        """Calculate power output for a turbine at given wind speed."""
-        if wind_speed <= 0:
-            return 0.0
-
-        # Use power curve if available
-        if turbine.power_curve and turbine.power_curve.wind_speed_value_map:
-            power_curve = turbine.power_curve.wind_speed_value_map
-            power_kw = self._interpolate_power_curve(wind_speed, power_curve)
-        else:
-            # Simplified power calculation
-            cut_in = 3.0
-            rated_speed = 12.0
-            cut_out = 25.0
-            nominal_power_kw = turbine.nominal_power * 1000
-
-            if wind_speed < cut_in:
-                power_kw = 0.0
-            elif wind_speed < rated_speed:
-                power_kw = (
-                    nominal_power_kw
-                    * ((wind_speed - cut_in) / (rated_speed - cut_in)) ** 3
-                )
-            elif wind_speed <= cut_out:
-                power_kw = nominal_power_kw
-            else:
-                power_kw = 0.0
-
-        return power_kw * num_turbines
-
-    def _interpolate_power_curve(
-        self,
-        wind_speed: float,
-        power_curve: dict[str, float],
-    ) -> float:
-        """Interpolate power from power curve."""
-        points = [(float(k), v) for k, v in power_curve.items()]
-        points.sort(key=lambda x: x[0])
-
-        if not points:
-            return 0.0
-
-        speeds = [p[0] for p in points]
-        powers = [p[1] for p in points]
-
-        return float(np.interp(wind_speed, speeds, powers))
-
     async def _calculate_historical_forecasts(
         self,
         wind_farm: WindFarm,
@@ -561,85 +695,169 @@ class ForecastService:
         granularity: GranularityEnum,
     ) -> list[WindGenerationForecast]:
         """Calculate power forecasts for historical timestamps."""
-        forecasts = []
+        return [
+            self._build_forecast(
+                wind_farm.id,
+                step,
+                granularity,
+                weather_model="historical",
+                forecast_horizon_hours=0,  # Historical = 0 hours ahead
+            )
+            for step in self._aggregate_fleets(wind_farm, weather_data)
+        ]
 
-        # Get all unique timestamps from weather data
-        all_times = set()
-        for df in weather_data.values():
-            all_times.update(df["time"].tolist())
+    @staticmethod
+    def _build_forecast(
+        wind_farm_id: int,
+        step: FarmTimestep,
+        granularity: GranularityEnum,
+        weather_model: str,
+        forecast_horizon_hours: int,
+    ) -> WindGenerationForecast:
+        """Build the forecast record for one aggregated timestamp."""
+        return WindGenerationForecast(
+            wind_farm_id=wind_farm_id,
+            forecast_time=step.time,
+            generation=round(step.generation, 2),
+            granularity=granularity,
+            wind_speed=round(step.wind_speed, 2) if step.wind_speed else None,
+            wind_direction=(
+                round(step.wind_direction, 1) if step.wind_direction else None
+            ),
+            temperature=round(step.temperature, 1) if step.temperature else None,
+            weather_model=weather_model,
+            forecast_horizon_hours=forecast_horizon_hours,
+        )
 
-        all_times = sorted(all_times)
+    def _aggregate_fleets(
+        self,
+        wind_farm: WindFarm,
+        weather_data: dict[int, pd.DataFrame],
+    ) -> list[FarmTimestep]:
+        """Sum fleet power and average fleet weather for every weather timestamp.
 
-        for timestamp in all_times:
-            # Convert to timezone-aware datetime
-            if isinstance(timestamp, pd.Timestamp):
-                ts = timestamp.to_pydatetime()
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=UTC)
-            else:
-                ts = timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
-
-            total_generation = 0.0
-            wind_speeds: list[float] = []
-            wind_directions: list[float] = []
-            temperatures: list[float] = []
-
-            for fleet in wind_farm.wind_turbine_fleets:
-                if fleet.location_id not in weather_data:
-                    continue
-
-                weather_df = weather_data[fleet.location_id]
-                weather_row = weather_df[weather_df["time"] == timestamp]
-
-                if weather_row.empty:
-                    continue
-
-                wind_speed = weather_row["wind_speed_100m"].iloc[0]
-                if pd.isna(wind_speed):
-                    wind_speed = weather_row["wind_speed"].iloc[0]
-
-                if pd.isna(wind_speed):
-                    continue
-
-                wind_speeds.append(float(wind_speed))
-                wind_dir = weather_row["wind_direction"].iloc[0]
-                if not pd.isna(wind_dir):
-                    wind_directions.append(float(wind_dir))
-                temp = weather_row["temperature"].iloc[0]
-                if not pd.isna(temp):
-                    temperatures.append(float(temp))
-
-                turbine = fleet.wind_turbine
-                if turbine:
-                    power_kw = self._calculate_turbine_power(
-                        wind_speed=wind_speed,
-                        turbine=turbine,
-                        num_turbines=fleet.number_of_turbines,
-                    )
-                    total_generation += power_kw
+        Each fleet's weather is aligned to the combined time axis once and its
+        power is computed for all timestamps in a single array operation.
+        Fleets without a usable wind speed at a timestamp are left out of that
+        timestamp's totals and averages.
+
+        Args:
+            wind_farm: Wind farm with fleets, turbines and power curves loaded.
+            weather_data: Weather DataFrame per location id.
 
-            avg_wind_speed = (
-                sum(wind_speeds) / len(wind_speeds) if wind_speeds else None
+        Returns:
+            One FarmTimestep per distinct weather timestamp, in time order.
+        """
+        if not weather_data:
+            return []
+
+        times = pd.Index(
+            pd.concat([df["time"] for df in weather_data.values()]).unique()
+        ).sort_values()
+        size = len(times)
+
+        aligned: dict[int, pd.DataFrame] = {}
+        generation = np.zeros(size)
+        speed_sum, speed_count = np.zeros(size), np.zeros(size)
+        direction_sum, direction_count = np.zeros(size), np.zeros(size)
+        temperature_sum, temperature_count = np.zeros(size), np.zeros(size)
+
+        for fleet in wind_farm.wind_turbine_fleets:
+            # Get weather for this fleet's location
+            if fleet.location_id not in weather_data:
+                continue
+            if fleet.location_id not in aligned:
+                aligned[fleet.location_id] = (
+                    weather_data[fleet.location_id]
+                    .drop_duplicates("time")
+                    .set_index("time")
+                    .reindex(times)
+                )
+            weather = aligned[fleet.location_id]
+
+            # Wind speed at hub height, falling back to 10 m
+            wind_speed = (
+                weather["wind_speed_100m"]
+                .fillna(weather["wind_speed"])
+                .to_numpy(dtype=float)
             )
-            avg_wind_dir = (
-                sum(wind_directions) / len(wind_directions) if wind_directions else None
+            has_speed = ~np.isnan(wind_speed)
+            wind_speed = np.where(has_speed, wind_speed, 0.0)
+            speed_sum += wind_speed
+            speed_count += has_speed
+
+            direction = weather["wind_direction"].to_numpy(dtype=float)
+            has_direction = has_speed & ~np.isnan(direction)
+            direction_sum += np.where(has_direction, direction, 0.0)
+            direction_count += has_direction
+
+            temperature = weather["temperature"].to_numpy(dtype=float)
+            has_temperature = has_speed & ~np.isnan(temperature)
+            temperature_sum += np.where(has_temperature, temperature, 0.0)
+            temperature_count += has_temperature
+
+            # Calculate power output
+            turbine = fleet.wind_turbine
+            if turbine:
+                generation += self._calculate_turbine_power(
+                    wind_speed=wind_speed,
+                    turbine=turbine,
+                    num_turbines=fleet.number_of_turbines,
+                )
+
+        return [
+            FarmTimestep(
+                time=_to_utc(time),
+                generation=total,
+                wind_speed=speed,
+                wind_direction=direction,
+                temperature=temperature,
             )
-            avg_temp = sum(temperatures) / len(temperatures) if temperatures else None
+            for time, total, speed, direction, temperature in zip(
+                times,
+                generation.tolist(),
+                _fleet_mean(speed_sum, speed_count),
+                _fleet_mean(direction_sum, direction_count),
+                _fleet_mean(temperature_sum, temperature_count),
+                strict=True,
+            )
+        ]
 
-            forecast = WindGenerationForecast(
-                wind_farm_id=wind_farm.id,
-                forecast_time=ts,
-                generation=round(total_generation, 2),
-                granularity=granularity,
-                wind_speed=round(avg_wind_speed, 2) if avg_wind_speed else None,
-                wind_direction=round(avg_wind_dir, 1) if avg_wind_dir else None,
-                temperature=round(avg_temp, 1) if avg_temp else None,
-                weather_model="historical",
-                forecast_horizon_hours=0,  # Historical = 0 hours ahead
+    def _calculate_turbine_power(
+        self,
+        wind_speed: np.ndarray,
+        turbine: WindTurbine,
+        num_turbines: int = 1,
+    ) -> np.ndarray:
+        """Calculate power output for a turbine at each given wind speed."""
+        # Use power curve if available
+        if turbine.power_curve and turbine.power_curve.wind_speeds:
+            power_kw = interpolate_power(wind_speed, turbine.power_curve)
+        else:
+            # Simplified power calculation
+            cut_in = 3.0
+            rated_speed = 12.0
+            cut_out = 25.0
+            nominal_power_kw = turbine.nominal_power * 1000
+
+            power_kw = np.piecewise(
+                wind_speed,
+                [
+                    wind_speed < cut_in,
+                    (wind_speed >= cut_in) & (wind_speed < rated_speed),
+                    (wind_speed >= rated_speed) & (wind_speed <= cut_out),
+                ],
+                [
+                    0.0,
+                    lambda v: (
+                        nominal_power_kw * ((v - cut_in) / (rated_speed - cut_in)) ** 3
+                    ),
+                    nominal_power_kw,
+                    0.0,
+                ],
             )
-            forecasts.append(forecast)
 
-        return forecasts
+        return np.where(wind_speed > 0, power_kw, 0.0) * num_turbines
 
     async def _delete_forecasts_in_range(
         self,
@@ -664,17 +882,27 @@ class ForecastService:
 
         return deleted_count
 
-    async def _delete_old_forecasts(self, wind_farm_id: int) -> int:
-        """Delete old forecasts for a wind farm."""
+    async def _delete_other_granularities(
+        self,
+        wind_farm_id: int,
+        granularity: GranularityEnum,
+        start_time: datetime,
+        end_time: datetime,
+    ) -> int:
+        """Delete a farm's forecasts of other granularities within a time range."""
         stmt = delete(WindGenerationForecast).where(
-            WindGenerationForecast.wind_farm_id == wind_farm_id
+            WindGenerationForecast.wind_farm_id == wind_farm_id,
+            WindGenerationForecast.forecast_time >= start_time,
+            WindGenerationForecast.forecast_time <= end_time,
+            WindGenerationForecast.granularity != granularity,
         )
         result = await self.db.execute(stmt)
         deleted_count = result.rowcount
 
         if deleted_count > 0:
             logger.info(
-                f"Deleted {deleted_count} old forecasts for wind farm {wind_farm_id}"
+                f"Deleted {deleted_count} forecasts of other granularities for "
+                f"wind farm {wind_farm_id} from {start_time} to {end_time}"
             )
 
         return deleted_count
@@ -683,12 +911,65 @@ class ForecastService:
         self,
         forecasts: list[WindGenerationForecast],
     ) -> int:
-        """Save forecast records to database."""
+        """Upsert forecast records in a single batch.
+
+        Rows are sorted by (wind_farm_id, forecast_time) so index insertions
+        stay sequential, then written with one multi-row INSERT ... ON CONFLICT
+        DO UPDATE. Large batches are first loaded into a temporary staging
+        table with COPY and upserted from there.
+        """
         if not forecasts:
             return 0
 
-        self.db.add_all(forecasts)
-        await self.db.flush()
+        forecasts = sorted(forecasts, key=attrgetter("wind_farm_id", "forecast_time"))
+        get_values = attrgetter(*FORECAST_COLUMNS)
+
+        if len(forecasts) > COPY_THRESHOLD:
+            converters = copy_converters(
+                WindGenerationForecast.__table__, FORECAST_COLUMNS
+            )
+            records = [
+                [
+                    convert(v)
+                    for convert, v in zip(converters, get_values(forecast), strict=True)
+                ]
+                for forecast in forecasts
+            ]
+
+            table = WindGenerationForecast.__tablename__
+            staging = f"{table}_staging"
+            columns = ", ".join(FORECAST_COLUMNS)
+            await self.db.execute(
+                text(
+                    f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                    f"(LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+            )
+            await copy_records(self.db, staging, FORECAST_COLUMNS, records)
+            await self.db.execute(
+                text(
+                    f"INSERT INTO {table} ({columns}) "
+                    f"SELECT {columns} FROM {staging} "
+                    f"ON CONFLICT ({', '.join(FORECAST_CONFLICT_COLUMNS)}) DO UPDATE SET "
+                    + ", ".join(f"{c} = EXCLUDED.{c}" for c in FORECAST_UPDATE_COLUMNS)
+                    + ", created_at = now()"
+                )
+            )
+            await self.db.execute(text(f"TRUNCATE {staging}"))
+        else:
+            stmt = insert(WindGenerationForecast)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=FORECAST_CONFLICT_COLUMNS,
+                set_={c: stmt.excluded[c] for c in FORECAST_UPDATE_COLUMNS}
+                | {"created_at": func.now()},
+            )
+            await self.db.execute(
+                stmt,
+                [
+                    dict(zip(FORECAST_COLUMNS, get_values(forecast), strict=True))
+                    for forecast in forecasts
+                ],
+            )
 
         logger.info(f"Saved {len(forecasts)} forecast records")
         return len(forecasts)
@@ -0,0 +1,17 @@
+"""Power curve evaluation shared by the generation services."""
+
+import numpy as np
+
+from app.models import PowerCurve
+
+
+def interpolate_power(wind_speed: np.ndarray, power_curve: PowerCurve) -> np.ndarray:
+    """Interpolate power from a power curve at each wind speed.
+
+    The curve's columns are already sorted by wind speed, so the whole array
+    is evaluated in one ``numpy.interp`` call.
+    """
+    if not power_curve.wind_speeds:
+        return np.zeros_like(wind_speed)
+
+    return np.interp(wind_speed, power_curve.wind_speeds, power_curve.power_values)
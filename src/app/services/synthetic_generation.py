@@ -7,13 +7,15 @@ to generate synthetic power generation data for wind farms.
 import logging
 from dataclasses import dataclass
 from datetime import UTC, datetime
+from typing import Any
 
 import numpy as np
 import pandas as pd
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.database import copy_converters, copy_records
 from app.models import (
     GranularityEnum,
     Location,
@@ -22,10 +24,14 @@ from app.models import (
     WindTurbine,
     WindTurbineFleet,
 )
+from app.services.power_curves import interpolate_power
 from app.services.weather_service import WeatherService
 
 logger = logging.getLogger(__name__)
 
+# Batches of synthetic records at least this large are loaded with COPY
+COPY_THRESHOLD = 1000
+
 
 @dataclass
 class SyntheticGenerationConfig:
@@ -122,7 +128,7 @@ class SyntheticGenerationService:
 
         # Get time range for deletion
         if generation_records:
-            timestamps = [r.timestamp for r in generation_records]
+            timestamps = [r["timestamp"] for r in generation_records]
             start_time = min(timestamps)
             end_time = max(timestamps)
 
@@ -137,8 +143,8 @@ class SyntheticGenerationService:
         records_created = await self._save_records(generation_records)
 
         # Calculate totals
-        total_generation = sum(r.generation for r in generation_records)
-        timestamps = [r.timestamp for r in generation_records]
+        total_generation = sum(r["generation"] for r in generation_records)
+        timestamps = [r["timestamp"] for r in generation_records]
 
         return SyntheticGenerationResult(
             wind_farm_id=wind_farm_id,
@@ -198,20 +204,18 @@ class SyntheticGenerationService:
                 resolution_minutes=resolution_minutes,
             )
 
-            if response.historical:
+            weather = response.historical
+            if weather:
                 # Convert to DataFrame
                 df = pd.DataFrame(
-                    [
-                        {
-                            "time": r.time,
-                            "wind_speed": r.wind_speed,
-                            "wind_speed_100m": r.wind_speed_100m,
-                            "wind_direction": r.wind_direction,
-                            "temperature": r.temperature,
-                            "pressure": r.pressure,
-                        }
-                        for r in response.historical
-                    ]
+                    {
+                        "time": weather.time,
+                        "wind_speed": weather.wind_speed,
+                        "wind_speed_100m": weather.wind_speed_100m,
+                        "wind_direction": weather.wind_direction,
+                        "temperature": weather.temperature,
+                        "pressure": weather.pressure,
+                    }
                 )
                 df["time"] = pd.to_datetime(df["time"])
                 weather_data[loc_id] = df
@@ -227,144 +231,184 @@ class SyntheticGenerationService:
         weather_data: dict[int, pd.DataFrame],
         granularity: GranularityEnum,
         config: SyntheticGenerationConfig,
-    ) -> list[WindFarmGenerationRecord]:
-        """Calculate power generation for each timestamp."""
-        records = []
+    ) -> list[dict[str, Any]]:
+        """Calculate power generation for each timestamp.
 
-        # Get all unique timestamps from weather data
-        all_times = set()
-        for df in weather_data.values():
-            all_times.update(df["time"].tolist())
-
-        all_times = sorted(all_times)
-
-        # Track outages for each fleet
-        fleet_outage_remaining: dict[int, int] = {}
-
-        for timestamp in all_times:
-            total_generation = 0.0
-            fleet_statuses = {}
-            # Track weather data (average across all fleets for this timestamp)
-            wind_speeds: list[float] = []
-            wind_directions: list[float] = []
-            temperatures: list[float] = []
-
-            for fleet in wind_farm.wind_turbine_fleets:
-                # Check for random outages
-                if config.random_outages:
-                    # Decrement outage counter
-                    if (
-                        fleet.id in fleet_outage_remaining
-                        and fleet_outage_remaining[fleet.id] > 0
-                    ):
-                        fleet_outage_remaining[fleet.id] -= 1
-                        fleet_statuses[str(fleet.id)] = "off"
-                        continue
-                    # Random chance of new outage
-                    if np.random.random() < config.outage_probability:
-                        fleet_outage_remaining[fleet.id] = config.outage_duration_hours
-                        fleet_statuses[str(fleet.id)] = "off"
-                        continue
-
-                # Get weather for this fleet's location
-                if fleet.location_id not in weather_data:
-                    fleet_statuses[str(fleet.id)] = "off"
-                    continue
-
-                weather_df = weather_data[fleet.location_id]
-                weather_row = weather_df[weather_df["time"] == timestamp]
-
-                if weather_row.empty:
-                    fleet_statuses[str(fleet.id)] = "off"
-                    continue
+        Each fleet's weather is aligned to the combined time axis once, and its
+        power, noise and outages are computed for all timestamps as arrays.
+        Rows are returned as column dicts for WindFarmGenerationRecord.
+        """
+        if not weather_data:
+            return []
 
+        # Get all unique timestamps from weather data
+        times = pd.Index(
+            pd.concat([df["time"] for df in weather_data.values()]).unique()
+        ).sort_values()
+        size = len(times)
+        rng = np.random.default_rng()
+
+        aligned: dict[int, pd.DataFrame] = {}
+        hub_speeds: dict[int, np.ndarray] = {}
+        # Power of a single turbine per (turbine, location): fleets sharing a
+        # turbine model and site evaluate the power curve only once
+        unit_power: dict[tuple[int, int], np.ndarray] = {}
+        generation = np.zeros(size)
+        speed_sum, speed_count = np.zeros(size), np.zeros(size)
+        direction_sum, direction_count = np.zeros(size), np.zeros(size)
+        temperature_sum, temperature_count = np.zeros(size), np.zeros(size)
+        fleet_on: dict[str, np.ndarray] = {}
+
+        for fleet in wind_farm.wind_turbine_fleets:
+            fleet_on[str(fleet.id)] = np.zeros(size, dtype=bool)
+
+            # Get weather for this fleet's location
+            if fleet.location_id not in weather_data:
+                continue
+            if fleet.location_id not in aligned:
+                weather = (
+                    weather_data[fleet.location_id]
+                    .drop_duplicates("time")
+                    .set_index("time")
+                    .reindex(times)
+                )
+                aligned[fleet.location_id] = weather
                 # Get wind speed at hub height (use 100m or 10m)
-                wind_speed = weather_row["wind_speed_100m"].iloc[0]
-                if pd.isna(wind_speed):
-                    wind_speed = weather_row["wind_speed"].iloc[0]
-
-                if pd.isna(wind_speed):
-                    fleet_statuses[str(fleet.id)] = "off"
-                    continue
-
-                # Collect weather data
-                wind_speeds.append(float(wind_speed))
-                wind_dir = weather_row["wind_direction"].iloc[0]
-                if not pd.isna(wind_dir):
-                    wind_directions.append(float(wind_dir))
-                temp = weather_row["temperature"].iloc[0]
-                if not pd.isna(temp):
-                    temperatures.append(float(temp))
-
-                # Calculate power output
-                turbine = fleet.wind_turbine
-                if turbine:
-                    power_kw = self._calculate_turbine_power(
-                        wind_speed=wind_speed,
-                        turbine=turbine,
-                        num_turbines=fleet.number_of_turbines,
-                    )
-
-                    # Add noise if configured
-                    if config.add_noise and power_kw > 0:
-                        noise_std = power_kw * (config.noise_std_percent / 100.0)
-                        noise = np.random.normal(0, noise_std)
-                        power_kw = max(0, power_kw + noise)  # Ensure non-negative
-
-                    total_generation += power_kw
-                    fleet_statuses[str(fleet.id)] = "on" if power_kw > 0 else "off"
-                else:
-                    fleet_statuses[str(fleet.id)] = "off"
-
-            # Create record - convert pandas Timestamp to timezone-aware datetime
-            if isinstance(timestamp, pd.Timestamp):
-                ts = timestamp.to_pydatetime()
-                if ts.tzinfo is None:
-                    ts = ts.replace(tzinfo=UTC)
-            else:
-                ts = timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=UTC)
-
-            # Calculate average weather values
-            avg_wind_speed = (
-                sum(wind_speeds) / len(wind_speeds) if wind_speeds else None
+                hub_speeds[fleet.location_id] = (
+                    weather["wind_speed_100m"]
+                    .fillna(weather["wind_speed"])
+                    .to_numpy(dtype=float)
+                )
+            weather = aligned[fleet.location_id]
+            hub_speed = hub_speeds[fleet.location_id]
+
+            available = ~np.isnan(hub_speed)
+            if config.random_outages:
+                available &= ~self._simulate_outages(size, config, rng)
+            wind_speed = np.where(available, hub_speed, 0.0)
+
+            # Collect weather data
+            speed_sum += wind_speed
+            speed_count += available
+
+            direction = weather["wind_direction"].to_numpy(dtype=float)
+            has_direction = available & ~np.isnan(direction)
+            direction_sum += np.where(has_direction, direction, 0.0)
+            direction_count += has_direction
+
+            temperature = weather["temperature"].to_numpy(dtype=float)
+            has_temperature = available & ~np.isnan(temperature)
+            temperature_sum += np.where(has_temperature, temperature, 0.0)
+            temperature_count += has_temperature
+
+            # Calculate power output
+            turbine = fleet.wind_turbine
+            if not turbine:
+                continue
+            key = (turbine.id, fleet.location_id)
+            if key not in unit_power:
+                unit_power[key] = self._calculate_turbine_power(
+                    wind_speed=np.nan_to_num(hub_speed), turbine=turbine
+                )
+            power_kw = (
+                np.where(available, unit_power[key], 0.0) * fleet.number_of_turbines
             )
-            avg_wind_dir = (
-                sum(wind_directions) / len(wind_directions) if wind_directions else None
+
+            # Add noise if configured, keeping output non-negative
+            if config.add_noise:
+                noise = rng.normal(0.0, power_kw * (config.noise_std_percent / 100.0))
+                power_kw = np.maximum(power_kw + noise, 0.0)
+
+            generation += power_kw
+            fleet_on[str(fleet.id)] = power_kw > 0
+
+        # Calculate average weather values
+        avg_wind_speeds = self._fleet_mean(speed_sum, speed_count).tolist()
+        avg_wind_dirs = self._fleet_mean(direction_sum, direction_count).tolist()
+        avg_temps = self._fleet_mean(temperature_sum, temperature_count).tolist()
+        # One status tuple per timestamp, in fleet_ids order, so each row's
+        # fleet_statuses dict is built with a single zip
+        fleet_ids = list(fleet_on)
+        statuses = (
+            zip(
+                *(np.where(on, "on", "off").tolist() for on in fleet_on.values()),
+                strict=True,
             )
-            avg_temp = sum(temperatures) / len(temperatures) if temperatures else None
-
-            record = WindFarmGenerationRecord(
-                wind_farm_id=wind_farm.id,
-                timestamp=ts,
-                generation=round(total_generation, 2),
-                granularity=granularity,
-                fleet_statuses=fleet_statuses,
-                is_synthetic=True,
-                wind_speed=round(avg_wind_speed, 2) if avg_wind_speed else None,
-                wind_direction=round(avg_wind_dir, 1) if avg_wind_dir else None,
-                temperature=round(avg_temp, 1) if avg_temp else None,
+            if fleet_ids
+            else [()] * size
+        )
+
+        records = []
+        for i, (timestamp, fleet_status) in enumerate(
+            zip(times, statuses, strict=True)
+        ):
+            # Convert pandas Timestamp to timezone-aware datetime
+            ts = timestamp.to_pydatetime()
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=UTC)
+
+            avg_wind_speed = avg_wind_speeds[i]
+            avg_wind_dir = avg_wind_dirs[i]
+            avg_temp = avg_temps[i]
+
+            records.append(
+                {
+                    "wind_farm_id": wind_farm.id,
+                    "timestamp": ts,
+                    "generation": round(generation[i].item(), 2),
+                    "granularity": granularity,
+                    "fleet_statuses": dict(zip(fleet_ids, fleet_status, strict=True)),
+                    "is_synthetic": True,
+                    "wind_speed": round(avg_wind_speed, 2) if avg_wind_speed else None,
+                    "wind_direction": round(avg_wind_dir, 1) if avg_wind_dir else None,
+                    "temperature": round(avg_temp, 1) if avg_temp else None,
+                }
             )
-            records.append(record)
 
         return records
 
+    @staticmethod
+    def _fleet_mean(total: np.ndarray, count: np.ndarray) -> np.ndarray:
+        """Average per timestamp over contributing fleets (0 where there were none)."""
+        return np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+
+    @staticmethod
+    def _simulate_outages(
+        size: int,
+        config: SyntheticGenerationConfig,
+        rng: np.random.Generator,
+    ) -> np.ndarray:
+        """Mark the timestamps at which a fleet is in a random outage.
+
+        An outage starts with probability ``outage_probability`` at any step the
+        fleet is running and keeps it off for ``outage_duration_hours`` further
+        steps.
+        """
+        starts = (rng.random(size) < config.outage_probability).tolist()
+        outage = np.zeros(size, dtype=bool)
+        remaining = 0
+        for i, start in enumerate(starts):
+            if remaining > 0:
+                remaining -= 1
+                outage[i] = True
+            elif start:
+                remaining = config.outage_duration_hours
+                outage[i] = True
+        return outage
+
     def _calculate_turbine_power(
         self,
-        wind_speed: float,
+        wind_speed: np.ndarray,
         turbine: WindTurbine,
         num_turbines: int = 1,
-    ) -> float:
-        """Calculate power output for a turbine at given wind speed.
+    ) -> np.ndarray:
+        """Calculate power output for a turbine at each given wind speed.
 
         Uses power curve if available, otherwise uses simplified model.
         """
-        if wind_speed <= 0:
-            return 0.0
-
         # Use power curve if available
-        if turbine.power_curve and turbine.power_curve.wind_speed_value_map:
-            power_curve = turbine.power_curve.wind_speed_value_map
-            power_kw = self._interpolate_power_curve(wind_speed, power_curve)
+        if turbine.power_curve and turbine.power_curve.wind_speeds:
+            power_kw = interpolate_power(wind_speed, turbine.power_curve)
         else:
             # Simplified power calculation based on nominal power
             # Using typical wind turbine characteristics
@@ -373,39 +417,25 @@ class SyntheticGenerationService:
             cut_out = 25.0  # m/s
             nominal_power_kw = turbine.nominal_power * 1000  # MW to kW
 
-            if wind_speed < cut_in:
-                power_kw = 0.0
-            elif wind_speed < rated_speed:
-                # Cubic relationship in this region
-                power_kw = (
-                    nominal_power_kw
-                    * ((wind_speed - cut_in) / (rated_speed - cut_in)) ** 3
-                )
-            elif wind_speed <= cut_out:
-                power_kw = nominal_power_kw
-            else:
-                power_kw = 0.0  # Shutdown above cut-out
-
-        return power_kw * num_turbines
-
-    def _interpolate_power_curve(
-        self,
-        wind_speed: float,
-        power_curve: dict[str, float],
-    ) -> float:
-        """Interpolate power from power curve."""
-        # Convert keys to float and sort
-        points = [(float(k), v) for k, v in power_curve.items()]
-        points.sort(key=lambda x: x[0])
-
-        if not points:
-            return 0.0
-
-        speeds = [p[0] for p in points]
-        powers = [p[1] for p in points]
+            power_kw = np.piecewise(
+                wind_speed,
+                [
+                    wind_speed < cut_in,
+                    (wind_speed >= cut_in) & (wind_speed < rated_speed),
+                    (wind_speed >= rated_speed) & (wind_speed <= cut_out),
+                ],
+                [
+                    0.0,
+                    # Cubic relationship in this region
+                    lambda v: (
+                        nominal_power_kw * ((v - cut_in) / (rated_speed - cut_in)) ** 3
+                    ),
+                    nominal_power_kw,
+                    0.0,  # Shutdown above cut-out
+                ],
+            )
 
-        # Use numpy interpolation
-        return float(np.interp(wind_speed, speeds, powers))
+        return np.where(wind_speed > 0, power_kw, 0.0) * num_turbines
 
     async def _delete_existing_synthetic_records(
         self,
@@ -443,14 +473,34 @@ class SyntheticGenerationService:
 
     async def _save_records(
         self,
-        records: list[WindFarmGenerationRecord],
+        records: list[dict[str, Any]],
     ) -> int:
-        """Save generation records to database."""
+        """Save generation records to database.
+
+        Rows go through Core inserts, so no ORM instances are built. Small
+        batches use a multi-row INSERT; large ones are streamed in with COPY.
+        """
         if not records:
             return 0
 
-        self.db.add_all(records)
-        await self.db.flush()
+        table = WindFarmGenerationRecord.__table__
+        if len(records) < COPY_THRESHOLD:
+            await self.db.execute(insert(table), records)
+        else:
+            columns = list(records[0])
+            converters = copy_converters(table, columns)
+            await copy_records(
+                self.db,
+                table.name,
+                columns,
+                (
+                    [
+                        convert(record[c])
+                        for convert, c in zip(converters, columns, strict=True)
+                    ]
+                    for record in records
+                ),
+            )
 
         logger.info(f"Saved {len(records)} synthetic generation records")
         return len(records)
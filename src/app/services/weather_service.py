@@ -1,44 +1,135 @@
 """Weather service for Open-Meteo API integration."""
 
+import asyncio
 import logging
-from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+import weakref
+from dataclasses import dataclass, field, fields, replace
+from datetime import date, datetime, timedelta
+from typing import Any
 
 import httpx
+import msgspec
+import numpy as np
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
 
+def _empty_times() -> np.ndarray:
+    return np.empty(0, dtype="datetime64[s]")
+
+
+def _empty_values() -> np.ndarray:
+    return np.empty(0, dtype=np.float32)
+
+
 @dataclass
-class WeatherRecord:
-    """Single weather data point."""
-
-    time: datetime
-    temperature: float | None = None
-    temperature_80m: float | None = None
-    wind_speed: float | None = None
-    wind_speed_80m: float | None = None
-    wind_speed_100m: float | None = None
-    wind_direction: float | None = None
-    wind_direction_80m: float | None = None
-    wind_direction_100m: float | None = None
-    pressure: float | None = None
-    precipitation: float | None = None
-    cloud_cover: float | None = None
+class WeatherColumns:
+    """Weather time series stored column-wise, one NumPy array per variable.
+
+    Times are naive ``datetime64[s]`` in the location's local time. Values
+    are float32, which is well beyond the precision Open-Meteo reports, with
+    NaN where missing. Arrays are read-only since cached columns are shared
+    between callers.
+    """
+
+    time: np.ndarray = field(default_factory=_empty_times)
+    temperature: np.ndarray = field(default_factory=_empty_values)
+    temperature_80m: np.ndarray = field(default_factory=_empty_values)
+    wind_speed: np.ndarray = field(default_factory=_empty_values)
+    wind_speed_80m: np.ndarray = field(default_factory=_empty_values)
+    wind_speed_100m: np.ndarray = field(default_factory=_empty_values)
+    wind_direction: np.ndarray = field(default_factory=_empty_values)
+    wind_direction_80m: np.ndarray = field(default_factory=_empty_values)
+    wind_direction_100m: np.ndarray = field(default_factory=_empty_values)
+    pressure: np.ndarray = field(default_factory=_empty_values)
+    precipitation: np.ndarray = field(default_factory=_empty_values)
+    cloud_cover: np.ndarray = field(default_factory=_empty_values)
+
+    def __post_init__(self) -> None:
+        for column in fields(self):
+            getattr(self, column.name).flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def records(self) -> list[dict[str, Any]]:
+        """Materialize one dict per timestamp, with None for missing values."""
+        names = [column.name for column in fields(self)]
+        columns = [self.time.tolist()]
+        for name in names[1:]:
+            values = getattr(self, name)
+            values = np.round(values.astype(np.float64), RECORD_DECIMALS)
+            columns.append(np.where(np.isnan(values), None, values).tolist())
+        return [
+            dict(zip(names, row, strict=True)) for row in zip(*columns, strict=True)
+        ]
 
 
 @dataclass
 class WeatherResponse:
     """Weather API response."""
 
-    historical: list[WeatherRecord] = field(default_factory=list)
-    forecast: list[WeatherRecord] = field(default_factory=list)
+    historical: WeatherColumns = field(default_factory=WeatherColumns)
+    forecast: WeatherColumns = field(default_factory=WeatherColumns)
     model_used: str | None = None
     resolution_info: str | None = None
     latitude: float | None = None
     longitude: float | None = None
 
 
+class OpenMeteoSeries(msgspec.Struct):
+    """One time series block ("hourly" or "minutely_15") of a response.
+
+    Variables missing from the response decode as empty lists.
+    """
+
+    time: list[str] = []
+    temperature_2m: list[float | None] = []
+    temperature_80m: list[float | None] = []
+    wind_speed_10m: list[float | None] = []
+    wind_speed_80m: list[float | None] = []
+    wind_speed_100m: list[float | None] = []
+    wind_direction_10m: list[float | None] = []
+    wind_direction_80m: list[float | None] = []
+    wind_direction_100m: list[float | None] = []
+    pressure_msl: list[float | None] = []
+    precipitation: list[float | None] = []
+    cloud_cover: list[float | None] = []
+
+
+class OpenMeteoResponse(msgspec.Struct):
+    """Open-Meteo forecast or archive response; other keys are ignored."""
+
+    hourly: OpenMeteoSeries | None = None
+    minutely_15: OpenMeteoSeries | None = None
+
+
+# Decodes response bodies straight into the structs above, without building
+# an intermediate dict per response
+_response_decoder = msgspec.json.Decoder(OpenMeteoResponse)
+
+# Decimals kept when float32 values are widened for output, which drops
+# float32 noise (12.3 -> 12.300000190734863) while keeping every digit
+# Open-Meteo reports
+RECORD_DECIMALS = 3
+
+# Open-Meteo variable read into each WeatherColumns value column
+_SERIES_VARIABLES: dict[str, str] = {
+    "temperature": "temperature_2m",
+    "temperature_80m": "temperature_80m",
+    "wind_speed": "wind_speed_10m",
+    "wind_speed_80m": "wind_speed_80m",
+    "wind_speed_100m": "wind_speed_100m",
+    "wind_direction": "wind_direction_10m",
+    "wind_direction_80m": "wind_direction_80m",
+    "wind_direction_100m": "wind_direction_100m",
+    "pressure": "pressure_msl",
+    "precipitation": "precipitation",
+    "cloud_cover": "cloud_cover",
+}
+
+
 # Available weather models in Open-Meteo
 WEATHER_MODELS: dict[str, str] = {
     "icon_d2": "ICON-D2 (15min, Central Europe)",
@@ -54,6 +145,80 @@ WEATHER_MODELS: dict[str, str] = {
 # Resolution options (minutes)
 RESOLUTION_OPTIONS: list[int] = [15, 30, 60]
 
+# Forecasts are refreshed by Open-Meteo several times a day, so cached
+# forecast responses are kept for 15 minutes
+FORECAST_CACHE_TTL_SECONDS = 15 * 60
+FORECAST_CACHE_SIZE = 1024
+
+# Archive data for a given day does not change, so it is kept for a day
+HISTORICAL_CACHE_TTL_SECONDS = 24 * 60 * 60
+HISTORICAL_CACHE_SIZE = 4096
+
+# Coordinates are rounded to this many decimals (~100 m) for cache keys
+CACHE_COORDINATE_DECIMALS = 3
+
+# Upper bound on an Open-Meteo response body; larger responses are dropped
+MAX_RESPONSE_BYTES = 20 * 1024 * 1024
+
+_forecast_cache: TTLCache[
+    tuple[float, float, str, int, int],
+    tuple[WeatherColumns, str | None, str | None],
+] = TTLCache(maxsize=FORECAST_CACHE_SIZE, ttl=FORECAST_CACHE_TTL_SECONDS)
+_historical_cache: TTLCache[tuple[float, float, str, int], WeatherColumns] = TTLCache(
+    maxsize=HISTORICAL_CACHE_SIZE, ttl=HISTORICAL_CACHE_TTL_SECONDS
+)
+
+# Connections kept open to the Open-Meteo hosts; HTTP/2 multiplexes the
+# concurrent per-location requests of a forecast run over them
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# Connection attempts retried by the transport before a request fails
+HTTP_CONNECT_RETRIES = 2
+
+_client: httpx.AsyncClient | None = None
+
+# One lock per cache key, so concurrent misses for the same query share a
+# single upstream request; locks are dropped once nobody waits on them
+_fetch_locks: weakref.WeakValueDictionary[tuple, asyncio.Lock] = (
+    weakref.WeakValueDictionary()
+)
+
+
+def _fetch_lock(key: tuple) -> asyncio.Lock:
+    """Get the lock guarding upstream fetches for a cache key."""
+    lock = _fetch_locks.get(key)
+    if lock is None:
+        lock = _fetch_locks[key] = asyncio.Lock()
+    return lock
+
+
+def _http_client() -> httpx.AsyncClient:
+    """Get the shared Open-Meteo client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True, limits=HTTP_LIMITS, retries=HTTP_CONNECT_RETRIES
+            ),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared Open-Meteo client and its pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _round_coordinates(latitude: float, longitude: float) -> tuple[float, float]:
+    """Round coordinates for use in cache keys."""
+    return (
+        round(latitude, CACHE_COORDINATE_DECIMALS),
+        round(longitude, CACHE_COORDINATE_DECIMALS),
+    )
+
 
 class WeatherService:
     """Service for fetching weather data from Open-Meteo API."""
@@ -146,7 +311,7 @@ class WeatherService:
         latitude: float,
         longitude: float,
         past_days: int,
-    ) -> list[WeatherRecord]:
+    ) -> WeatherColumns:
         """Fetch historical weather data.
 
         Args:
@@ -155,11 +320,46 @@ class WeatherService:
             past_days: Number of historical days.
 
         Returns:
-            List of WeatherRecord objects.
+            Weather columns, empty if the request failed.
         """
         end_date = datetime.now().date()
         start_date = end_date - timedelta(days=past_days)
 
+        key = (*_round_coordinates(latitude, longitude), str(end_date), past_days)
+        if (cached := _historical_cache.get(key)) is not None:
+            return cached
+
+        async with _fetch_lock(key):
+            if (cached := _historical_cache.get(key)) is not None:
+                return cached
+
+            records = await self._request_historical(
+                latitude, longitude, start_date, end_date
+            )
+            # Failed or empty fetches are not cached so the next call retries
+            if records:
+                _historical_cache[key] = records
+            return records
+
+    async def _request_historical(
+        self,
+        latitude: float,
+        longitude: float,
+        start_date: date,
+        end_date: date,
+    ) -> WeatherColumns:
+        """Request historical weather data from the archive API.
+
+        Args:
+            latitude: Location latitude.
+            longitude: Location longitude.
+            start_date: First day to fetch.
+            end_date: Last day to fetch.
+
+        Returns:
+            Weather columns, empty if the request failed.
+        """
+
         params = {
             "latitude": latitude,
             "longitude": longitude,
@@ -175,22 +375,15 @@ class WeatherService:
         )
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
-
-            if response.status_code != 200:
-                logger.warning(f"Historical API returned {response.status_code}")
-                return []
+            data = await self._get_response(url, "Historical")
+            if data is None or data.hourly is None:
+                return WeatherColumns()
 
-            data = response.json()
-            if "hourly" not in data:
-                return []
-
-            return self._parse_hourly_data(data["hourly"])
+            return self._parse_hourly_data(data.hourly)
 
         except Exception as e:
             logger.error(f"Failed to fetch historical data: {e}")
-            return []
+            return WeatherColumns()
 
     async def _fetch_forecast(
         self,
@@ -199,9 +392,50 @@ class WeatherService:
         model: str,
         forecast_days: int,
         resolution_minutes: int,
-    ) -> tuple[list[WeatherRecord], str | None, str | None]:
+    ) -> tuple[WeatherColumns, str | None, str | None]:
         """Fetch forecast weather data.
 
+        Args:
+            latitude: Location latitude.
+            longitude: Location longitude.
+            model: Weather model to use.
+            forecast_days: Number of forecast days.
+            resolution_minutes: Resolution in minutes (15, 30, or 60).
+
+        Returns:
+            Tuple of (records, model_used, resolution_info).
+        """
+        key = (
+            *_round_coordinates(latitude, longitude),
+            model,
+            forecast_days,
+            resolution_minutes,
+        )
+        if (cached := _forecast_cache.get(key)) is not None:
+            return cached
+
+        async with _fetch_lock(key):
+            if (cached := _forecast_cache.get(key)) is not None:
+                return cached
+
+            records, model_used, resolution_info = await self._request_forecast(
+                latitude, longitude, model, forecast_days, resolution_minutes
+            )
+            # Failed or empty fetches are not cached so the next call retries
+            if records:
+                _forecast_cache[key] = (records, model_used, resolution_info)
+            return records, model_used, resolution_info
+
+    async def _request_forecast(
+        self,
+        latitude: float,
+        longitude: float,
+        model: str,
+        forecast_days: int,
+        resolution_minutes: int,
+    ) -> tuple[WeatherColumns, str | None, str | None]:
+        """Request forecast weather data from the forecast API.
+
         Args:
             latitude: Location latitude.
             longitude: Location longitude.
@@ -248,25 +482,21 @@ class WeatherService:
         )
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(url)
-
-            if response.status_code != 200:
-                logger.warning(f"Forecast API returned {response.status_code}")
-                return [], None, None
+            data = await self._get_response(url, "Forecast")
+            if data is None:
+                return WeatherColumns(), None, None
 
-            data = response.json()
             model_used = model
 
             # Check for minutely_15 data first (for 15-min resolution)
-            if "minutely_15" in data and data["minutely_15"]:
-                records = self._parse_hourly_data(data["minutely_15"])
+            if data.minutely_15 is not None and data.minutely_15.time:
+                records = self._parse_hourly_data(data.minutely_15)
                 resolution_info = "15-min native (ICON-D2)"
                 return records, model_used, resolution_info
 
             # Fall back to hourly data
-            if "hourly" in data and data["hourly"]:
-                records = self._parse_hourly_data(data["hourly"])
+            if data.hourly is not None and data.hourly.time:
+                records = self._parse_hourly_data(data.hourly)
 
                 # Interpolate to 30-min if requested
                 if resolution_minutes == 30 and records:
@@ -275,132 +505,105 @@ class WeatherService:
 
                 return records, model_used, resolution_info
 
-            return [], None, None
+            return WeatherColumns(), None, None
 
         except Exception as e:
             logger.error(f"Failed to fetch forecast data: {e}")
-            return [], None, None
+            return WeatherColumns(), None, None
 
-    def _parse_hourly_data(self, hourly_data: dict) -> list[WeatherRecord]:
-        """Parse hourly data from API response.
+    async def _get_response(self, url: str, label: str) -> OpenMeteoResponse | None:
+        """GET an Open-Meteo response, refusing bodies over MAX_RESPONSE_BYTES.
 
         Args:
-            hourly_data: Hourly data dictionary from API response.
+            url: Request URL.
+            label: API name used in log messages.
 
         Returns:
-            List of WeatherRecord objects.
+            Decoded response, or None on a non-200 or oversized response.
         """
-        times = hourly_data.get("time", [])
-        records = []
-
-        for i, time_str in enumerate(times):
-            records.append(
-                WeatherRecord(
-                    time=datetime.fromisoformat(time_str),
-                    temperature=self._get_value(hourly_data, "temperature_2m", i),
-                    temperature_80m=self._get_value(hourly_data, "temperature_80m", i),
-                    wind_speed=self._get_value(hourly_data, "wind_speed_10m", i),
-                    wind_speed_80m=self._get_value(hourly_data, "wind_speed_80m", i),
-                    wind_speed_100m=self._get_value(hourly_data, "wind_speed_100m", i),
-                    wind_direction=self._get_value(
-                        hourly_data, "wind_direction_10m", i
-                    ),
-                    wind_direction_80m=self._get_value(
-                        hourly_data, "wind_direction_80m", i
-                    ),
-                    wind_direction_100m=self._get_value(
-                        hourly_data, "wind_direction_100m", i
-                    ),
-                    pressure=self._get_value(hourly_data, "pressure_msl", i),
-                    precipitation=self._get_value(hourly_data, "precipitation", i),
-                    cloud_cover=self._get_value(hourly_data, "cloud_cover", i),
-                )
-            )
+        async with _http_client().stream("GET", url, timeout=self.timeout) as response:
+            if response.status_code != 200:
+                logger.warning(f"{label} API returned {response.status_code}")
+                return None
 
-        return records
+            declared = int(response.headers.get("content-length", 0))
+            if declared > MAX_RESPONSE_BYTES:
+                logger.warning(f"{label} API response too large: {declared} bytes")
+                return None
 
-    @staticmethod
-    def _get_value(data: dict, key: str, index: int) -> float | None:
-        """Safely get value from data list."""
-        values = data.get(key)
-        if values and index < len(values):
-            return values[index]
-        return None
+            body = bytearray()
+            async for chunk in response.aiter_bytes():
+                body += chunk
+                if len(body) > MAX_RESPONSE_BYTES:
+                    logger.warning(f"{label} API response exceeded size limit")
+                    return None
 
-    def _interpolate_to_30min(
-        self, records: list[WeatherRecord]
-    ) -> list[WeatherRecord]:
-        """Interpolate hourly data to 30-minute intervals.
+        return _response_decoder.decode(body)
+
+    def _parse_hourly_data(self, series: OpenMeteoSeries) -> WeatherColumns:
+        """Parse a time series block from an API response.
 
         Args:
-            records: List of hourly records.
+            series: Decoded "hourly" or "minutely_15" block.
 
         Returns:
-            List of 30-minute interpolated records.
+            Weather columns, with NaN where a value is missing.
         """
-        if len(records) < 2:
-            return records
+        size = len(series.time)
+        return WeatherColumns(
+            time=np.array(series.time, dtype="datetime64[s]"),
+            **{
+                name: self._column(getattr(series, variable), size)
+                for name, variable in _SERIES_VARIABLES.items()
+            },
+        )
+
+    @staticmethod
+    def _column(values: list[float | None], size: int) -> np.ndarray:
+        """Convert a variable's values to a float32 array spanning the time axis."""
+        column = np.full(size, np.nan, dtype=np.float32)
+        count = min(len(values), size)
+        column[:count] = np.array(values[:count], dtype=np.float32)
+        return column
+
+    def _interpolate_to_30min(self, columns: WeatherColumns) -> WeatherColumns:
+        """Interpolate hourly data to 30-minute intervals.
 
-        interpolated = []
-
-        for i in range(len(records) - 1):
-            current = records[i]
-            next_rec = records[i + 1]
-
-            # Add current record
-            interpolated.append(current)
-
-            # Add interpolated record at midpoint
-            mid_time = current.time + timedelta(minutes=30)
-            interpolated.append(
-                WeatherRecord(
-                    time=mid_time,
-                    temperature=self._interpolate_value(
-                        current.temperature, next_rec.temperature
-                    ),
-                    temperature_80m=self._interpolate_value(
-                        current.temperature_80m, next_rec.temperature_80m
-                    ),
-                    wind_speed=self._interpolate_value(
-                        current.wind_speed, next_rec.wind_speed
-                    ),
-                    wind_speed_80m=self._interpolate_value(
-                        current.wind_speed_80m, next_rec.wind_speed_80m
-                    ),
-                    wind_speed_100m=self._interpolate_value(
-                        current.wind_speed_100m, next_rec.wind_speed_100m
-                    ),
-                    wind_direction=self._interpolate_value(
-                        current.wind_direction, next_rec.wind_direction
-                    ),
-                    wind_direction_80m=self._interpolate_value(
-                        current.wind_direction_80m, next_rec.wind_direction_80m
-                    ),
-                    wind_direction_100m=self._interpolate_value(
-                        current.wind_direction_100m, next_rec.wind_direction_100m
-                    ),
-                    pressure=self._interpolate_value(
-                        current.pressure, next_rec.pressure
-                    ),
-                    precipitation=self._interpolate_value(
-                        current.precipitation, next_rec.precipitation
-                    ),
-                    cloud_cover=self._interpolate_value(
-                        current.cloud_cover, next_rec.cloud_cover
-                    ),
-                )
+        Args:
+            columns: Hourly weather columns.
+
+        Returns:
+            Weather columns with a midpoint inserted between each pair of hours.
+        """
+        if len(columns) < 2:
+            return columns
+
+        interpolated = {}
+        for name in _SERIES_VARIABLES:
+            values = getattr(columns, name)
+            interpolated[name] = self._interleave(
+                values, self._interpolate_values(values[:-1], values[1:])
             )
 
-        # Add last record
-        interpolated.append(records[-1])
-        return interpolated
+        times = columns.time
+        return replace(
+            columns,
+            time=self._interleave(times, times[:-1] + np.timedelta64(30, "m")),
+            **interpolated,
+        )
+
+    @staticmethod
+    def _interleave(values: np.ndarray, midpoints: np.ndarray) -> np.ndarray:
+        """Insert midpoints between consecutive values."""
+        result = np.empty(len(values) + len(midpoints), dtype=values.dtype)
+        result[0::2] = values
+        result[1::2] = midpoints
+        return result
 
     @staticmethod
-    def _interpolate_value(v1: float | None, v2: float | None) -> float | None:
-        """Interpolate between two values."""
-        if v1 is None or v2 is None:
-            return v1 or v2
-        return (v1 + v2) / 2
+    def _interpolate_values(v1: np.ndarray, v2: np.ndarray) -> np.ndarray:
+        """Interpolate between two arrays, keeping whichever side is present."""
+        return np.where(np.isnan(v1), v2, np.where(np.isnan(v2), v1, (v1 + v2) / 2))
 
     @staticmethod
     def get_available_models() -> dict[str, str]:
@@ -81,7 +81,7 @@ with st.expander("⚙️ Forecast Settings", expanded=False):
         )
 
 if st.button("⚡ Generate New Forecast", type="primary", use_container_width=True):
-    with st.spinner("Generating forecast... This may take a minute..."):
+    with st.spinner("Queueing forecast..."):
         result = api.generate_forecast(
             wind_farm_id=selected_farm["id"],
             forecast_hours=forecast_hours,
@@ -90,17 +90,12 @@ if st.button("⚡ Generate New Forecast", type="primary", use_container_width=Tr
         )
 
     if result and not result.get("error") and not result.get("detail"):
-        st.success(f"✅ {result.get('message', 'Forecast generated!')}")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Records Created", result.get("records_created", 0))
-        with col2:
-            total_mwh = result.get("total_forecasted_generation_kwh", 0) / 1000
-            st.metric("Total Forecasted", f"{total_mwh:,.0f} MWh")
-        with col3:
-            st.metric("Weather Model", result.get("weather_model", "N/A"))
+        st.success(
+            f"✅ {result.get('message', 'Forecast queued')} "
+            f"(run #{result.get('run_id')}). "
+            "Refresh in a minute to see the new forecast."
+        )
         st.session_state.pop("forecast_data", None)
-        st.rerun()
     else:
         error_detail = (
             result.get("detail", result.get("error", "Unknown error"))
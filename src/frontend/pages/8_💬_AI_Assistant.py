@@ -65,11 +65,11 @@ if prompt := st.chat_input("Ask me about your wind farms..."):
 
     # Get AI response
     with st.chat_message("assistant"), st.spinner("Thinking..."):
-        # Prepare conversation history for API
+        # Prepare conversation history for API (the API accepts at most 20)
         history = [
             {"role": m["role"], "content": m["content"]}
             for m in st.session_state.chat_messages[
-                :-1
+                -21:-1
             ]  # Exclude last message (current prompt)
         ]
 